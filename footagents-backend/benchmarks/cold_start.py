@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark API cold starts.
+
+Each run starts a fresh interpreter that imports the app, runs its lifespan
+and measures:
+
+- import: importing ``footagents.api.main``
+- startup: lifespan startup until the app accepts requests
+- first_request: the first ``GET /characters``
+- ready: from the start of the lifespan until ``/ready`` returns 200
+  (embedding model loaded, vector index opened, workflow compiled)
+
+Needs the same environment as the server (MongoDB, cached embedding model).
+
+Usage:
+    python benchmarks/cold_start.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def measure_once(ready_timeout: float) -> dict:
+    """Measure one cold start in the current (fresh) interpreter."""
+    sys.path.append(SRC)
+    # The test client is harness, not part of the app's import cost
+    from fastapi.testclient import TestClient
+
+    start = time.perf_counter()
+    from footagents.api.main import app
+    imported = time.perf_counter()
+
+    client = TestClient(app)
+    # Entering the client runs the lifespan
+    lifespan_start = time.perf_counter()
+    with client:
+        started = time.perf_counter()
+        client.get("/characters").raise_for_status()
+        first_response = time.perf_counter()
+
+        ready = None
+        while time.perf_counter() - lifespan_start < ready_timeout:
+            if client.get("/ready").status_code == 200:
+                ready = time.perf_counter()
+                break
+            time.sleep(0.05)
+
+    return {
+        "import": (imported - start) * 1000,
+        "startup": (started - lifespan_start) * 1000,
+        "first_request": (first_response - started) * 1000,
+        "ready": (ready - lifespan_start) * 1000 if ready is not None else None,
+    }
+
+
+def run_child(ready_timeout: float) -> dict:
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--ready-timeout", str(ready_timeout)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--ready-timeout", type=float, default=300.0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_once(args.ready_timeout)))
+        return
+
+    results = [run_child(args.ready_timeout) for _ in range(args.runs)]
+
+    print(f"Cold start over {args.runs} runs (median / max)")
+    for key in ("import", "startup", "first_request", "ready"):
+        values = [result[key] for result in results if result[key] is not None]
+        if not values:
+            print(f"{key:<14} not reached within {args.ready_timeout:.0f}s")
+            continue
+        print(f"{key:<14} {statistics.median(values):10.1f} ms  {max(values):10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
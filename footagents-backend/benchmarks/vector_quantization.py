@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark quantised storage in the flat vector index.
+
+Builds a synthetic clustered corpus of MiniLM-sized (384-d) vectors, writes
+it as a flat index and compares float32, float16 and int8 storage, with and
+without full-precision re-scoring, on:
+
+- memory: bytes of the matrix scanned per search
+- recall@k: overlap with the exact float32 top-k
+- latency: mean and p95 per search over one character's slice
+
+Usage:
+    python benchmarks/vector_quantization.py --rows 200000 --queries 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from footagents.infrastructure.rag.flat_index import (
+    FlatVectorIndex,
+    DTYPE_FLOAT32,
+    DTYPE_FLOAT16,
+    DTYPE_INT8,
+)
+
+CHARACTER = "messi"
+
+
+def synthetic_corpus(rows: int, dimension: int, clusters: int, seed: int) -> np.ndarray:
+    """Clustered unit vectors, closer to real embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    assignment = rng.integers(0, clusters, rows)
+    vectors = centers[assignment] + 0.6 * rng.standard_normal((rows, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def run(index: FlatVectorIndex, queries: np.ndarray, k: int, exact: list) -> dict:
+    timings, recalls = [], []
+    for query, expected in zip(queries, exact):
+        start = time.perf_counter()
+        results = index.search(query, k=k, character=CHARACTER)
+        timings.append((time.perf_counter() - start) * 1000)
+        found = {document.metadata["doc_id"] for document, _ in results}
+        recalls.append(len(found & expected) / k)
+
+    ordered = sorted(timings)
+    return {
+        "memory_mb": index.nbytes / (1024 * 1024),
+        "recall": statistics.mean(recalls),
+        "mean_ms": statistics.mean(timings),
+        "p95_ms": ordered[int(len(ordered) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    vectors = synthetic_corpus(args.rows, args.dimension, args.clusters, args.seed)
+    rows = [[f"doc-{i}", "", {"character": CHARACTER}] for i in range(args.rows)]
+
+    rng = np.random.default_rng(args.seed + 1)
+    picked = rng.integers(0, args.rows, args.queries)
+    queries = vectors[picked] + 0.3 * rng.standard_normal((args.queries, args.dimension)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as directory:
+        FlatVectorIndex.write(directory, rows, vectors, embedding_model_id="synthetic")
+
+        baseline = FlatVectorIndex(directory)
+        exact = [
+            {document.metadata["doc_id"] for document, _ in baseline.search(query, k=args.k, character=CHARACTER)}
+            for query in queries
+        ]
+
+        configurations = [
+            ("float32", DTYPE_FLOAT32, 0),
+            ("float16", DTYPE_FLOAT16, 0),
+            (f"float16 + rescore x{args.rescore_factor}", DTYPE_FLOAT16, args.rescore_factor),
+            ("int8", DTYPE_INT8, 0),
+            (f"int8 + rescore x{args.rescore_factor}", DTYPE_INT8, args.rescore_factor),
+        ]
+
+        print(f"{args.rows} rows x {args.dimension} dims, {args.queries} queries, recall@{args.k}")
+        print(f"{'storage':<22} {'memory':>10} {'recall':>8} {'mean':>10} {'p95':>10}")
+        for label, dtype, rescore_factor in configurations:
+            index = FlatVectorIndex(directory, dtype=dtype, rescore_factor=rescore_factor)
+            index.search(queries[0], k=args.k, character=CHARACTER)  # page the matrix in
+            result = run(index, queries, args.k, exact)
+            print(
+                f"{label:<22} {result['memory_mb']:7.1f} MB {result['recall']:8.3f} "
+                f"{result['mean_ms']:7.2f} ms {result['p95_ms']:7.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request workflow setup overhead.
+
+Compares the previous behaviour, where every /chat call compiled the StateGraph
+and every node rebuilt its prompt and ChatGroq model, with the shared
+WorkflowRuntime that builds everything once per process.
+
+Usage:
+    python benchmarks/workflow_setup.py --iterations 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Chains only need a key to be constructed; no request is sent to Groq
+os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder")
+
+from footagents.application.conversation_service.workflow.chains import (
+    get_character_response_chain,
+    get_context_summary_chain,
+)
+from footagents.application.conversation_service.workflow.graph import create_footagent_workflow
+from footagents.application.conversation_service.workflow.runtime import (
+    workflow_runtime,
+    CHARACTER_RESPONSE_CHAIN,
+    CONTEXT_SUMMARY_CHAIN,
+)
+
+
+def per_request_setup():
+    """Setup work the old code path did on every /chat call."""
+    create_footagent_workflow()
+    get_context_summary_chain()
+    get_character_response_chain()
+
+
+def shared_runtime_setup():
+    """Setup work left on the hot path with the shared runtime."""
+    _ = workflow_runtime.workflow
+    workflow_runtime.get_chain(CONTEXT_SUMMARY_CHAIN)
+    workflow_runtime.get_chain(CHARACTER_RESPONSE_CHAIN)
+
+
+def measure(fn, iterations: int) -> list[float]:
+    """Return per-call timings in milliseconds."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<22} mean={statistics.mean(timings):9.4f} ms  "
+        f"median={statistics.median(timings):9.4f} ms  p95={p95:9.4f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    # Warm imports, the retriever tool and the runtime so only setup work is timed
+    per_request_setup()
+    start = time.perf_counter()
+    workflow_runtime.initialize()
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    before = measure(per_request_setup, args.iterations)
+    after = measure(shared_runtime_setup, args.iterations)
+
+    print(f"Per-request setup overhead over {args.iterations} iterations")
+    report("before (per request)", before)
+    report("after (shared runtime)", after)
+    print(f"one-time runtime startup: {startup_ms:.2f} ms")
+    print(f"speedup: {statistics.mean(before) / max(statistics.mean(after), 1e-9):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from footagents.infrastructure.rag.ingestion import main
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
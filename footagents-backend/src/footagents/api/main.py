@@ -1,27 +1,58 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
 from datetime import datetime
 import uuid
 import os
+import json
+import time
+from typing import Optional
 from dotenv import load_dotenv
+from pydantic import ValidationError
+from pymongo.errors import DuplicateKeyError
 
 from ..domain.models import ChatRequest, ChatResponse
-from ..domain.character_factory import FootballLegendFactory
-from ..application.conversation_service.workflow.service import get_character_response
+from ..application.character_service import character_registry
+from ..application.conversation_service.workflow.service import get_character_response, stream_character_response
+from ..application.conversation_service.workflow.runtime import workflow_runtime
+from ..application.conversation_service.workflow.context_summary import context_summary_cache, context_summary_flight
+from ..application.conversation_service.workflow.routing import retrieval_gate
+from ..application.conversation_service.workflow.response_cache import response_cache, response_flight
+from ..application.conversation_service.workflow.tools import retrieval_flight
+from ..application.conversation_service.workflow.summarizer import conversation_summarizer
+from ..application.conversation_service.workflow.prompt_budget import prompt_assembler
+from ..infrastructure.llm.client_registry import llm_registry
+from ..infrastructure.rag.embeddings import query_embedding_cache
 from ..integrations.mongodb.connection import db_manager
-from ..integrations.mongodb.repositories import conversation_repository, character_repository, chat_log_repository
+from ..integrations.mongodb.chat_log_writer import chat_log_writer
+from ..integrations.mongodb.indexes import index_registry, slow_query_listener
+from ..integrations.mongodb.repositories import conversation_repository, character_repository
 from ..integrations.mongodb.models import ConversationDocument, ChatLogDocument
 
 load_dotenv()
 
+# Browser/CDN cache lifetime for roster responses; ETags handle revalidation
+CHARACTER_CACHE_MAX_AGE = int(os.getenv("CHARACTER_CACHE_MAX_AGE", 60))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await db_manager.connect()
+    await character_registry.start()
+    character_repository.conversation_counter.start()
+    await chat_log_writer.start()
+    conversation_summarizer.start()
+    # Load the embedding model and compile the workflow without delaying startup
+    workflow_runtime.start_warm_up()
     yield
     # Shutdown
+    await conversation_summarizer.stop()
+    await character_registry.stop()
+    await character_repository.conversation_counter.stop()
+    await chat_log_writer.stop()
+    await llm_registry.aclose()
     await db_manager.disconnect()
 
 
@@ -47,6 +78,37 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now()}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Report whether the workflow and retriever are warm; 503 until they are."""
+    status = {**workflow_runtime.status(), "timestamp": datetime.now().isoformat()}
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Get in-process performance statistics."""
+    return {
+        "llm": llm_registry.stats(),
+        "context_summary_cache": context_summary_cache.stats(),
+        "retrieval_routing": retrieval_gate.stats(),
+        "response_cache": response_cache.stats(),
+        "singleflight": {
+            flight.name: flight.stats() for flight in (retrieval_flight, context_summary_flight, response_flight)
+        },
+        "characters": character_registry.stats(),
+        "conversation_counts": character_repository.conversation_counter.stats(),
+        "chat_log_writer": chat_log_writer.stats(),
+        "conversation_summarizer": conversation_summarizer.stats(),
+        "prompt_budget": prompt_assembler.stats(),
+        "conversation_cache": conversation_repository.cache.stats(),
+        "mongodb_indexes": index_registry.stats(),
+        "mongodb_slow_queries": slow_query_listener.stats(),
+        "query_embedding_cache": query_embedding_cache.stats(),
+        "timestamp": datetime.now()
+    }
+
+
 @app.post("/reset-memory")
 async def reset_memory():
     """Reset conversation memory - placeholder implementation"""
@@ -58,19 +120,123 @@ async def reset_memory():
         raise HTTPException(status_code=500, detail=f"Error resetting memory: {str(e)}")
 
 
+def cached_json(request: Request, payload: dict, etag: str) -> Response:
+    """Return JSON with ETag/Cache-Control, or 304 when the client's copy is current."""
+    etag = f'"{etag}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={CHARACTER_CACHE_MAX_AGE}"}
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in client_etags or "*" in client_etags:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=payload, headers=headers)
+
+
 @app.get("/characters")
-async def get_characters():
-    legends = FootballLegendFactory.get_available_legends()
-    return {"characters": legends}
+async def get_characters(
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500)
+):
+    snapshot = character_registry.snapshot
+    payload = {
+        "characters": list(snapshot.ids[offset:offset + limit]),
+        "total": len(snapshot.ids),
+        "offset": offset,
+        "limit": limit
+    }
+    return cached_json(request, payload, f"{snapshot.version[:16]}-{offset}-{limit}")
 
 
 @app.get("/characters/{character_id}")
-async def get_character(character_id: str):
+async def get_character(character_id: str, request: Request):
+    snapshot = character_registry.snapshot
     try:
-        legend = FootballLegendFactory.get_legend(character_id)
-        return legend.dict()
+        legend = character_registry.get_legend(character_id, snapshot)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    return cached_json(request, legend.dict(), snapshot.etags[legend.id])
+
+
+async def get_or_create_conversation(conversation_id: str, character_id: str) -> ConversationDocument:
+    """Load a conversation from MongoDB, creating it for the character if it doesn't exist."""
+    conversation = await conversation_repository.find_by_conversation_id(conversation_id)
+    
+    if conversation is None:
+        # Get character information
+        try:
+            character_legend = character_registry.get_legend(character_id)
+        except ValueError:
+            raise HTTPException(status_code=404, detail=f"Character {character_id} not found")
+        
+        # Create new conversation document
+        conversation = ConversationDocument(
+            conversation_id=conversation_id,
+            character_id=character_id,
+            messages=[],
+            character_context="",
+            character_name=character_legend.name,
+            character_perspective=character_legend.perspective,
+            character_style=character_legend.style,
+            summary=""
+        )
+        try:
+            conversation = await conversation_repository.create(conversation)
+        except DuplicateKeyError:
+            # A concurrent request created it first
+            conversation = await conversation_repository.find_by_conversation_id(conversation_id)
+    
+    return conversation
+
+
+async def persist_chat_turn(
+    request: ChatRequest,
+    conversation: ConversationDocument,
+    response_text: str,
+    updated_state: dict,
+    start_time: datetime
+) -> ChatResponse:
+    """Store a finished turn, log it for analytics and build the chat response."""
+    conversation_id = conversation.conversation_id
+    
+    # Append both messages and the carried-over context in one update
+    updates = {}
+    if updated_state.get("character_context", "") != conversation.character_context:
+        updates["character_context"] = updated_state.get("character_context", "")
+    await conversation_repository.append_turn(
+        conversation_id, request.message, response_text, updates
+    )
+    
+    # Fold older turns into the summary in the background once enough have built up
+    if conversation_summarizer.needs_summary(conversation.message_count + 2, conversation.summary_watermark):
+        conversation_summarizer.schedule(conversation_id)
+    
+    # Create chat response
+    chat_response = ChatResponse(
+        response=response_text,
+        character_id=request.character_id,
+        conversation_id=conversation_id,
+        timestamp=datetime.now()
+    )
+    
+    # Log the interaction for analytics
+    response_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+    chat_log = ChatLogDocument.from_chat_interaction(
+        request, chat_response, response_time_ms,
+        metadata={
+            "retrieval_route": updated_state.get("retrieval_route"),
+            "retrieval_reason": updated_state.get("retrieval_reason"),
+            "response_cache": updated_state.get("response_cache", "miss"),
+            "prompt_usage": updated_state.get("prompt_usage")
+        }
+    )
+    # Written in the background so analytics never delay the reply
+    await chat_log_writer.submit(chat_log)
+    
+    # Increment character conversation count (aggregated and flushed in the background)
+    await character_repository.increment_conversation_count(character_registry.stored_id(request.character_id))
+    
+    return chat_response
 
 
 @app.post("/chat", response_model=ChatResponse)
@@ -80,83 +246,170 @@ async def chat_with_character(request: ChatRequest):
     try:
         # Get or create conversation
         conversation_id = request.conversation_id or str(uuid.uuid4())
-        
-        # Get or create conversation from MongoDB
-        conversation = await conversation_repository.find_by_conversation_id(conversation_id)
-        
-        if conversation is None:
-            # Create new conversation
-            # Get character information
-            try:
-                character_legend = FootballLegendFactory.get_legend(request.character_id)
-            except ValueError:
-                raise HTTPException(status_code=404, detail=f"Character {request.character_id} not found")
-            
-            # Create new conversation document
-            conversation = ConversationDocument(
-                conversation_id=conversation_id,
-                character_id=request.character_id,
-                messages=[],
-                character_context="",
-                character_name=character_legend.name,
-                character_perspective=character_legend.perspective,
-                character_style=character_legend.style,
-                summary=""
-            )
-            conversation = await conversation_repository.create(conversation)
-        
-        # Get conversation history for the AI service
-        conversation_history = conversation.messages
+        conversation = await get_or_create_conversation(conversation_id, request.character_id)
         
         # Get character response
         response_text, updated_state = await get_character_response(
             message=request.message,
             character_id=request.character_id,
-            conversation_history=conversation_history,
-            summary=conversation.summary
-        )
-        
-        # Add user message to conversation
-        await conversation_repository.add_message_to_conversation(
-            conversation_id, "user", request.message
-        )
-        
-        # Add assistant response to conversation
-        await conversation_repository.add_message_to_conversation(
-            conversation_id, "assistant", response_text
-        )
-        
-        # Update conversation summary if provided
-        if updated_state.get("summary"):
-            await conversation_repository.update(
-                str(conversation.id), 
-                {"summary": updated_state["summary"]}
-            )
-        
-        # Create chat response
-        chat_response = ChatResponse(
-            response=response_text,
-            character_id=request.character_id,
+            conversation_history=await conversation_summarizer.unsummarized_messages(conversation),
+            summary=conversation.summary,
             conversation_id=conversation_id,
-            timestamp=datetime.now()
+            character_context=conversation.character_context
         )
         
-        # Log the interaction for analytics
-        response_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-        chat_log = ChatLogDocument.from_chat_interaction(request, chat_response, response_time_ms)
-        await chat_log_repository.create(chat_log)
-        
-        # Increment character conversation count
-        await character_repository.increment_conversation_count(request.character_id)
-        
-        return chat_response
+        return await persist_chat_turn(request, conversation, response_text, updated_state, start_time)
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+def format_sse(event: str, data: dict) -> str:
+    """Format a Server-Sent Events frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_with_character_stream(request: ChatRequest):
+    """
+    Stream a character response as Server-Sent Events.
+    
+    Emits one ``token`` event per delta from the character chain and a final
+    ``done`` event carrying the conversation_id and timing once the turn is
+    stored. Failures after the stream has started are sent as an ``error`` event.
+    """
+    start_time = datetime.now()
+    started = time.perf_counter()
+    
+    # Resolve the conversation before streaming so lookup errors keep their status code
+    conversation_id = request.conversation_id or str(uuid.uuid4())
+    request.conversation_id = conversation_id
+    conversation = await get_or_create_conversation(conversation_id, request.character_id)
+    
+    async def event_stream():
+        first_token_ms = None
+        try:
+            response_text, updated_state = "", {}
+            async for event, payload in stream_character_response(
+                message=request.message,
+                character_id=request.character_id,
+                conversation_history=await conversation_summarizer.unsummarized_messages(conversation),
+                summary=conversation.summary,
+                conversation_id=conversation_id,
+                character_context=conversation.character_context
+            ):
+                if event == "chunk":
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter() - started) * 1000
+                    yield format_sse("token", {"delta": payload})
+                else:
+                    response_text, updated_state = payload
+            
+            chat_response = await persist_chat_turn(
+                request, conversation, response_text, updated_state, start_time
+            )
+            
+            yield format_sse("done", {
+                "response": chat_response.response,
+                "character_id": chat_response.character_id,
+                "conversation_id": chat_response.conversation_id,
+                "timestamp": chat_response.timestamp.isoformat(),
+                "timing": {
+                    "time_to_first_token_ms": round(first_token_ms, 1) if first_token_ms is not None else None,
+                    "total_ms": round((time.perf_counter() - started) * 1000, 1)
+                }
+            })
+            
+        except Exception as e:
+            yield format_sse("error", {"detail": f"Internal server error: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.websocket("/ws/chat")
+async def websocket_chat(websocket: WebSocket):
+    """
+    Stream character responses over a WebSocket.
+    
+    Each client frame is a ChatRequest. The server answers with
+    ``{"streaming": true}``, one ``{"chunk": ...}`` per token delta,
+    ``{"response": ..., "conversation_id": ...}`` once the turn is stored,
+    and finally ``{"streaming": false}``.
+    """
+    await websocket.accept()
+    
+    # Conversation per character for clients that don't send conversation_id
+    connection_conversations: dict[str, str] = {}
+    
+    try:
+        while True:
+            data = await websocket.receive_json()
+            start_time = datetime.now()
+            
+            try:
+                request = ChatRequest(**data)
+            except ValidationError as e:
+                await websocket.send_json({"error": f"Invalid request: {str(e)}"})
+                continue
+            
+            try:
+                conversation_id = (
+                    request.conversation_id
+                    or connection_conversations.get(request.character_id)
+                    or str(uuid.uuid4())
+                )
+                request.conversation_id = conversation_id
+                conversation = await get_or_create_conversation(conversation_id, request.character_id)
+                connection_conversations[request.character_id] = conversation_id
+                
+                await websocket.send_json({"streaming": True})
+                
+                response_text, updated_state = "", {}
+                async for event, payload in stream_character_response(
+                    message=request.message,
+                    character_id=request.character_id,
+                    conversation_history=await conversation_summarizer.unsummarized_messages(conversation),
+                    summary=conversation.summary,
+                    conversation_id=conversation_id,
+                    character_context=conversation.character_context
+                ):
+                    if event == "chunk":
+                        await websocket.send_json({"chunk": payload})
+                    else:
+                        response_text, updated_state = payload
+                
+                chat_response = await persist_chat_turn(
+                    request, conversation, response_text, updated_state, start_time
+                )
+                
+                await websocket.send_json({
+                    "response": chat_response.response,
+                    "character_id": chat_response.character_id,
+                    "conversation_id": chat_response.conversation_id,
+                    "timestamp": chat_response.timestamp.isoformat()
+                })
+                
+            except HTTPException as e:
+                await websocket.send_json({"error": e.detail})
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                await websocket.send_json({"error": f"Internal server error: {str(e)}"})
+            
+            await websocket.send_json({"streaming": False})
+            
+    except WebSocketDisconnect:
+        pass
+
+
 @app.get("/conversations/{conversation_id}")
 async def get_conversation(conversation_id: str):
     """Get conversation details and history."""
@@ -170,6 +423,7 @@ async def get_conversation(conversation_id: str):
             "character_id": conversation.character_id,
             "character_name": conversation.character_name,
             "messages": conversation.messages,
+            "message_count": conversation.message_count,
             "summary": conversation.summary,
             "created_at": conversation.created_at,
             "updated_at": conversation.updated_at,
@@ -180,6 +434,23 @@ async def get_conversation(conversation_id: str):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@app.get("/conversations/{conversation_id}/messages")
+async def get_conversation_messages(
+    conversation_id: str,
+    before: Optional[int] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=200)
+):
+    """Get a page of the full message history; pass next_before to page back further."""
+    try:
+        page = await conversation_repository.get_messages(conversation_id, before=before, limit=limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    if page is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    
+    return {"conversation_id": conversation_id, "limit": limit, **page}
+
+
 @app.delete("/conversations/{conversation_id}")
 async def delete_conversation(conversation_id: str):
     """Delete a conversation and mark it as inactive."""
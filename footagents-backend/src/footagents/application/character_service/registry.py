@@ -0,0 +1,220 @@
+"""
+Character Registry
+
+Serves the character roster from an immutable in-memory snapshot. The
+snapshot starts from the built-in legends, is replaced by the MongoDB
+``characters`` collection at startup (seeded with the built-in legends the
+first time) and is refreshed by polling, so roster changes go live without
+a redeploy. Each poll first compares the character count and latest
+``updated_at`` with the last load and only reloads the roster when they
+moved. Readers never lock: a refresh builds a new snapshot and swaps the
+reference.
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from ...domain.character_factory import FootballLegendFactory
+from ...domain.models import FootballLegend
+from ...integrations.mongodb.models import CharacterDocument
+from ...integrations.mongodb.repositories import character_repository
+
+logger = logging.getLogger(__name__)
+
+CHARACTER_REFRESH_INTERVAL = float(os.getenv("CHARACTER_REFRESH_INTERVAL", 30))
+
+SOURCE_BUILTIN = "builtin"
+SOURCE_MONGODB = "mongodb"
+
+
+def _fingerprint(payload: Any) -> str:
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CharacterSnapshot:
+    """
+    Read-only view of the roster at one point in time.
+
+    Legends are keyed by their canonical id (``FootballLegendFactory.normalize_id``),
+    which is what every lookup uses. ``stored_ids`` maps it back to the
+    ``character_id`` stored in MongoDB, for writes to the character document.
+    """
+
+    legends: Mapping[str, FootballLegend]
+    ids: Tuple[str, ...]
+    etags: Mapping[str, str]
+    version: str
+    source: str
+    stored_ids: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    loaded_at: datetime = field(default_factory=datetime.utcnow)
+
+    @classmethod
+    def build(cls, legends: List[FootballLegend], source: str) -> "CharacterSnapshot":
+        """Index legends by canonical id and fingerprint them for HTTP caching."""
+        by_id: Dict[str, FootballLegend] = {}
+        stored_ids: Dict[str, str] = {}
+        for legend in legends:
+            legend_id = FootballLegendFactory.normalize_id(legend.id)
+            if legend_id in by_id:
+                logger.warning(f"Ignoring character {legend.id}: its id collides with {stored_ids[legend_id]}")
+                continue
+            stored_ids[legend_id] = legend.id
+            by_id[legend_id] = legend.copy(update={"id": legend_id})
+        etags = {legend_id: _fingerprint(legend.dict()) for legend_id, legend in by_id.items()}
+        return cls(
+            legends=MappingProxyType(by_id),
+            ids=tuple(by_id),
+            etags=MappingProxyType(etags),
+            version=_fingerprint(sorted(etags.items())),
+            source=source,
+            stored_ids=MappingProxyType(stored_ids),
+        )
+
+
+class CharacterRegistry:
+    """Character lookups backed by the MongoDB roster with O(1) in-memory reads."""
+
+    def __init__(self, refresh_interval: float = CHARACTER_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._snapshot = CharacterSnapshot.build(self._builtin_legends(), SOURCE_BUILTIN)
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Roster marker (count, latest updated_at) the snapshot was loaded at
+        self._marker: Optional[Tuple[int, Optional[datetime]]] = None
+        self.refreshes = 0
+        self.unchanged_polls = 0
+        self.refresh_errors = 0
+
+    @staticmethod
+    def _builtin_legends() -> List[FootballLegend]:
+        return [FootballLegendFactory.get_legend(legend_id) for legend_id in FootballLegendFactory.get_available_legends()]
+
+    @property
+    def snapshot(self) -> CharacterSnapshot:
+        """The current roster snapshot."""
+        return self._snapshot
+
+    def get_legend(self, legend_id: str, snapshot: Optional[CharacterSnapshot] = None) -> FootballLegend:
+        """
+        Look up a legend by any spelling of its id.
+
+        Args:
+            legend_id: Legend id in any spelling
+            snapshot: Snapshot to read from, for callers that need a consistent view
+
+        Raises:
+            ValueError: If the legend is not in the roster
+        """
+        legend_id = FootballLegendFactory.normalize_id(legend_id)
+        legend = (snapshot or self._snapshot).legends.get(legend_id)
+        if legend is None:
+            raise ValueError(f"Legend {legend_id} not found")
+        return legend
+
+    def stored_id(self, legend_id: str) -> str:
+        """Get the ``character_id`` a legend is stored under in MongoDB, for any spelling of its id."""
+        legend_id = FootballLegendFactory.normalize_id(legend_id)
+        return self._snapshot.stored_ids.get(legend_id, legend_id)
+
+    def get_available_legends(self) -> List[str]:
+        return list(self._snapshot.ids)
+
+    async def seed(self) -> int:
+        """Insert the built-in legends that are missing from MongoDB."""
+        return await character_repository.seed_characters(
+            [CharacterDocument.from_football_legend(legend) for legend in self._builtin_legends()]
+        )
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the roster from MongoDB if it changed since the last load.
+
+        Args:
+            force: Reload even if the roster marker hasn't moved
+
+        Returns:
+            True if the roster changed and a new snapshot was swapped in
+        """
+        # Read before the profiles, so an edit in between is seen on the next poll
+        marker = await character_repository.get_roster_marker()
+        if not force and marker == self._marker and self._snapshot.source == SOURCE_MONGODB:
+            self.unchanged_polls += 1
+            return False
+
+        profiles = await character_repository.get_character_profiles()
+        legends = [
+            FootballLegend(
+                id=profile["character_id"],
+                name=profile["name"],
+                position=profile["position"],
+                era=profile["era"],
+                perspective=profile.get("perspective", ""),
+                style=profile.get("style", ""),
+                career_highlights=profile.get("career_highlights", "")
+            )
+            for profile in profiles
+        ]
+        snapshot = CharacterSnapshot.build(legends, SOURCE_MONGODB)
+        self.refreshes += 1
+        self._marker = marker
+        if snapshot.version == self._snapshot.version and self._snapshot.source == SOURCE_MONGODB:
+            return False
+
+        self._snapshot = snapshot
+        logger.info(f"Character roster loaded: {len(snapshot.ids)} characters (version {snapshot.version[:8]})")
+        return True
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.refresh_errors += 1
+                logger.warning(f"Character roster refresh failed: {str(e)}")
+
+    async def start(self) -> None:
+        """Seed and load the roster, then keep it fresh in the background."""
+        try:
+            await self.seed()
+            await self.refresh()
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.error(f"Could not load characters from MongoDB, serving built-in roster: {str(e)}")
+
+        if self.refresh_interval > 0 and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stop background refreshes."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get roster size and refresh statistics."""
+        snapshot = self._snapshot
+        return {
+            "characters": len(snapshot.ids),
+            "version": snapshot.version,
+            "source": snapshot.source,
+            "loaded_at": snapshot.loaded_at.isoformat(),
+            "refreshes": self.refreshes,
+            "unchanged_polls": self.unchanged_polls,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+# Global instance for easy access
+character_registry = CharacterRegistry()
@@ -1 +1,2 @@
-from .service import get_character_response 
\ No newline at end of file
+from .service import get_character_response
+from .runtime import workflow_runtime
\ No newline at end of file
@@ -1,13 +1,10 @@
 """Chains module providing specialized LangChain pipelines for different conversation tasks."""
 
-import os
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_groq import ChatGroq
-from dotenv import load_dotenv
 
 from ....domain.prompts import FOOTBALL_CHARACTER_CARD, CONTEXT_SUMMARY_PROMPT, CONVERSATION_SUMMARY_PROMPT
-
-load_dotenv()
+from ....infrastructure.llm.client_registry import llm_registry
 
 # Model configurations
 DEFAULT_MODEL = "llama-3.3-70b-versatile"
@@ -17,24 +14,25 @@ SUMMARY_TEMPERATURE = 0.3  # Lower for more consistent summaries
 
 
 def get_chat_model(temperature: float = DEFAULT_TEMPERATURE, model_name: str = DEFAULT_MODEL) -> ChatGroq:
-    """Create a ChatGroq model instance with specified configuration."""
-    return ChatGroq(
-        api_key=os.getenv("GROQ_API_KEY"),
-        model_name=model_name,
-        temperature=temperature,
-    )
+    """Get the shared, pooled ChatGroq model for the specified configuration."""
+    return llm_registry.get_chat_model(model=model_name, temperature=temperature)
+
 
+def get_character_response_chain(bind_tools: bool = True):
+    """Create the main conversation chain for football character responses.
 
-def get_character_response_chain():
-    """Create the main conversation chain for football character responses."""
+    Groq cannot stream token deltas while tools are bound, so token-streaming
+    callers use a chain built with ``bind_tools=False``.
+    """
     model = get_chat_model()
     
-    # Import tools here to avoid circular import
-    try:
-        from .tools import tools
-        model = model.bind_tools(tools)  # Enable tool usage for RAG
-    except ImportError:
-        pass  # Continue without tools if not available
+    if bind_tools:
+        # Import tools here to avoid circular import
+        try:
+            from .tools import get_tools
+            model = model.bind_tools(get_tools())  # Enable tool usage for RAG
+        except ImportError:
+            pass  # Continue without tools if not available
     
     prompt = ChatPromptTemplate.from_messages([
         ("system", FOOTBALL_CHARACTER_CARD),
@@ -0,0 +1,81 @@
+"""Context summary caching and the extractive summarizer used by summarize_context_node."""
+
+import os
+import re
+import hashlib
+from collections import Counter
+from typing import Iterable
+
+from langchain.schema import Document
+
+from ....infrastructure.cache import SingleFlight, TTLCache
+
+# "llm" summarizes with the summary model, "extractive" picks sentences locally
+SUMMARY_MODE_LLM = "llm"
+SUMMARY_MODE_EXTRACTIVE = "extractive"
+CONTEXT_SUMMARY_MODE = os.getenv("CONTEXT_SUMMARY_MODE", SUMMARY_MODE_LLM).lower()
+
+# Matches the length asked of the LLM in CONTEXT_SUMMARY_PROMPT
+EXTRACTIVE_MAX_WORDS = 50
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[\w']+")
+_STOPWORDS = frozenset("""
+a an and are as at be been but by for from had has have he her his in is it its of on or
+she that the their they this to was were which who will with as also one most known
+""".split())
+
+context_summary_cache: TTLCache[tuple, str] = TTLCache(
+    maxsize=int(os.getenv("CONTEXT_SUMMARY_CACHE_SIZE", 2048)),
+    ttl=float(os.getenv("CONTEXT_SUMMARY_CACHE_TTL", 3600)),
+    name="context_summary",
+)
+
+# Identical document sets summarized at the same moment share one LLM call
+context_summary_flight: SingleFlight[str] = SingleFlight(name="context_summary")
+
+
+def document_set_key(documents: Iterable[Document]) -> str:
+    """Identify a set of retrieved documents independently of their order."""
+    digests = sorted(
+        hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest() for doc in documents
+    )
+    return hashlib.sha1("|".join(digests).encode("utf-8")).hexdigest()
+
+
+def extractive_summary(text: str, max_words: int = EXTRACTIVE_MAX_WORDS) -> str:
+    """
+    Summarize text by keeping its most central sentences.
+
+    Sentences are scored by how frequent their content words are across the
+    whole text, then the best ones are kept in their original order until
+    the word budget is spent.
+    """
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text.strip()) if s.strip()]
+    if not sentences:
+        return ""
+
+    def content_words(sentence: str) -> list:
+        return [w for w in _WORD.findall(sentence.lower()) if w not in _STOPWORDS]
+
+    frequencies = Counter(w for sentence in sentences for w in content_words(sentence))
+
+    def score(sentence: str) -> float:
+        words = content_words(sentence)
+        return sum(frequencies[w] for w in words) / (len(words) ** 0.5) if words else 0.0
+
+    ranked = sorted(range(len(sentences)), key=lambda i: score(sentences[i]), reverse=True)
+
+    selected, used = [], 0
+    for index in ranked:
+        length = len(sentences[index].split())
+        if used + length > max_words:
+            continue
+        selected.append(index)
+        used += length
+
+    if not selected:
+        # Even the best sentence is over budget, so truncate it
+        return " ".join(sentences[ranked[0]].split()[:max_words])
+
+    return " ".join(sentences[i] for i in sorted(selected))
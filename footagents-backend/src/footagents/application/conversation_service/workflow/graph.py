@@ -2,39 +2,41 @@ from langgraph.graph import StateGraph, START, END
 from .state import FootAgentState
 from .nodes import (
     conversation_node, 
+    route_retrieval_node,
     retrieve_player_context, 
-    summarize_conversation_node,
     summarize_context_node,
     connector_node
 )
-from .edges import should_summarize_conversation
+from .edges import tools_condition
 
 
 def create_workflow_graph():
-    """Build and compile the FootAgent conversation workflow graph with 7 nodes."""
+    """Build and compile the FootAgent conversation workflow graph with 5 nodes."""
     graph_builder = StateGraph(FootAgentState)
     
     # Add all nodes
+    graph_builder.add_node("route_retrieval_node", route_retrieval_node)
     graph_builder.add_node("conversation_node", conversation_node)
     graph_builder.add_node("retrieve_player_context", retrieve_player_context)
-    graph_builder.add_node("summarize_conversation_node", summarize_conversation_node)
     graph_builder.add_node("summarize_context_node", summarize_context_node)
     graph_builder.add_node("connector_node", connector_node)
     
-    # Define the flow: START -> retrieve context -> summarize context -> conversation -> connector -> END
-    graph_builder.add_edge(START, "retrieve_player_context")
-    graph_builder.add_edge("retrieve_player_context", "summarize_context_node")
-    graph_builder.add_edge("summarize_context_node", "conversation_node")
-    graph_builder.add_edge("conversation_node", "connector_node")
+    # Define the flow: START -> route -> [retrieve context -> summarize context] -> conversation -> connector -> END
+    # Turns that don't need fresh context skip retrieval and keep the carried-over context.
+    # The conversation summary is kept up to date in the background (see summarizer.py)
+    graph_builder.add_edge(START, "route_retrieval_node")
     graph_builder.add_conditional_edges(
-        "connector_node", 
-        should_summarize_conversation,
+        "route_retrieval_node",
+        tools_condition,
         {
-            "summarize_conversation_node": "summarize_conversation_node",
-            "__end__": END
+            "retrieve_player_context": "retrieve_player_context",
+            "conversation_node": "conversation_node"
         }
     )
-    graph_builder.add_edge("summarize_conversation_node", END)
+    graph_builder.add_edge("retrieve_player_context", "summarize_context_node")
+    graph_builder.add_edge("summarize_context_node", "conversation_node")
+    graph_builder.add_edge("conversation_node", "connector_node")
+    graph_builder.add_edge("connector_node", END)
     
     return graph_builder
 
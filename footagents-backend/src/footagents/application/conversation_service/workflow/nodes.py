@@ -1,82 +1,106 @@
-from langgraph.graph.message import RemoveMessage
-from langchain.schema import HumanMessage, AIMessage
+from langchain.schema import HumanMessage, AIMessage, Document
+from langchain_core.runnables import RunnableConfig
+from ....infrastructure.rag.embeddings import normalize_query
 from .state import FootAgentState
-from .tools import retriever_tool
-from .chains import (
-    get_character_response_chain,
-    get_conversation_summary_chain,
-    get_context_summary_chain
+from .tools import get_context_retriever, retrieval_flight
+from .context_summary import (
+    CONTEXT_SUMMARY_MODE,
+    SUMMARY_MODE_EXTRACTIVE,
+    context_summary_cache,
+    context_summary_flight,
+    document_set_key,
+    extractive_summary
+)
+from .routing import retrieval_gate
+from .prompt_budget import prompt_assembler
+from .runtime import (
+    workflow_runtime,
+    CHARACTER_RESPONSE_CHAIN,
+    CHARACTER_STREAM_CHAIN,
+    CONTEXT_SUMMARY_CHAIN
 )
 
-async def conversation_node(state: FootAgentState):
+async def conversation_node(state: FootAgentState, config: RunnableConfig):
     """Invoke the character chain to generate a response."""
-    chain = get_character_response_chain()
-    response = await chain.ainvoke({
-        "character_name": state["character_name"],
-        "position": state["character_position"],
-        "era": state["character_era"],
-        "perspective": state["character_perspective"],
-        "style": state["character_style"],
-        "context": state.get("character_context", ""),
-        "summary": state.get("summary", ""),
-        "messages": state["messages"]
-    })
-    return {"messages": [response]}
+    stream_tokens = config.get("configurable", {}).get("stream_tokens", False)
+    chain = workflow_runtime.get_chain(CHARACTER_STREAM_CHAIN if stream_tokens else CHARACTER_RESPONSE_CHAIN)
+    # Fit the card, turns, summary and context into the input token budget
+    inputs, usage = prompt_assembler.assemble(
+        card={
+            "character_name": state["character_name"],
+            "position": state["character_position"],
+            "era": state["character_era"],
+            "perspective": state["character_perspective"],
+            "style": state["character_style"]
+        },
+        messages=state["messages"],
+        summary=state.get("summary", ""),
+        context=state.get("character_context", "")
+    )
+    response = await chain.ainvoke(inputs, config)
+    return {"messages": [response], "prompt_usage": usage}
+
+async def route_retrieval_node(state: FootAgentState):
+    """Decide whether the new message needs fresh context or can reuse the current one."""
+    last_message = state["messages"][-1] if state["messages"] else ""
+    message = last_message.content if hasattr(last_message, 'content') else str(last_message)
+    
+    decision = retrieval_gate.decide(message, has_context=bool(state.get("character_context")))
+    return {
+        "retrieval_route": decision.route,
+        "retrieval_reason": decision.reason
+    }
 
-async def retrieve_player_context(state: FootAgentState):
+async def retrieve_player_context(state: FootAgentState, config: RunnableConfig):
     """Retrieve relevant context about the football player."""
     # Get the last human message to understand what context to retrieve
     last_message = state["messages"][-1] if state["messages"] else ""
-    query = f"{state['character_name']} {last_message.content if hasattr(last_message, 'content') else str(last_message)}"
+    query = last_message.content if hasattr(last_message, 'content') else str(last_message)
     
-    # Use the retriever tool to get context
-    context_docs = await retriever_tool.ainvoke({"query": query})
+    # Search only this character's documents; the retriever is queried directly
+    # so document identity survives for caching. Identical concurrent queries
+    # share one search (and the first caller's run config)
+    character_id = state.get("character_id")
+    context_docs = await retrieval_flight.do(
+        (character_id, normalize_query(query)),
+        lambda: get_context_retriever().ainvoke(query, config, character_id=character_id)
+    )
     
     # Combine the retrieved context
-    context = "\n".join([doc.page_content if hasattr(doc, 'page_content') else str(doc) for doc in context_docs])
-    
-    return {"character_context": context}
-
-async def summarize_conversation_node(state: FootAgentState):
-    """Summarize the conversation and remove old messages."""
-    existing_summary = state.get("summary", "")
-    summary_chain = get_conversation_summary_chain(existing_summary)
-    
-    # Format messages for summarization
-    formatted_messages = "\n".join([
-        f"{msg.type}: {msg.content}" for msg in state["messages"]
-    ])
-    
-    # Use appropriate parameters based on chain type
-    if existing_summary:
-        response = await summary_chain.ainvoke({
-            "character_name": state["character_name"],
-            "existing_summary": existing_summary, 
-            "messages": formatted_messages
-        })
-    else:
-        response = await summary_chain.ainvoke({
-            "character_name": state["character_name"],
-            "messages": formatted_messages
-        })
+    context = "\n".join([doc.page_content for doc in context_docs])
     
-    delete_messages = [RemoveMessage(id=msg.id) for msg in state["messages"][:-5]]
     return {
-        "summary": response.content,
-        "messages": delete_messages
+        "character_context": context,
+        "context_key": document_set_key(context_docs) if context_docs else ""
     }
 
-async def summarize_context_node(state: FootAgentState):
+async def summarize_context_node(state: FootAgentState, config: RunnableConfig):
     """Summarize the retrieved context for better processing."""
     if not state.get("character_context"):
         return {"character_context": ""}
     
-    context_summary_chain = get_context_summary_chain()
-    response = await context_summary_chain.ainvoke({
-        "context": state["character_context"]
-    })
+    # The same document sets come back repeatedly, so reuse their summaries
+    cache_key = (CONTEXT_SUMMARY_MODE, state.get("context_key") or document_set_key(
+        [Document(page_content=state["character_context"])]
+    ))
+    cached_summary = context_summary_cache.get(cache_key)
+    if cached_summary is not None:
+        return {"character_context": cached_summary}
+    
+    if CONTEXT_SUMMARY_MODE == SUMMARY_MODE_EXTRACTIVE:
+        summary = extractive_summary(state["character_context"])
+    else:
+        # Requests that miss the cache together share one summary call
+        async def summarize() -> str:
+            context_summary_chain = workflow_runtime.get_chain(CONTEXT_SUMMARY_CHAIN)
+            response = await context_summary_chain.ainvoke({
+                "context": state["character_context"]
+            }, config)
+            return response.content
+        summary = await context_summary_flight.do(cache_key, summarize)
     
-    return {"character_context": response.content}
+    context_summary_cache.set(cache_key, summary)
+    return {"character_context": summary}
 
 async def connector_node(state: FootAgentState):
     """Connector node to handle flow control and state management."""
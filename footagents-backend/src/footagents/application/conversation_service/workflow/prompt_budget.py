@@ -0,0 +1,224 @@
+"""
+Token-budget-aware prompt assembly for the character chain.
+
+Counts tokens locally and fits the character card, conversation turns,
+summary and retrieved context into a fixed input budget, so prompt size
+(and with it latency and rate-limit use) stays flat however long a
+conversation runs. Parts are admitted in priority order: the card and the
+player's new message, the most recent turns, the summary, the context, and
+finally older turns as far as they fit.
+"""
+
+import os
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ....domain.prompts import FOOTBALL_CHARACTER_CARD
+
+logger = logging.getLogger(__name__)
+
+PROMPT_MAX_INPUT_TOKENS = int(os.getenv("PROMPT_MAX_INPUT_TOKENS", 3000))
+PROMPT_MIN_RECENT_MESSAGES = int(os.getenv("PROMPT_MIN_RECENT_MESSAGES", 6))
+PROMPT_TOKENIZER = os.getenv("PROMPT_TOKENIZER", "cl100k_base")
+
+# Role markers and separators the chat format adds around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+# Fallback estimate when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+
+class TokenCounter:
+    """
+    Local token counter using a tiktoken encoding, with a character-based fallback.
+
+    Groq's Llama models use their own vocabulary, so counts from the
+    ``cl100k_base`` encoding are an estimate; they are close enough for
+    budgeting. The encoding is loaded on first use (tiktoken may download it
+    once), so the runtime warm-up loads it ahead of the first request.
+    """
+
+    def __init__(self, encoding_name: str = PROMPT_TOKENIZER):
+        self.encoding_name = encoding_name
+        self._lock = threading.Lock()
+        self._encoding: Any = None
+        self._loaded = False
+
+    def load(self) -> None:
+        """Load the encoding, falling back to character estimates if tiktoken is unavailable."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                import tiktoken
+                self._encoding = tiktoken.get_encoding(self.encoding_name)
+            except Exception as e:
+                logger.warning(f"Tokenizer {self.encoding_name} unavailable, estimating tokens from length: {str(e)}")
+            self._loaded = True
+
+    @property
+    def is_exact(self) -> bool:
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """Count the tokens in a text."""
+        if not text:
+            return 0
+        self.load()
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Keep the beginning of a text, at most ``max_tokens`` tokens long."""
+        if max_tokens <= 0:
+            return ""
+        self.load()
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            return text if len(tokens) <= max_tokens else self._encoding.decode(tokens[:max_tokens])
+        return text[:max_tokens * CHARS_PER_TOKEN]
+
+
+def _message_content(message: Any) -> str:
+    if isinstance(message, dict):
+        return str(message.get("content", ""))
+    content = getattr(message, "content", message)
+    return content if isinstance(content, str) else str(content)
+
+
+class PromptAssembler:
+    """
+    Fits the character chain's inputs into a token budget.
+
+    Args:
+        max_input_tokens: Budget for everything sent to the model
+        min_recent_messages: Latest messages admitted before the summary and context
+        counter: Token counter
+    """
+
+    def __init__(
+        self,
+        max_input_tokens: int = PROMPT_MAX_INPUT_TOKENS,
+        min_recent_messages: int = PROMPT_MIN_RECENT_MESSAGES,
+        counter: Optional[TokenCounter] = None
+    ):
+        self.max_input_tokens = max_input_tokens
+        self.min_recent_messages = min_recent_messages
+        self.counter = counter or TokenCounter()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.trimmed_requests = 0
+        self.over_budget_requests = 0
+        self.input_tokens_total = 0
+        self.input_tokens_max = 0
+
+    def _message_tokens(self, message: Any) -> int:
+        return self.counter.count(_message_content(message)) + MESSAGE_OVERHEAD_TOKENS
+
+    def assemble(
+        self,
+        card: Dict[str, str],
+        messages: Sequence[Any],
+        summary: str = "",
+        context: str = ""
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Select what goes into the prompt.
+
+        Args:
+            card: Character card variables other than context and summary
+            messages: Conversation messages, oldest first; the last is the new message
+            summary: Rolling conversation summary
+            context: Retrieved player context
+
+        Returns:
+            The chain inputs and a usage record of tokens spent and trimmed per part
+        """
+        remaining = self.max_input_tokens
+
+        # 1. Character card and the player's new message are always sent
+        card_tokens = self.counter.count(FOOTBALL_CHARACTER_CARD.format(**card, context="", summary=""))
+        remaining -= card_tokens
+        messages = list(messages)
+        kept: List[Any] = messages[-1:]
+        message_tokens = sum(self._message_tokens(message) for message in kept)
+        remaining -= message_tokens
+
+        # 2. Most recent turns, newest first
+        older = messages[:-1]
+        index = len(older)
+        while index > 0 and len(kept) < self.min_recent_messages:
+            tokens = self._message_tokens(older[index - 1])
+            if tokens > remaining:
+                break
+            index -= 1
+            kept.insert(0, older[index])
+            message_tokens += tokens
+            remaining -= tokens
+
+        # 3. Summary, then 4. context, shortened to what is left
+        parts = {}
+        for name, text in (("summary", summary), ("context", context)):
+            tokens = self.counter.count(text)
+            if tokens > remaining:
+                text = self.counter.truncate(text, max(remaining, 0))
+                tokens = self.counter.count(text)
+            parts[name] = (text, tokens)
+            remaining -= tokens
+
+        # 5. Older turns while they fit; a gap is never left in the history
+        while index > 0:
+            tokens = self._message_tokens(older[index - 1])
+            if tokens > remaining:
+                break
+            index -= 1
+            kept.insert(0, older[index])
+            message_tokens += tokens
+            remaining -= tokens
+
+        summary_text, summary_tokens = parts["summary"]
+        context_text, context_tokens = parts["context"]
+        input_tokens = card_tokens + message_tokens + summary_tokens + context_tokens
+        usage = {
+            "budget": self.max_input_tokens,
+            "input_tokens": input_tokens,
+            "card_tokens": card_tokens,
+            "message_tokens": message_tokens,
+            "summary_tokens": summary_tokens,
+            "context_tokens": context_tokens,
+            "messages_kept": len(kept),
+            "messages_dropped": len(messages) - len(kept),
+            "summary_trimmed": summary_text != summary,
+            "context_trimmed": context_text != context,
+            "exact": self.counter.is_exact,
+        }
+        trimmed = usage["messages_dropped"] > 0 or usage["summary_trimmed"] or usage["context_trimmed"]
+
+        with self._lock:
+            self.requests += 1
+            self.trimmed_requests += int(trimmed)
+            self.over_budget_requests += int(input_tokens > self.max_input_tokens)
+            self.input_tokens_total += input_tokens
+            self.input_tokens_max = max(self.input_tokens_max, input_tokens)
+
+        inputs = {**card, "context": context_text, "summary": summary_text, "messages": kept}
+        return inputs, usage
+
+    def stats(self) -> Dict[str, Any]:
+        """Get budget usage statistics."""
+        return {
+            "max_input_tokens": self.max_input_tokens,
+            "tokenizer": self.counter.encoding_name if self.counter.is_exact else "estimate",
+            "requests": self.requests,
+            "trimmed_requests": self.trimmed_requests,
+            "over_budget_requests": self.over_budget_requests,
+            "avg_input_tokens": round(self.input_tokens_total / self.requests, 1) if self.requests else 0.0,
+            "max_input_tokens_seen": self.input_tokens_max,
+        }
+
+
+# Global instance for easy access
+prompt_assembler = PromptAssembler()
@@ -0,0 +1,239 @@
+"""
+Semantic response cache for opening questions.
+
+First messages to a legend are highly repetitive ("who are you?", "how many
+Ballon d'Ors?"). When enabled, replies to turns without history or summary
+are cached per character and served for later messages whose embedding is
+close enough, skipping retrieval and both LLM calls.
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ....infrastructure.cache import SingleFlight
+from ....infrastructure.rag.embeddings import get_embeddings, normalize_query
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", 0.92))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 5000))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 86400))
+RESPONSE_SINGLEFLIGHT_ENABLED = os.getenv("RESPONSE_SINGLEFLIGHT_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# (character_id, normalised message) -> (unit vector, response, expires_at)
+_Entry = Tuple[np.ndarray, str, float]
+
+
+class _CharacterVectors:
+    """
+    Preallocated matrix of one character's cached message vectors.
+
+    Rows are written in place on store and freed on removal, so a lookup
+    scores the matrix directly instead of stacking every entry. The matrix
+    doubles when full; a lookup scoring the previous one keeps a consistent
+    copy.
+    """
+
+    def __init__(self, dimension: int, capacity: int = 16):
+        self.matrix = np.zeros((capacity, dimension), dtype=np.float32)
+        # Expiry per row; 0 marks a free row
+        self.expires = np.zeros(capacity, dtype=np.float64)
+        self.keys: List[Optional[str]] = [None] * capacity
+        self.rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        # Rows handed out so far; rows past it have never been used
+        self.used = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _next_row(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self.used == len(self.keys):
+            capacity = 2 * len(self.keys)
+            matrix = np.zeros((capacity, self.matrix.shape[1]), dtype=np.float32)
+            matrix[:self.used] = self.matrix
+            expires = np.zeros(capacity, dtype=np.float64)
+            expires[:self.used] = self.expires
+            self.matrix, self.expires = matrix, expires
+            self.keys.extend([None] * (capacity - self.used))
+        self.used += 1
+        return self.used - 1
+
+    def add(self, key: str, vector: np.ndarray, expires_at: float) -> None:
+        row = self._next_row()
+        self.matrix[row] = vector
+        self.expires[row] = expires_at
+        self.keys[row] = key
+        self.rows[key] = row
+
+    def remove(self, key: str) -> None:
+        row = self.rows.pop(key, None)
+        if row is not None:
+            self.keys[row] = None
+            self.expires[row] = 0.0
+            self._free.append(row)
+
+
+class SemanticResponseCache:
+    """
+    Per-character LRU of first-turn replies, matched by cosine similarity.
+
+    An identical normalised message is answered without embedding it;
+    otherwise the message is embedded (through the shared query embedding
+    cache) and compared with the character's cached messages.
+
+    Args:
+        enabled: Whether lookups and stores do anything
+        threshold: Minimum cosine similarity for a hit
+        maxsize: Maximum cached replies across all characters
+        ttl: Seconds a reply stays valid
+    """
+
+    def __init__(
+        self,
+        enabled: bool = RESPONSE_CACHE_ENABLED,
+        threshold: float = RESPONSE_CACHE_THRESHOLD,
+        maxsize: int = RESPONSE_CACHE_SIZE,
+        ttl: float = RESPONSE_CACHE_TTL
+    ):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._by_character: Dict[str, _CharacterVectors] = {}
+        self.hits = 0
+        self.exact_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def is_cacheable(conversation_history: Optional[list], summary: str) -> bool:
+        """Only opening turns are cached: their reply doesn't depend on earlier context."""
+        return not conversation_history and not summary
+
+    async def _embed(self, message: str) -> np.ndarray:
+        from .tools import EMBEDDING_MODEL_ID, EMBEDDING_DEVICE
+
+        vector = np.asarray(await get_embeddings(EMBEDDING_MODEL_ID, EMBEDDING_DEVICE).aembed_query(message), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        self._entries.pop(key, None)
+        vectors = self._by_character.get(key[0])
+        if vectors is not None:
+            vectors.remove(key[1])
+            if not vectors:
+                del self._by_character[key[0]]
+
+    def _exact(self, character_id: str, query: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get((character_id, query))
+            if entry is None:
+                return None
+            if entry[2] <= time.monotonic():
+                self._remove((character_id, query))
+                return None
+            self._entries.move_to_end((character_id, query))
+            self.hits += 1
+            self.exact_hits += 1
+            return entry[1]
+
+    async def lookup(self, character_id: str, message: str) -> Optional[str]:
+        """Get a cached reply for a message close enough to one seen before."""
+        if not self.enabled:
+            return None
+
+        query = normalize_query(message)
+        response = self._exact(character_id, query)
+        if response is not None:
+            return response
+
+        vector = await self._embed(message)
+        now = time.monotonic()
+        with self._lock:
+            vectors = self._by_character.get(character_id)
+            if vectors is not None:
+                expires = vectors.expires[:vectors.used]
+                for row in np.nonzero((expires > 0) & (expires <= now))[0]:
+                    self._remove((character_id, vectors.keys[row]))
+            if vectors is None or not vectors:
+                self.misses += 1
+                return None
+            matrix, live = vectors.matrix[:vectors.used], vectors.expires[:vectors.used] > now
+
+        # Scored outside the lock; the best row is checked again below
+        scores = matrix @ vector
+        scores[~live] = -np.inf
+        best = int(np.argmax(scores))
+
+        with self._lock:
+            key = vectors.keys[best] if self._by_character.get(character_id) is vectors else None
+            entry = self._entries.get((character_id, key)) if key is not None else None
+            if entry is None or entry[2] <= now or float(entry[0] @ vector) < self.threshold:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end((character_id, key))
+            self.hits += 1
+            return entry[1]
+
+    async def store(self, character_id: str, message: str, response: str) -> None:
+        """Cache the reply to an opening message."""
+        if not self.enabled or not response:
+            return
+
+        vector = await self._embed(message)
+        key = (character_id, normalize_query(message))
+        entry = (vector, response, time.monotonic() + self.ttl)
+        with self._lock:
+            self._remove(key)
+            # Evict first so the new entry can take a freed row
+            while self._entries and len(self._entries) >= self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            self._entries[key] = entry
+            vectors = self._by_character.get(character_id)
+            if vectors is None:
+                vectors = self._by_character[character_id] = _CharacterVectors(len(vector))
+            vectors.add(key[1], vector, entry[2])
+            self.stores += 1
+
+    def clear(self) -> None:
+        """Drop all cached replies. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._by_character.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "characters": len(self._by_character),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "exact_hits": self.exact_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+# Global instances for easy access
+response_cache = SemanticResponseCache()
+# Opt-in: identical concurrent opening messages to a character share one workflow run
+response_flight: SingleFlight[tuple] = SingleFlight(name="first_turn_response")
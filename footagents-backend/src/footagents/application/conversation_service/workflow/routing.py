@@ -0,0 +1,150 @@
+"""Retrieval gating: decide per turn whether a message needs fresh context."""
+
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from ....infrastructure.rag.lexical import tokenize
+
+# Routes
+ROUTE_RETRIEVE = "retrieve"
+ROUTE_REUSE = "reuse"
+
+# Gating modes: heuristic routing, or retrieve on every turn
+GATING_HEURISTIC = "heuristic"
+GATING_ALWAYS = "always"
+RETRIEVAL_GATING = os.getenv("RETRIEVAL_GATING", GATING_HEURISTIC).lower()
+
+# Acknowledgements, laughter and greetings that never need new context
+SMALL_TALK = frozenset({
+    "ok", "okay", "k", "kk", "sure", "yes", "yeah", "yep", "yup", "no", "nope", "nah",
+    "thanks", "thank", "thx", "ty", "cheers", "cool", "nice", "great", "awesome", "amazing",
+    "wow", "whoa", "haha", "hahaha", "lol", "lmao", "hehe", "hi", "hello", "hey", "bye",
+    "goodbye", "later", "good", "right", "true", "agreed", "indeed", "oh", "ah", "hmm",
+    "you", "so", "very", "much", "a", "lot", "that", "is", "s", "it", "me", "too",
+})
+
+# Words that ask for new information wherever they appear ("...so cool, who was your coach")
+TOPIC_QUESTION_WORDS = frozenset({
+    "who", "what", "when", "where", "why", "how", "which", "tell", "explain", "describe",
+})
+# Auxiliaries that open a yes/no question ("did you like it"); only counted first in a sentence
+YES_NO_QUESTION_WORDS = frozenset({
+    "did", "do", "does", "was", "were", "is", "are", "can", "could", "have", "has",
+})
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+_SENTENCE_PATTERN = re.compile(r"[^.!?]+")
+
+
+@dataclass(frozen=True)
+class RoutingDecision:
+    """Whether to retrieve for a turn, and why."""
+
+    route: str
+    reason: str
+
+
+def _mentions_entity(message: str) -> bool:
+    """Years, numbers or capitalised words inside a sentence (names, clubs, trophies)."""
+    if re.search(r"\d", message):
+        return True
+    for sentence in _SENTENCE_PATTERN.findall(message):
+        words = sentence.split()
+        if any(word[:1].isupper() and word != "I" and not word.startswith("I'") for word in words[1:]):
+            return True
+    return False
+
+
+def _is_question(message: str) -> bool:
+    """A question mark, or a sentence opening with a yes/no auxiliary."""
+    if "?" in message:
+        return True
+    for sentence in _SENTENCE_PATTERN.findall(message.lower()):
+        sentence_words = _WORD_PATTERN.findall(sentence)
+        if sentence_words and sentence_words[0] in YES_NO_QUESTION_WORDS:
+            return True
+    return False
+
+
+def classify_message(message: str, has_context: bool, max_follow_up_terms: int = 3) -> RoutingDecision:
+    """
+    Classify a player message with cheap local heuristics.
+
+    A topic question word anywhere in the message, with something to look up,
+    retrieves. Other questions ("really?", "did you like it?") and statements
+    reuse the carried-over context while they have at most
+    ``max_follow_up_terms`` content words.
+
+    Args:
+        message: The new player message
+        has_context: Whether the conversation already carries character context
+        max_follow_up_terms: Content words up to which a message counts as a follow-up
+
+    Returns:
+        The routing decision
+    """
+    if not has_context:
+        return RoutingDecision(ROUTE_RETRIEVE, "no_context")
+
+    words = _WORD_PATTERN.findall(message.lower())
+    if not words:
+        return RoutingDecision(ROUTE_REUSE, "no_words")
+    if all(word in SMALL_TALK for word in words):
+        return RoutingDecision(ROUTE_REUSE, "small_talk")
+    if _mentions_entity(message):
+        return RoutingDecision(ROUTE_RETRIEVE, "entity")
+
+    content_terms = [term for term in tokenize(message) if term not in SMALL_TALK]
+    if content_terms and any(word in TOPIC_QUESTION_WORDS for word in words):
+        return RoutingDecision(ROUTE_RETRIEVE, "question")
+    if _is_question(message):
+        if len(content_terms) <= max_follow_up_terms:
+            return RoutingDecision(ROUTE_REUSE, "follow_up_question")
+        return RoutingDecision(ROUTE_RETRIEVE, "question")
+    if len(content_terms) <= max_follow_up_terms:
+        return RoutingDecision(ROUTE_REUSE, "short_follow_up")
+    return RoutingDecision(ROUTE_RETRIEVE, "new_topic")
+
+
+class RetrievalGate:
+    """Routes turns to retrieval or context carry-over and counts the decisions."""
+
+    def __init__(self, mode: str = RETRIEVAL_GATING):
+        if mode not in (GATING_HEURISTIC, GATING_ALWAYS):
+            raise ValueError(f"Unknown retrieval gating mode: {mode}")
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._routes: Counter = Counter()
+        self._reasons: Counter = Counter()
+
+    def decide(self, message: str, has_context: bool) -> RoutingDecision:
+        """Decide whether a turn needs retrieval and record the decision."""
+        if self.mode == GATING_ALWAYS:
+            decision = RoutingDecision(ROUTE_RETRIEVE, "gating_disabled")
+        else:
+            decision = classify_message(message, has_context)
+
+        with self._lock:
+            self._routes[decision.route] += 1
+            self._reasons[decision.reason] += 1
+        return decision
+
+    def stats(self) -> Dict[str, Any]:
+        """Get decision counts by route and reason."""
+        with self._lock:
+            total = sum(self._routes.values())
+            return {
+                "mode": self.mode,
+                "decisions": total,
+                "routes": dict(self._routes),
+                "reasons": dict(self._reasons),
+                "reuse_rate": round(self._routes[ROUTE_REUSE] / total, 4) if total else 0.0,
+            }
+
+
+# Global instance for easy access
+retrieval_gate = RetrievalGate()
@@ -0,0 +1,179 @@
+"""Runtime module holding the compiled workflow graph and chains shared across requests."""
+
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from ....infrastructure.llm.client_registry import llm_registry
+
+# Chain registry keys
+CHARACTER_RESPONSE_CHAIN = "character_response"
+CHARACTER_STREAM_CHAIN = "character_stream"
+CONTEXT_SUMMARY_CHAIN = "context_summary"
+CONVERSATION_SUMMARY_CHAIN = "conversation_summary"
+CONVERSATION_SUMMARY_UPDATE_CHAIN = "conversation_summary_update"
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowRuntime:
+    """
+    Process-wide holder for the compiled conversation workflow and its chains.
+
+    Compiled LangGraph graphs and LCEL chains keep no state between invocations,
+    so one instance is shared by all concurrent requests. Anything that varies
+    per request travels through the invoke-time ``RunnableConfig`` instead.
+
+    Building everything loads the embedding model and vector index, so the
+    API starts a background warm-up from its lifespan and requests await
+    ``ensure_ready()`` instead of blocking startup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._workflow: Optional[Runnable] = None
+        self._chains: Dict[str, Runnable] = {}
+        self._warm_up_task: Optional[asyncio.Task] = None
+        self.warm_up_seconds: Optional[float] = None
+        self.warm_up_error: Optional[str] = None
+        # The chains hold models bound to the pooled clients; rebuild them after a close
+        llm_registry.on_close(self.reset)
+
+    @property
+    def is_initialized(self) -> bool:
+        """Check if the workflow and chains have been built."""
+        return self._workflow is not None
+
+    def initialize(self) -> None:
+        """Build all chains and compile the workflow graph once."""
+        with self._lock:
+            if self._workflow is not None:
+                return
+
+            # Import here to avoid circular import (nodes resolve chains through the runtime)
+            from .chains import (
+                get_character_response_chain,
+                get_context_summary_chain,
+                get_conversation_summary_chain,
+            )
+            from .graph import create_footagent_workflow
+
+            self._chains = {
+                CHARACTER_RESPONSE_CHAIN: get_character_response_chain(),
+                CHARACTER_STREAM_CHAIN: get_character_response_chain(bind_tools=False),
+                CONTEXT_SUMMARY_CHAIN: get_context_summary_chain(),
+                CONVERSATION_SUMMARY_CHAIN: get_conversation_summary_chain(),
+                CONVERSATION_SUMMARY_UPDATE_CHAIN: get_conversation_summary_chain(existing_summary="update"),
+            }
+            self._workflow = create_footagent_workflow()
+
+    @property
+    def is_ready(self) -> bool:
+        """Check if the workflow is built and the retriever is loaded."""
+        from .tools import is_loaded
+        return self.is_initialized and is_loaded()
+
+    def _warm(self) -> None:
+        from .tools import get_context_retriever
+        from .prompt_budget import prompt_assembler
+        self.initialize()
+        get_context_retriever()
+        # tiktoken may fetch its encoding on first use; keep that off the request path
+        prompt_assembler.counter.load()
+
+    async def warm_up(self) -> None:
+        """Build the workflow and load the retriever in a worker thread, recording the outcome."""
+        started = time.perf_counter()
+        self.warm_up_error = None
+        try:
+            await asyncio.to_thread(self._warm)
+        except Exception as e:
+            self.warm_up_error = str(e)
+            logger.exception("Workflow warm-up failed")
+            return
+        self.warm_up_seconds = time.perf_counter() - started
+        logger.info(f"Workflow warm-up finished in {self.warm_up_seconds:.2f}s")
+
+    def start_warm_up(self) -> asyncio.Task:
+        """Start the background warm-up unless one is running or has succeeded."""
+        task = self._warm_up_task
+        loop = asyncio.get_running_loop()
+        if task is None or task.get_loop() is not loop or (task.done() and not self.is_ready):
+            self._warm_up_task = loop.create_task(self.warm_up())
+        return self._warm_up_task
+
+    async def ensure_ready(self) -> None:
+        """Wait for the warm-up, starting it if needed.
+
+        Raises:
+            RuntimeError: If the warm-up failed
+        """
+        if self.is_ready:
+            return
+        await asyncio.shield(self.start_warm_up())
+        if not self.is_ready:
+            raise RuntimeError(f"Workflow warm-up failed: {self.warm_up_error}")
+
+    def status(self) -> Dict[str, Any]:
+        """Get the warm-up state for readiness checks."""
+        if self.is_ready:
+            state = "ready"
+        elif self._warm_up_task is not None and not self._warm_up_task.done():
+            state = "warming"
+        elif self.warm_up_error:
+            state = "failed"
+        else:
+            state = "cold"
+        return {
+            "ready": state == "ready",
+            "state": state,
+            "warm_up_seconds": round(self.warm_up_seconds, 3) if self.warm_up_seconds is not None else None,
+            "error": self.warm_up_error,
+        }
+
+    def reset(self) -> None:
+        """Drop the compiled workflow and chains so the next access rebuilds them."""
+        with self._lock:
+            self._workflow = None
+            self._chains = {}
+
+    @property
+    def workflow(self) -> Runnable:
+        """Get the compiled workflow graph, building it on first access."""
+        if self._workflow is None:
+            self.initialize()
+        return self._workflow
+
+    def get_chain(self, name: str) -> Runnable:
+        """Get a prebuilt chain by its registry key."""
+        if self._workflow is None:
+            self.initialize()
+        return self._chains[name]
+
+
+def build_run_config(
+    conversation_id: Optional[str] = None,
+    character_id: Optional[str] = None,
+    stream_tokens: bool = False
+) -> RunnableConfig:
+    """Create the per-request configuration passed to the workflow at invoke time."""
+    return {
+        "run_name": "footagent_workflow",
+        "configurable": {
+            "conversation_id": conversation_id,
+            "character_id": character_id,
+            "stream_tokens": stream_tokens,
+        },
+        "metadata": {
+            "conversation_id": conversation_id,
+            "character_id": character_id,
+        },
+    }
+
+
+# Global instance for easy access
+workflow_runtime = WorkflowRuntime()
@@ -1,37 +1,140 @@
-from langchain.schema import HumanMessage
-from ....domain.character_factory import FootballLegendFactory
-from .graph import create_footagent_workflow
+from typing import Any, AsyncIterator, Optional
+from langchain.schema import AIMessage, HumanMessage
+from ...character_service import character_registry
+from ....domain.models import FootballLegend
+from ....infrastructure.rag.embeddings import normalize_query
+from .runtime import workflow_runtime, build_run_config
+from .response_cache import RESPONSE_SINGLEFLIGHT_ENABLED, response_cache, response_flight
 from .state import FootAgentState
 
+# Node whose model tokens are forwarded to streaming clients
+STREAMED_NODE = "conversation_node"
 
-async def get_character_response(
-    message: str,
-    character_id: str,
-    conversation_history: list = None,
-    summary: str = ""
-) -> tuple[str, FootAgentState]:
-    """Handle conversation by invoking the compiled workflow graph."""
-    # Get character details
-    legend = FootballLegendFactory.get_legend(character_id)
 
-    # Prepare messages
-    messages = conversation_history or []
+def _build_workflow_input(
+    legend: FootballLegend,
+    message: str,
+    conversation_history: Optional[list],
+    summary: str,
+    character_context: str = ""
+) -> dict:
+    """Prepare the initial workflow state for a turn, carrying over the last context."""
+    messages = list(conversation_history or [])
     messages.append(HumanMessage(content=message))
 
-    # Create and run the workflow
-    workflow = create_footagent_workflow()
-    result = await workflow.ainvoke({
+    return {
         "messages": messages,
+        "character_id": legend.id,
         "character_name": legend.name,
         "character_position": legend.position,
         "character_era": legend.era,
         "character_perspective": legend.perspective,
         "character_style": legend.style,
-        "summary": summary
-    })
+        "summary": summary,
+        "character_context": character_context
+    }
+
+
+def _cached_state(workflow_input: dict, response_text: str) -> dict:
+    """Final state for a turn answered from the response cache."""
+    return {
+        **workflow_input,
+        "messages": workflow_input["messages"] + [AIMessage(content=response_text)],
+        "response_cache": "hit"
+    }
+
+
+def _extract_response_text(state: FootAgentState) -> str:
+    last_message = state["messages"][-1]
+    return last_message.content if hasattr(last_message, 'content') else str(last_message)
+
+
+async def get_character_response(
+    message: str,
+    character_id: str,
+    conversation_history: list = None,
+    summary: str = "",
+    conversation_id: Optional[str] = None,
+    character_context: str = ""
+) -> tuple[str, FootAgentState]:
+    """Handle conversation by invoking the compiled workflow graph."""
+    # Get character details
+    legend = character_registry.get_legend(character_id)
+    await workflow_runtime.ensure_ready()
+    workflow_input = _build_workflow_input(legend, message, conversation_history, summary, character_context)
+
+    # Opening questions repeat across players; answer them from the cache when enabled
+    cacheable = response_cache.is_cacheable(conversation_history, summary)
+    if cacheable:
+        cached = await response_cache.lookup(legend.id, message)
+        if cached is not None:
+            return cached, _cached_state(workflow_input, cached)
+
+    # Run the shared workflow with per-request configuration
+    async def run() -> FootAgentState:
+        return await workflow_runtime.workflow.ainvoke(
+            workflow_input,
+            build_run_config(conversation_id=conversation_id, character_id=character_id)
+        )
+
+    if cacheable and RESPONSE_SINGLEFLIGHT_ENABLED:
+        # Opening turns carry no per-player state, so identical ones in flight share a run
+        result = dict(await response_flight.do((legend.id, normalize_query(message), character_context), run))
+    else:
+        result = await run()
+    response_text = _extract_response_text(result)
+
+    if cacheable:
+        await response_cache.store(legend.id, message, response_text)
+    return response_text, result
+
+
+async def stream_character_response(
+    message: str,
+    character_id: str,
+    conversation_history: list = None,
+    summary: str = "",
+    conversation_id: Optional[str] = None,
+    character_context: str = ""
+) -> AsyncIterator[tuple[str, Any]]:
+    """
+    Run the workflow and stream the character's reply token by token.
+
+    Yields ``("chunk", text)`` for every token delta produced by the
+    conversation node, then a single ``("done", (response_text, state))``
+    once the graph has finished.
+    """
+    legend = character_registry.get_legend(character_id)
+    await workflow_runtime.ensure_ready()
+    workflow_input = _build_workflow_input(legend, message, conversation_history, summary, character_context)
+
+    # A cached reply is sent as a single chunk
+    cacheable = response_cache.is_cacheable(conversation_history, summary)
+    if cacheable:
+        cached = await response_cache.lookup(legend.id, message)
+        if cached is not None:
+            yield "chunk", cached
+            yield "done", (cached, _cached_state(workflow_input, cached))
+            return
+
+    final_state = None
+    async for event in workflow_runtime.workflow.astream_events(
+        workflow_input,
+        build_run_config(conversation_id=conversation_id, character_id=character_id, stream_tokens=True),
+        version="v2"
+    ):
+        kind = event["event"]
+        if kind == "on_chat_model_stream" and event.get("metadata", {}).get("langgraph_node") == STREAMED_NODE:
+            content = event["data"]["chunk"].content
+            if content:
+                yield "chunk", content
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            final_state = event["data"]["output"]
 
-    # Extract response
-    last_message = result["messages"][-1]
-    response_text = last_message.content if hasattr(last_message, 'content') else str(last_message)
+    if final_state is None:
+        raise RuntimeError("Workflow finished without producing a final state")
 
-    return response_text, result 
\ No newline at end of file
+    response_text = _extract_response_text(final_state)
+    if cacheable:
+        await response_cache.store(legend.id, message, response_text)
+    yield "done", (response_text, final_state)
@@ -4,10 +4,15 @@ class FootAgentState(MessagesState):
     """State class for FootAgent conversation workflow."""
     
     character_context: str = ""
+    context_key: str = ""
+    retrieval_route: str = ""
+    retrieval_reason: str = ""
+    character_id: str = ""
     character_name: str = ""
     character_position: str = ""
     character_era: str = ""
     character_perspective: str = ""
     character_style: str = ""
     summary: str = ""
-    system_context: str = "" 
\ No newline at end of file
+    system_context: str = ""
+    prompt_usage: dict = {} 
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""
+Background conversation summarization.
+
+Older turns are folded into the rolling summary by background workers
+instead of an extra graph node after the reply. Jobs are keyed by
+conversation, so a conversation is queued at most once however many turns
+arrive meanwhile. The summary is stored together with a watermark of how
+many messages it covers, and later turns send only the messages after it.
+
+The summary trigger has to fit inside the recent message window kept on the
+conversation document, so that the messages after the watermark are
+normally all in that window. If the summarizer falls behind anyway, the
+messages that have left the window are loaded from the message buckets.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from ....integrations.mongodb.models import ConversationDocument
+from ....integrations.mongodb.repositories import (
+    ConversationRepository,
+    conversation_repository,
+    RECENT_MESSAGE_WINDOW
+)
+from .runtime import (
+    workflow_runtime,
+    CONVERSATION_SUMMARY_CHAIN,
+    CONVERSATION_SUMMARY_UPDATE_CHAIN
+)
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_TRIGGER_MESSAGES = int(os.getenv("SUMMARY_TRIGGER_MESSAGES", 16))
+SUMMARY_KEEP_MESSAGES = int(os.getenv("SUMMARY_KEEP_MESSAGES", 6))
+SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", 2))
+SUMMARY_MAX_BACKFILL_MESSAGES = int(os.getenv("SUMMARY_MAX_BACKFILL_MESSAGES", 100))
+
+
+class ConversationSummarizer:
+    """
+    Keyed job queue that keeps conversation summaries up to date.
+
+    Args:
+        repository: Conversation repository holding summaries and message buckets
+        trigger_messages: Unsummarized messages that trigger a summary
+        keep_messages: Most recent messages left out of the summary and sent verbatim
+        workers: Number of concurrent summarization workers
+        recent_window: Messages kept on the conversation document
+        max_backfill: Most messages loaded from the buckets when the summarizer lags
+
+    Raises:
+        ValueError: If the trigger doesn't fit inside the recent window, or
+            ``keep_messages`` isn't below it
+    """
+
+    def __init__(
+        self,
+        repository: ConversationRepository = conversation_repository,
+        trigger_messages: int = SUMMARY_TRIGGER_MESSAGES,
+        keep_messages: int = SUMMARY_KEEP_MESSAGES,
+        workers: int = SUMMARY_WORKERS,
+        recent_window: int = RECENT_MESSAGE_WINDOW,
+        max_backfill: int = SUMMARY_MAX_BACKFILL_MESSAGES
+    ):
+        if not 0 <= keep_messages < trigger_messages:
+            raise ValueError(
+                f"SUMMARY_KEEP_MESSAGES ({keep_messages}) must be below SUMMARY_TRIGGER_MESSAGES ({trigger_messages})"
+            )
+        # A turn adds two messages after the trigger check, so the window needs one spare
+        if trigger_messages >= recent_window:
+            raise ValueError(
+                f"SUMMARY_TRIGGER_MESSAGES ({trigger_messages}) must be below RECENT_MESSAGE_WINDOW ({recent_window})"
+            )
+
+        self.repository = repository
+        self.trigger_messages = trigger_messages
+        self.keep_messages = keep_messages
+        self.workers = workers
+        self.recent_window = recent_window
+        self.max_backfill = max_backfill
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Conversations queued or being summarized
+        self._pending: Set[str] = set()
+        self.scheduled = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.stale = 0
+        self.failed = 0
+        self.backfills = 0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # Created lazily so it binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    def needs_summary(self, message_count: int, summary_watermark: int) -> bool:
+        """Check whether enough messages have built up after the watermark."""
+        return message_count - summary_watermark >= self.trigger_messages
+
+    def schedule(self, conversation_id: str) -> bool:
+        """
+        Queue a conversation for summarization.
+
+        Returns:
+            False if the conversation was already queued or being summarized
+        """
+        if conversation_id in self._pending:
+            self.coalesced += 1
+            return False
+        self._pending.add(conversation_id)
+        self.queue.put_nowait(conversation_id)
+        self.scheduled += 1
+        return True
+
+    async def unsummarized_messages(self, conversation: ConversationDocument) -> List[Dict[str, Any]]:
+        """
+        Messages after the summary watermark, oldest first, for the next prompt.
+
+        When the summarizer has fallen so far behind that the watermark
+        predates the recent window, the messages in between are loaded from
+        the message buckets (at most ``max_backfill`` of the newest) instead
+        of being left out of both the summary and the prompt.
+        """
+        start, end = conversation.unsummarized_gap()
+        if start >= end:
+            return conversation.unsummarized_messages()
+
+        if end - start > self.max_backfill:
+            logger.warning(
+                f"Summary of conversation {conversation.conversation_id} is {end - start} messages "
+                f"behind the recent window, loading the last {self.max_backfill}"
+            )
+            start = end - self.max_backfill
+        self.backfills += 1
+        missing = await self.repository.buckets.get_messages(conversation.conversation_id, start, end)
+        return [
+            {key: value for key, value in message.items() if key != "seq"}
+            for message in missing
+        ] + conversation.unsummarized_messages()
+
+    async def _summarize_messages(self, conversation_id: str, character_name: str,
+                                  existing_summary: str, messages: List[Dict[str, Any]]) -> str:
+        formatted_messages = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+        config = {"run_name": "conversation_summary", "metadata": {"conversation_id": conversation_id}}
+
+        if existing_summary:
+            response = await workflow_runtime.get_chain(CONVERSATION_SUMMARY_UPDATE_CHAIN).ainvoke({
+                "character_name": character_name,
+                "existing_summary": existing_summary,
+                "messages": formatted_messages
+            }, config)
+        else:
+            response = await workflow_runtime.get_chain(CONVERSATION_SUMMARY_CHAIN).ainvoke({
+                "character_name": character_name,
+                "messages": formatted_messages
+            }, config)
+        return response.content
+
+    async def summarize(self, conversation_id: str) -> bool:
+        """
+        Fold the messages between the watermark and the kept recent turns into the summary.
+
+        Returns:
+            True if the conversation may need another pass (new messages, or a
+            concurrent summary won the write)
+        """
+        conversation = await self.repository.find_by_conversation_id(conversation_id)
+        if conversation is None or not self.needs_summary(conversation.message_count, conversation.summary_watermark):
+            return False
+
+        previous_watermark = conversation.summary_watermark
+        watermark = conversation.message_count - self.keep_messages
+        if watermark <= previous_watermark:
+            return False
+
+        messages = await self.repository.buckets.get_messages(conversation_id, previous_watermark, watermark)
+        summary = await self._summarize_messages(
+            conversation_id, conversation.character_name, conversation.summary, messages
+        )
+        if not await self.repository.save_summary(conversation_id, summary, watermark, previous_watermark):
+            self.stale += 1
+            return True
+
+        self.completed += 1
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            conversation_id = await self.queue.get()
+            again = False
+            try:
+                again = await self.summarize(conversation_id)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error summarizing conversation {conversation_id}: {str(e)}")
+            finally:
+                self._pending.discard(conversation_id)
+                self.queue.task_done()
+
+            # Turns that arrived during the summary may already call for another one
+            if again:
+                conversation = await self.repository.find_by_conversation_id(conversation_id)
+                if conversation and self.needs_summary(conversation.message_count, conversation.summary_watermark):
+                    self.schedule(conversation_id)
+
+    def start(self) -> None:
+        """Start the summarization workers."""
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._run()))
+
+    async def stop(self) -> None:
+        """
+        Stop the workers.
+
+        Queued jobs are dropped and forgotten; the watermark is persisted, so
+        the next turn of each conversation schedules them again.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._pending.clear()
+        self._queue = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth and job statistics."""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "pending": len(self._pending),
+            "workers": len(self._tasks),
+            "scheduled": self.scheduled,
+            "coalesced": self.coalesced,
+            "completed": self.completed,
+            "stale": self.stale,
+            "failed": self.failed,
+            "backfills": self.backfills,
+        }
+
+
+# Global instance for easy access
+conversation_summarizer = ConversationSummarizer()
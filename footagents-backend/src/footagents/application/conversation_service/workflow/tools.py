@@ -1,19 +1,76 @@
-"""Tools module providing language model chains and retriever tools for the workflow."""
+"""Tools module providing language model chains and retriever tools for the workflow.
+
+The retriever loads the sentence-transformers model and opens the vector
+index, so it is built on first use (normally by the runtime warm-up) rather
+than at import time.
+"""
+
+import threading
+from typing import List, Optional
 
 from langchain.tools.retriever import create_retriever_tool
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.tools import BaseTool
+from ....infrastructure.cache import SingleFlight
+from ....infrastructure.rag.embeddings import EMBEDDING_MODEL_ID
 from ....infrastructure.rag.retrievers import get_retriever
 
-# Create retriever and retriever tool as shown in lesson 1
-retriever = get_retriever(
-    embedding_model_id="sentence-transformers/all-MiniLM-L6-v2",
-    k=5,
-    device="cpu"
-)
+# Embedding model shared by the retriever and the response cache
+EMBEDDING_DEVICE = "cpu"
+
+# Identical concurrent queries for the same character share one retrieval
+retrieval_flight: SingleFlight[list] = SingleFlight(name="retrieval")
+
+_lock = threading.Lock()
+_retriever: Optional[BaseRetriever] = None
+_retriever_tool: Optional[BaseTool] = None
+
+
+def get_context_retriever() -> BaseRetriever:
+    """Get the shared context retriever, loading the embedding model on first call."""
+    global _retriever
+    if _retriever is None:
+        with _lock:
+            if _retriever is None:
+                _retriever = get_retriever(
+                    embedding_model_id=EMBEDDING_MODEL_ID,
+                    k=5,
+                    device=EMBEDDING_DEVICE
+                )
+    return _retriever
+
+
+def get_retriever_tool() -> BaseTool:
+    """Get the retriever tool bound to the character response model."""
+    global _retriever_tool
+    if _retriever_tool is None:
+        retriever = get_context_retriever()
+        with _lock:
+            if _retriever_tool is None:
+                _retriever_tool = create_retriever_tool(
+                    retriever,
+                    "retrieve_player_context",
+                    "Search and return information about a specific football player.",
+                )
+    return _retriever_tool
+
+
+def get_tools() -> List[BaseTool]:
+    """Get the tools available to the workflow."""
+    return [get_retriever_tool()]
+
+
+def is_loaded() -> bool:
+    """Check whether the retriever has been built."""
+    return _retriever is not None
 
-retriever_tool = create_retriever_tool(
-    retriever,
-    "retrieve_player_context",
-    "Search and return information about a specific football player.",
-)
 
-tools = [retriever_tool] 
\ No newline at end of file
+def __getattr__(name: str):
+    # Keep the old module attributes working, resolved lazily
+    if name == "retriever":
+        return get_context_retriever()
+    if name == "retriever_tool":
+        return get_retriever_tool()
+    if name == "tools":
+        return get_tools()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,5 @@
+import re
+import unicodedata
 from .models import FootballLegend
 from typing import List
 
@@ -19,6 +21,22 @@ FOOTBALL_LEGENDS = {
     "sophia": "Sophia AI",
 }
 
+# Alternative ids used by knowledge sources and UI assets, mapped to canonical legend ids
+LEGEND_ALIASES = {
+    "leomessi": "messi",
+    "lionelmessi": "messi",
+    "cristianoronaldo": "ronaldo",
+    "cr7": "ronaldo",
+    "diegomaradona": "maradona",
+    "ricardokaka": "kaka",
+    "neymarjr": "neymar",
+    "r9": "ronaldonazario",
+    "siralexferguson": "alexferguson",
+    "carloancelotti": "ancelotti",
+    "klopp": "jurgenklopp",
+    "guardiola": "pepguardiola",
+}
+
 LEGEND_POSITIONS = {
     "messi": "Right Winger / False 9",
     "ronaldo": "Left Winger / Striker",
@@ -243,9 +261,16 @@ LEGEND_CAREER_HIGHLIGHTS = {
 
 
 class FootballLegendFactory:
+    @staticmethod
+    def normalize_id(legend_id: str) -> str:
+        """Map any spelling of a legend id (e.g. "Leo Messi", "leomessi") to its canonical id."""
+        ascii_id = unicodedata.normalize("NFKD", legend_id).encode("ascii", "ignore").decode("ascii")
+        legend_id = re.sub(r"[^a-z0-9]", "", ascii_id.lower())
+        return LEGEND_ALIASES.get(legend_id, legend_id)
+    
     @staticmethod
     def get_legend(legend_id: str) -> FootballLegend:
-        legend_id = legend_id.lower()
+        legend_id = FootballLegendFactory.normalize_id(legend_id)
         
         if legend_id not in FOOTBALL_LEGENDS:
             raise ValueError(f"Legend {legend_id} not found")
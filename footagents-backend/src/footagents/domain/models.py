@@ -1,9 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 
 
 class FootballLegend(BaseModel):
+    # Shared by the character registry snapshot, so never mutated in place
+    model_config = ConfigDict(frozen=True)
+
     id: str
     name: str
     position: str
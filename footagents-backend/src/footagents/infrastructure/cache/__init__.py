@@ -0,0 +1,4 @@
+"""In-process caching primitives shared across the application."""
+
+from .ttl_cache import TTLCache
+from .singleflight import SingleFlight
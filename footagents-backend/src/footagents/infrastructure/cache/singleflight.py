@@ -0,0 +1,65 @@
+"""Request coalescing: concurrent calls with the same key share one in-flight execution."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight(Generic[T]):
+    """
+    Collapses concurrent identical async calls into one.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task instead of starting their own. Once it
+    finishes the key is released, so later calls run again (pair this with a
+    cache to keep results around). The work runs as its own task, so a
+    caller that is cancelled (e.g. a disconnected client) doesn't cancel it
+    for the others. Errors are raised to every caller sharing the call.
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self._calls: Dict[Hashable, "asyncio.Task[T]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def _release(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` for ``key``, or join the call already in flight for it.
+
+        Args:
+            key: Identifies calls whose results are interchangeable
+            fn: Coroutine function doing the work
+
+        Returns:
+            The result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done, key=key: self._release(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get in-flight and coalescing statistics."""
+        calls = self.executions + self.coalesced
+        return {
+            "name": self.name,
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / calls, 4) if calls else 0.0,
+            "errors": self.errors,
+        }
@@ -0,0 +1,289 @@
+"""
+LLM Client Registry
+
+This module provides a process-wide registry of ChatGroq models keyed by
+(model, temperature). All models share one pooled keep-alive HTTP client, and
+async calls pass through a per-model concurrency cap.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_groq import ChatGroq
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+# Concurrent in-flight requests allowed per model
+DEFAULT_MODEL_CONCURRENCY = {
+    "llama-3.3-70b-versatile": 8,
+    "llama-3.1-8b-instant": 32,
+}
+DEFAULT_CONCURRENCY = 16
+
+
+def _parse_model_concurrency(value: Optional[str]) -> Dict[str, int]:
+    """Parse ``model=limit`` pairs, e.g. ``llama-3.3-70b-versatile=8,llama-3.1-8b-instant=32``."""
+    limits = dict(DEFAULT_MODEL_CONCURRENCY)
+    if not value:
+        return limits
+
+    for pair in value.split(","):
+        if "=" not in pair:
+            continue
+        model, limit = pair.split("=", 1)
+        try:
+            limits[model.strip()] = max(1, int(limit))
+        except ValueError:
+            logger.warning(f"Ignoring invalid concurrency limit for {model.strip()}: {limit}")
+    return limits
+
+
+class ModelConcurrencyLimiter:
+    """Async semaphore capping in-flight requests for one model, with usage counters."""
+
+    def __init__(self, model: str, max_concurrency: int):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self.total_wait_ms = 0.0
+
+    async def __aenter__(self) -> "ModelConcurrencyLimiter":
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.total_wait_ms += (time.perf_counter() - start) * 1000
+        self.total_requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter usage statistics."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "peak_in_flight": self.peak_in_flight,
+            "total_requests": self.total_requests,
+            "avg_wait_ms": round(self.total_wait_ms / self.total_requests, 3) if self.total_requests else 0.0,
+        }
+
+
+class PooledChatGroq(ChatGroq):
+    """
+    ChatGroq that acquires a per-model slot from the registry before each async call.
+
+    Only the async paths are capped; the server never calls the models synchronously.
+    """
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.streaming:
+            # Delegates to _astream, which takes the slot itself
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        async with llm_registry.limiter(self.model_name):
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async with llm_registry.limiter(self.model_name):
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+
+
+class LLMClientRegistry:
+    """
+    Registry of shared chat models backed by one pooled HTTP client.
+
+    Models are cached per (model, temperature) so repeated lookups return the
+    same instance, and every instance reuses the same keep-alive connections
+    instead of opening a new TLS session per call. Holders of models (e.g. the
+    workflow runtime's chains) register ``on_close`` callbacks to drop them
+    when the clients are closed.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        model_concurrency: Optional[Dict[str, int]] = None,
+    ):
+        self.max_connections = max_connections or int(
+            os.getenv("LLM_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)
+        )
+        self.max_keepalive_connections = max_keepalive_connections or int(
+            os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+        )
+        self.keepalive_expiry = keepalive_expiry or float(
+            os.getenv("LLM_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY)
+        )
+        self.model_concurrency = model_concurrency or _parse_model_concurrency(
+            os.getenv("LLM_MODEL_CONCURRENCY")
+        )
+
+        self._lock = threading.Lock()
+        self._models: Dict[Tuple[str, float], ChatGroq] = {}
+        self._limiters: Dict[str, ModelConcurrencyLimiter] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+        self._close_callbacks: List[Callable[[], None]] = []
+        self.model_hits = 0
+        self.model_misses = 0
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def _ensure_http_clients(self) -> None:
+        """Create the shared sync and async HTTP clients on first use."""
+        if self._http_client is None:
+            self._http_client = httpx.Client(limits=self._limits())
+        if self._http_async_client is None:
+            self._http_async_client = httpx.AsyncClient(limits=self._limits())
+
+    def get_chat_model(self, model: str, temperature: float) -> ChatGroq:
+        """
+        Get the shared chat model for a (model, temperature) pair.
+
+        Args:
+            model: Groq model name
+            temperature: Sampling temperature
+
+        Returns:
+            A ChatGroq instance using the pooled HTTP clients
+        """
+        key = (model, float(temperature))
+        chat_model = self._models.get(key)
+        if chat_model is not None:
+            self.model_hits += 1
+            return chat_model
+
+        with self._lock:
+            chat_model = self._models.get(key)
+            if chat_model is None:
+                self._ensure_http_clients()
+                chat_model = PooledChatGroq(
+                    api_key=os.getenv("GROQ_API_KEY"),
+                    model_name=model,
+                    temperature=temperature,
+                    http_client=self._http_client,
+                    http_async_client=self._http_async_client,
+                )
+                self._models[key] = chat_model
+                self.model_misses += 1
+                logger.info(f"Created pooled chat model {model} (temperature={temperature})")
+            else:
+                self.model_hits += 1
+            return chat_model
+
+    def limiter(self, model: str) -> ModelConcurrencyLimiter:
+        """Get the concurrency limiter for a model."""
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.setdefault(
+                    model,
+                    ModelConcurrencyLimiter(model, self.model_concurrency.get(model, DEFAULT_CONCURRENCY))
+                )
+        return limiter
+
+    def _pool_stats(self, client: Optional[Any]) -> Dict[str, int]:
+        """Best-effort connection counts from the httpx transport pool."""
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for conn in connections if getattr(conn, "is_idle", lambda: False)())
+        return {"open_connections": len(connections), "idle_connections": idle}
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool and per-model concurrency statistics."""
+        return {
+            "pool": {
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "keepalive_expiry": self.keepalive_expiry,
+                "async": self._pool_stats(self._http_async_client),
+                "sync": self._pool_stats(self._http_client),
+            },
+            "models": [
+                {"model": model, "temperature": temperature}
+                for model, temperature in self._models
+            ],
+            "model_cache": {"hits": self.model_hits, "misses": self.model_misses},
+            "concurrency": {model: limiter.stats() for model, limiter in self._limiters.items()},
+        }
+
+    def on_close(self, callback: Callable[[], None]) -> None:
+        """Register a callback run by ``aclose`` to drop anything holding the closed models."""
+        with self._lock:
+            if callback not in self._close_callbacks:
+                self._close_callbacks.append(callback)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP clients and drop cached models, limiters and model holders."""
+        with self._lock:
+            http_client, self._http_client = self._http_client, None
+            http_async_client, self._http_async_client = self._http_async_client, None
+            self._models.clear()
+            # Limiter semaphores are bound to the loop that first used them
+            self._limiters.clear()
+            callbacks = list(self._close_callbacks)
+
+        # Models built before the close would keep using the closed clients
+        for callback in callbacks:
+            callback()
+
+        if http_async_client is not None:
+            await http_async_client.aclose()
+        if http_client is not None:
+            http_client.close()
+        logger.info("LLM client pool closed")
+
+
+# Global instance for easy access
+llm_registry = LLMClientRegistry()
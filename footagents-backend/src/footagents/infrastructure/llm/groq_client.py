@@ -1,18 +1,12 @@
-import os
 from langchain_groq import ChatGroq
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.schema import HumanMessage, SystemMessage
-from dotenv import load_dotenv
 
-load_dotenv()
+from .client_registry import llm_registry
 
 
 def get_groq_client(temperature: float = 0.7, model: str = "llama-3.3-70b-versatile") -> ChatGroq:
-    return ChatGroq(
-        api_key=os.getenv("GROQ_API_KEY"),
-        model_name=model,
-        temperature=temperature,
-    )
+    return llm_registry.get_chat_model(model=model, temperature=temperature)
 
 
 def get_character_chain():
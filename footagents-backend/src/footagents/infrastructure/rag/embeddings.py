@@ -0,0 +1,105 @@
+"""Query embedding cache placed in front of the retriever's embedding model."""
+
+import os
+import re
+import asyncio
+import threading
+from array import array
+from typing import Dict, List, Tuple
+
+from langchain_core.embeddings import Embeddings
+from langchain_huggingface import HuggingFaceEmbeddings
+
+from ..cache import TTLCache
+
+# Rough per-entry bookkeeping cost (tuple, OrderedDict slot, array header)
+_ENTRY_OVERHEAD_BYTES = 200
+_TRAILING_PUNCTUATION = re.compile(r"[\s.!?,;:]+$")
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# Single source for the ingestion CLI, the retriever and the response cache:
+# the index is rebuilt when it is opened with a different model
+EMBEDDING_MODEL_ID = os.getenv("EMBEDDING_MODEL_NAME", DEFAULT_EMBEDDING_MODEL)
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing punctuation ("Hi!!" -> "hi")."""
+    return _TRAILING_PUNCTUATION.sub("", " ".join(text.casefold().split()))
+
+
+def _entry_size(key: Tuple[str, str], vector: array) -> int:
+    return len(key[0]) + len(key[1]) + len(vector) * vector.itemsize + _ENTRY_OVERHEAD_BYTES
+
+
+# Shared by every CachedQueryEmbeddings; keys include the model id.
+# Vectors are stored as float32 arrays (~1.5 KB for MiniLM) instead of Python float lists.
+query_embedding_cache: TTLCache[Tuple[str, str], array] = TTLCache(
+    maxsize=int(os.getenv("EMBEDDING_CACHE_SIZE", 10000)),
+    ttl=None,
+    name="query_embeddings",
+    max_bytes=int(float(os.getenv("EMBEDDING_CACHE_MAX_MB", 32)) * 1024 * 1024),
+    sizeof=_entry_size,
+)
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that memoises query vectors in a bounded LRU cache.
+
+    Queries are normalised before embedding, so "Hi!" and "hi" share one
+    vector. Document embedding is passed straight through.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_id: str, cache: TTLCache = query_embedding_cache):
+        self.embeddings = embeddings
+        self.model_id = model_id
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def _embed_and_store(self, key: Tuple[str, str], query: str) -> array:
+        vector = array("f", self.embeddings.embed_query(query))
+        self.cache.set(key, vector)
+        return vector
+
+    def embed_query(self, text: str) -> List[float]:
+        query = normalize_query(text)
+        key = (self.model_id, query)
+
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = self._embed_and_store(key, query)
+        return vector.tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        query = normalize_query(text)
+        key = (self.model_id, query)
+
+        vector = self.cache.get(key)
+        if vector is None:
+            # Model inference is CPU-bound; keep it off the event loop
+            vector = await asyncio.get_running_loop().run_in_executor(None, self._embed_and_store, key, query)
+        return vector.tolist()
+
+
+_models_lock = threading.Lock()
+_models: Dict[Tuple[str, str], CachedQueryEmbeddings] = {}
+
+
+def get_embeddings(embedding_model_id: str, device: str = "cpu") -> CachedQueryEmbeddings:
+    """Get the process-wide cached embeddings for a model, loading it on first use."""
+    key = (embedding_model_id, device)
+    with _models_lock:
+        if key not in _models:
+            _models[key] = CachedQueryEmbeddings(
+                HuggingFaceEmbeddings(
+                    model_name=embedding_model_id,
+                    model_kwargs={'device': device}
+                ),
+                model_id=embedding_model_id
+            )
+        return _models[key]
@@ -0,0 +1,379 @@
+"""
+Flat Vector Index
+
+Exact dot-product search over a memory-mapped float32 matrix. The matrix is
+exported from the persisted Chroma collection (which stays the source of
+truth for syncing and ingestion), with rows grouped by character so that a
+character-scoped search is a single contiguous slice. Every worker process
+maps the same ``.npy`` file, so the pages are shared through the OS page
+cache instead of being copied per process. Row texts and metadata are kept
+the same way: a JSON Lines file indexed by an array of byte offsets, both
+mapped, with a row decoded only when it is returned as a hit, so per-process
+memory doesn't grow with the corpus.
+
+The searched matrix can be stored as float16 or int8 (symmetric per-row
+scalar quantisation) to cut the resident size by 2x or 4x. The float32
+matrix is always kept on disk, so the best quantised candidates can be
+re-scored at full precision while only their pages are read.
+"""
+
+import os
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from langchain.schema import Document
+
+from ...domain.character_factory import FootballLegendFactory
+from .vector_index import PersistentVectorIndex, CHARACTER_KEY, DOC_ID_KEY
+
+logger = logging.getLogger(__name__)
+
+FLAT_INDEX_VERSION = 2
+VECTORS_FILENAME = "vectors.npy"
+METADATA_FILENAME = "flat_index_meta.json"
+ROWS_FILENAME = "rows.jsonl"
+ROW_OFFSETS_FILENAME = "rows.offsets.npy"
+
+# Storage types for the searched matrix
+DTYPE_FLOAT32 = "float32"
+DTYPE_FLOAT16 = "float16"
+DTYPE_INT8 = "int8"
+VECTOR_DTYPES = (DTYPE_FLOAT32, DTYPE_FLOAT16, DTYPE_INT8)
+
+# Rows converted to float32 at a time when scoring a quantised matrix
+SCORE_BLOCK_ROWS = 1024
+
+# Rows without a character metadata value are grouped under this key
+UNSCOPED = ""
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Quantise rows to int8 with one float32 scale per row (``row ~= codes * scale``)."""
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def _quantized_filename(dtype: str) -> str:
+    return VECTORS_FILENAME if dtype == DTYPE_FLOAT32 else f"vectors.{dtype}.npy"
+
+
+def _scales_filename() -> str:
+    return f"vectors.{DTYPE_INT8}.scales.npy"
+
+
+def _save_array(path: str, array: np.ndarray) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def _map_bytes(path: str) -> np.ndarray:
+    # An empty file can't be memory-mapped
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode="r")
+
+
+def _write_rows(directory: str, rows: List[List[Any]]) -> None:
+    """Write rows as JSON Lines plus the byte offset of each line (and the file end)."""
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    path = os.path.join(directory, ROWS_FILENAME)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        for position, row in enumerate(rows):
+            line = json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n"
+            f.write(line)
+            offsets[position + 1] = offsets[position] + len(line)
+    _save_array(os.path.join(directory, ROW_OFFSETS_FILENAME), offsets)
+    os.replace(tmp, path)
+
+
+def _read_collection(index: PersistentVectorIndex, batch_size: int = 1000):
+    """Page through the Chroma collection, yielding stored vectors with their documents."""
+    offset = 0
+    while True:
+        page = index.vectorstore.get(
+            include=["embeddings", "documents", "metadatas"], limit=batch_size, offset=offset
+        )
+        yield page
+        if len(page["ids"]) < batch_size:
+            return
+        offset += batch_size
+
+
+class FlatVectorIndex:
+    """
+    Memory-mapped matrix of normalised embeddings plus memory-mapped row data.
+
+    Each row's document id, text and metadata are read from the row file on
+    demand. A small JSON sidecar holds the ``[start, end)`` row range of
+    every character and what the index was built from.
+
+    Args:
+        directory: Directory holding the index files
+        dtype: Storage type searched: ``float32``, ``float16`` or ``int8``
+        rescore_factor: With a quantised dtype, fetch ``k * rescore_factor``
+            candidates and re-rank them against the float32 vectors (0 disables)
+    """
+
+    def __init__(self, directory: str, dtype: str = DTYPE_FLOAT32, rescore_factor: int = 0):
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unknown vector dtype: {dtype}")
+
+        self.directory = directory
+        self.dtype = dtype
+        self.rescore_factor = rescore_factor
+        self.metadata = self._load_metadata()
+        self.vectors = np.load(os.path.join(directory, VECTORS_FILENAME), mmap_mode="r")
+        self.ranges: Dict[str, Tuple[int, int]] = {
+            character: tuple(bounds) for character, bounds in self.metadata["characters"].items()
+        }
+        self._row_offsets = np.load(os.path.join(directory, ROW_OFFSETS_FILENAME), mmap_mode="r")
+        self._row_data = _map_bytes(os.path.join(directory, ROWS_FILENAME))
+
+        self.scales: Optional[np.ndarray] = None
+        if dtype == DTYPE_FLOAT32:
+            self.codes = self.vectors
+        else:
+            self._ensure_quantized()
+            self.codes = np.load(os.path.join(directory, _quantized_filename(dtype)), mmap_mode="r")
+            if dtype == DTYPE_INT8:
+                self.scales = np.load(os.path.join(directory, _scales_filename()), mmap_mode="r")
+
+    def _load_metadata(self) -> Dict[str, Any]:
+        with open(os.path.join(self.directory, METADATA_FILENAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _ensure_quantized(self) -> None:
+        """Derive the quantised matrix from the float32 one if it is missing or outdated."""
+        path = os.path.join(self.directory, _quantized_filename(self.dtype))
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(
+            os.path.join(self.directory, VECTORS_FILENAME)
+        ):
+            return
+
+        matrix = np.asarray(self.vectors)
+        if self.dtype == DTYPE_FLOAT16:
+            _save_array(path, matrix.astype(np.float16))
+        else:
+            codes, scales = quantize_int8(matrix)
+            _save_array(os.path.join(self.directory, _scales_filename()), scales)
+            _save_array(path, codes)
+        logger.info(f"Wrote {self.dtype} vectors for {len(self)} rows in {self.directory}")
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the matrix scanned by every search (plus int8 scales)."""
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    @staticmethod
+    def is_current(directory: str, index: PersistentVectorIndex) -> bool:
+        """Check whether the exported index matches the Chroma collection it came from."""
+        path = os.path.join(directory, METADATA_FILENAME)
+        if not all(
+            os.path.exists(os.path.join(directory, filename))
+            for filename in (METADATA_FILENAME, VECTORS_FILENAME, ROWS_FILENAME, ROW_OFFSETS_FILENAME)
+        ):
+            return False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return (
+            metadata.get("version") == FLAT_INDEX_VERSION
+            and metadata.get("embedding_model") == index.embedding_model_id
+            and metadata.get("source_updated_at") == index.manifest.get("updated_at")
+        )
+
+    @staticmethod
+    def write(
+        directory: str,
+        rows: List[List[Any]],
+        vectors: np.ndarray,
+        embedding_model_id: str,
+        source_updated_at: Optional[str] = None
+    ) -> None:
+        """
+        Write a flat index from ``[doc_id, text, metadata]`` rows and their vectors.
+
+        Rows are regrouped by character and the vectors normalised.
+        """
+        order = sorted(range(len(rows)), key=lambda i: rows[i][2].get(CHARACTER_KEY) or UNSCOPED)
+        rows = [rows[i] for i in order]
+        matrix = np.asarray(vectors, dtype=np.float32)[order] if len(rows) else np.zeros((0, 0), np.float32)
+        matrix = _normalize_rows(matrix) if len(rows) else matrix
+
+        characters: Dict[str, List[int]] = {}
+        for position, (_, _, metadata) in enumerate(rows):
+            character = metadata.get(CHARACTER_KEY) or UNSCOPED
+            bounds = characters.setdefault(character, [position, position])
+            bounds[1] = position + 1
+
+        os.makedirs(directory, exist_ok=True)
+
+        # Each file is written under a temporary name and swapped in; the
+        # sidecar goes last, since it marks the index as current
+        _save_array(os.path.join(directory, VECTORS_FILENAME), matrix)
+        _write_rows(directory, rows)
+        metadata_path = os.path.join(directory, METADATA_FILENAME)
+        metadata_tmp = f"{metadata_path}.{os.getpid()}.tmp"
+        with open(metadata_tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": FLAT_INDEX_VERSION,
+                "embedding_model": embedding_model_id,
+                "source_updated_at": source_updated_at,
+                "dimension": matrix.shape[1] if matrix.ndim == 2 else 0,
+                "characters": characters,
+            }, f)
+        os.replace(metadata_tmp, metadata_path)
+        logger.info(f"Built flat vector index with {len(rows)} rows in {directory}")
+
+    @classmethod
+    def build(cls, directory: str, index: PersistentVectorIndex, **options: Any) -> "FlatVectorIndex":
+        """Export the Chroma collection into a flat index, grouped by character."""
+        rows: List[List[Any]] = []
+        vectors: List[List[float]] = []
+        for page in _read_collection(index):
+            for doc_id, text, metadata, vector in zip(
+                page["ids"], page["documents"], page["metadatas"], page["embeddings"]
+            ):
+                rows.append([doc_id, text or "", metadata or {}])
+                vectors.append(vector)
+
+        cls.write(directory, rows, np.asarray(vectors, dtype=np.float32), index.embedding_model_id,
+                  source_updated_at=index.manifest.get("updated_at"))
+        return cls(directory, **options)
+
+    @classmethod
+    def from_vector_index(
+        cls,
+        index: PersistentVectorIndex,
+        directory: Optional[str] = None,
+        dtype: Optional[str] = None,
+        rescore_factor: Optional[int] = None
+    ) -> "FlatVectorIndex":
+        """
+        Open the flat export of ``index``, rebuilding it if the collection changed.
+
+        ``dtype`` and ``rescore_factor`` fall back to the ``FLAT_INDEX_DTYPE``
+        and ``FLAT_INDEX_RESCORE`` environment variables.
+        """
+        directory = directory or os.path.join(index.persist_directory, "flat")
+        options = {
+            "dtype": (dtype or os.getenv("FLAT_INDEX_DTYPE", DTYPE_FLOAT32)).lower(),
+            "rescore_factor": rescore_factor if rescore_factor is not None else int(os.getenv("FLAT_INDEX_RESCORE", 4)),
+        }
+        if cls.is_current(directory, index):
+            return cls(directory, **options)
+        return cls.build(directory, index, **options)
+
+    def _scores(self, start: int, end: int, query: np.ndarray) -> np.ndarray:
+        if self.dtype == DTYPE_FLOAT32:
+            return self.vectors[start:end] @ query
+
+        # Upcast block by block so a large slice never needs a full float32 copy
+        scores = np.empty(end - start, dtype=np.float32)
+        for block_start in range(start, end, SCORE_BLOCK_ROWS):
+            block_end = min(block_start + SCORE_BLOCK_ROWS, end)
+            block = self.codes[block_start:block_end].astype(np.float32)
+            scores[block_start - start:block_end - start] = block @ query
+        if self.scales is not None:
+            scores *= self.scales[start:end]
+        return scores
+
+    def search(self, query_vector: List[float], k: int = 5, character: Optional[str] = None) -> List[Tuple[Document, float]]:
+        """
+        Find the ``k`` rows with the highest cosine similarity to the query.
+
+        Args:
+            query_vector: Query embedding (normalised here)
+            k: Number of results
+            character: Restrict the search to one character's rows
+
+        Returns:
+            ``(document, score)`` pairs, best first
+        """
+        if character is None:
+            start, end = 0, len(self)
+        elif character in self.ranges:
+            start, end = self.ranges[character]
+        else:
+            return []
+        if end <= start or k <= 0:
+            return []
+
+        # A new array: the caller's embedding may be shared with the embedding and response caches
+        query = np.array(query_vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        scores = self._scores(start, end, query)
+
+        rescore = self.dtype != DTYPE_FLOAT32 and self.rescore_factor > 1
+        candidates = k * self.rescore_factor if rescore else k
+        if candidates < len(scores):
+            top = np.argpartition(-scores, candidates - 1)[:candidates]
+        else:
+            top = np.arange(len(scores))
+
+        if rescore:
+            # Exact scores for the candidates only; reads just their float32 rows
+            top = np.sort(top)
+            exact = self.vectors[start + top] @ query
+            order = np.argsort(-exact)[:k]
+            return [(self._document(start + int(top[i])), float(exact[i])) for i in order]
+
+        top = top[np.argsort(-scores[top])]
+        return [(self._document(start + int(i)), float(scores[i])) for i in top]
+
+    def _document(self, row: int) -> Document:
+        start, end = int(self._row_offsets[row]), int(self._row_offsets[row + 1])
+        doc_id, text, metadata = json.loads(self._row_data[start:end].tobytes())
+        return Document(page_content=text, metadata={DOC_ID_KEY: doc_id, **metadata})
+
+
+class FlatVectorRetriever(BaseRetriever):
+    """LangChain retriever over a FlatVectorIndex, with the same ``character_id`` scoping."""
+
+    index: FlatVectorIndex
+    embeddings: Embeddings
+    k: int = 5
+
+    def _character(self, character_id: Optional[str]) -> Optional[str]:
+        return FootballLegendFactory.normalize_id(character_id) if character_id else None
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+        character_id: Optional[str] = None
+    ) -> List[Document]:
+        vector = self.embeddings.embed_query(query)
+        return [document for document, _ in self.index.search(vector, self.k, self._character(character_id))]
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: AsyncCallbackManagerForRetrieverRun,
+        character_id: Optional[str] = None
+    ) -> List[Document]:
+        vector = await self.embeddings.aembed_query(query)
+        return [document for document, _ in self.index.search(vector, self.k, self._character(character_id))]
@@ -0,0 +1,440 @@
+"""
+Knowledge Ingestion Pipeline
+
+Bulk-loads per-character knowledge into the persisted vector index. Sources
+are laid out one directory per character::
+
+    knowledge/
+        messi/
+            biography.md
+            match_reports.jsonl
+        ronaldo/
+            career.txt
+
+Text and markdown files are streamed through TextLoader, JSONL files are read
+one record per line (``{"text": ..., "metadata": {...}}``). Everything is
+chunked with RecursiveCharacterTextSplitter, embedded in large batches across a
+process pool and upserted into the index with precomputed vectors.
+
+Each file is its own index source, so a re-run skips files already ingested
+(recorded in an append-only checkpoint), re-embeds only the chunks of changed
+files whose content changed, and deletes chunks a file no longer produces.
+Ingested files are recorded as sources in the index manifest; chunks of a
+source whose file was deleted or renamed are removed at the end of the run.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from langchain.schema import Document
+from langchain.text_splitter import Language, RecursiveCharacterTextSplitter
+from langchain_community.document_loaders import TextLoader
+
+from ...domain.character_factory import FootballLegendFactory
+from .embeddings import EMBEDDING_MODEL_ID
+from .vector_index import PersistentVectorIndex, CONTENT_HASH_KEY, DOC_ID_KEY
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".txt", ".md", ".jsonl")
+CHECKPOINT_FILENAME = "ingest_checkpoint.jsonl"
+SOURCE_PREFIX = "ingest:"
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHUNK_OVERLAP = 150
+DEFAULT_BATCH_SIZE = 256
+
+# Populated in each worker process by _init_embedding_worker
+_worker_embeddings = None
+
+
+def _init_embedding_worker(embedding_model_id: str, device: str) -> None:
+    """Load the embedding model once per worker process."""
+    global _worker_embeddings
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    _worker_embeddings = HuggingFaceEmbeddings(
+        model_name=embedding_model_id,
+        model_kwargs={'device': device}
+    )
+
+
+def _embed_batch(texts: List[str]) -> List[List[float]]:
+    """Embed a batch of texts in a worker process."""
+    return _worker_embeddings.embed_documents(texts)
+
+
+@dataclass
+class IngestionStats:
+    """Counters reported while ingesting."""
+
+    files_total: int = 0
+    files_done: int = 0
+    files_skipped: int = 0
+    files_removed: int = 0
+    chunks_total: int = 0
+    chunks_embedded: int = 0
+    chunks_unchanged: int = 0
+    chunks_deleted: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class IngestionCheckpoint:
+    """Append-only record of files fully written to a given index."""
+
+    def __init__(self, persist_directory: str, index_id: str):
+        self.path = os.path.join(persist_directory, CHECKPOINT_FILENAME)
+        self.index_id = index_id
+        self._completed: Dict[str, str] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn write from an interrupted run
+                # Entries from a rebuilt index no longer describe stored vectors
+                if entry.get("index") != self.index_id:
+                    continue
+                if entry.get("removed"):
+                    self._completed.pop(entry["source"], None)
+                else:
+                    self._completed[entry["source"]] = entry["fingerprint"]
+
+    @property
+    def sources(self) -> Set[str]:
+        return set(self._completed)
+
+    def is_complete(self, source: str, fingerprint: str) -> bool:
+        return self._completed.get(source) == fingerprint
+
+    def _append(self, entry: Dict) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"index": self.index_id, **entry, "completed_at": datetime.utcnow().isoformat()}) + "\n")
+
+    def mark_complete(self, source: str, fingerprint: str, documents: int) -> None:
+        self._append({"source": source, "fingerprint": fingerprint, "documents": documents})
+        self._completed[source] = fingerprint
+
+    def mark_removed(self, source: str) -> None:
+        self._append({"source": source, "removed": True})
+        self._completed.pop(source, None)
+
+
+class IngestionPipeline:
+    """
+    Stream, chunk, embed and index knowledge files.
+
+    Embedding runs in a pool of ``workers`` processes, each holding its own
+    copy of the model; ``workers=0`` embeds in the current process. At most
+    ``2 * workers`` batches are in flight so memory stays bounded regardless
+    of corpus size.
+    """
+
+    def __init__(
+        self,
+        index: PersistentVectorIndex,
+        embedding_model_id: str = EMBEDDING_MODEL_ID,
+        device: str = "cpu",
+        workers: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    ):
+        self.index = index
+        self.embedding_model_id = embedding_model_id
+        self.device = device
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.markdown_splitter = RecursiveCharacterTextSplitter.from_language(
+            Language.MARKDOWN, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        )
+        self.checkpoint = IngestionCheckpoint(index.persist_directory, index.manifest["created_at"])
+        self.stats = IngestionStats()
+
+    # === Discovery and loading ===
+
+    def discover(self, root: Path) -> List[Tuple[str, Path]]:
+        """List (character_id, path) pairs for every supported file under root."""
+        files = []
+        for character_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+            for path in sorted(character_dir.rglob("*")):
+                if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS:
+                    files.append((FootballLegendFactory.normalize_id(character_dir.name), path))
+        return files
+
+    def _file_fingerprint(self, path: Path) -> str:
+        """Hash file bytes together with the chunking settings."""
+        digest = hashlib.sha256(f"{self.chunk_size}:{self.chunk_overlap}:".encode("utf-8"))
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _load_records(self, path: Path) -> Iterator[Tuple[str, Document]]:
+        """Stream (record_key, document) pairs from one file."""
+        if path.suffix.lower() == ".jsonl":
+            with open(path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Skipping invalid JSON at {path}:{line_number}")
+                        continue
+                    text = record.get("text") or record.get("page_content") or record.get("content")
+                    if not text:
+                        continue
+                    metadata = dict(record.get("metadata") or {})
+                    yield str(record.get("id", line_number)), Document(page_content=text, metadata=metadata)
+        else:
+            for document in TextLoader(str(path), encoding="utf-8").lazy_load():
+                yield "0", document
+
+    def _chunk_file(self, character_id: str, path: Path, root: Path, source: str) -> List[Document]:
+        """Load and chunk one file into documents with stable ids."""
+        splitter = self.markdown_splitter if path.suffix.lower() == ".md" else self.text_splitter
+        relative_path = path.relative_to(root).as_posix()
+
+        chunks = []
+        for record_key, document in self._load_records(path):
+            for chunk_index, text in enumerate(splitter.split_text(document.page_content)):
+                metadata = {
+                    key: value for key, value in document.metadata.items()
+                    if isinstance(value, (str, int, float, bool))
+                }
+                metadata.update({
+                    DOC_ID_KEY: f"{source}#{record_key}:{chunk_index}",
+                    "character": FootballLegendFactory.normalize_id(str(metadata.get("character", character_id))),
+                    "topic": metadata.get("topic", path.stem),
+                    "path": relative_path,
+                })
+                chunks.append(Document(page_content=text, metadata=metadata))
+        return chunks
+
+    # === Embedding and writing ===
+
+    def _record_source(self, source: str, fingerprint: str, documents: int) -> None:
+        # Saved once at the end of the run, not per file
+        self.index.manifest.setdefault("sources", {})[source] = {
+            "fingerprint": fingerprint,
+            "documents": documents,
+            "synced_at": datetime.utcnow().isoformat(),
+        }
+
+    def remove_missing_sources(self, current: Set[str]) -> int:
+        """
+        Delete the chunks of ingested files that are no longer under the root.
+
+        Args:
+            current: Sources of the files found in this run
+
+        Returns:
+            Number of sources removed
+        """
+        known = self.checkpoint.sources | {
+            source for source in self.index.manifest.get("sources", {}) if source.startswith(SOURCE_PREFIX)
+        }
+        removed = sorted(known - current)
+        for source in removed:
+            stale_ids = list(self.index.existing_hashes(source))
+            if stale_ids:
+                self.index.vectorstore.delete(ids=stale_ids)
+                self.stats.chunks_deleted += len(stale_ids)
+            self.index.manifest.get("sources", {}).pop(source, None)
+            self.checkpoint.mark_removed(source)
+            logger.info(f"Removed {len(stale_ids)} chunks of deleted source {source}")
+        self.stats.files_removed += len(removed)
+        return len(removed)
+
+    def _write_batch(self, batch: List[Document], embeddings: List[List[float]]) -> None:
+        self.index.vectorstore._collection.upsert(
+            ids=[doc.metadata[DOC_ID_KEY] for doc in batch],
+            embeddings=embeddings,
+            metadatas=[doc.metadata for doc in batch],
+            documents=[doc.page_content for doc in batch],
+        )
+
+    def run(self, root: str, delete_missing: bool = True) -> IngestionStats:
+        """
+        Ingest every supported file under root and return the final statistics.
+
+        Args:
+            root: Directory with one sub-directory per character
+            delete_missing: Whether to remove the chunks of previously ingested
+                files that are no longer under root
+        """
+        root_path = Path(root).resolve()
+        files = self.discover(root_path)
+        self.stats = IngestionStats(files_total=len(files))
+        started = time.perf_counter()
+
+        executor = None
+        if self.workers > 0:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_embedding_worker,
+                initargs=(self.embedding_model_id, self.device),
+            )
+        else:
+            _init_embedding_worker(self.embedding_model_id, self.device)
+
+        # source -> [chunks still to write, fingerprint, total chunks]
+        pending: Dict[str, list] = {}
+        in_flight: Dict[Future, List[Document]] = {}
+        buffer: List[Document] = []
+
+        def complete(source: str) -> None:
+            _, fingerprint, documents = pending.pop(source)
+            self.checkpoint.mark_complete(source, fingerprint, documents)
+            self._record_source(source, fingerprint, documents)
+            self.stats.files_done += 1
+
+        def finish_batch(batch: List[Document], embeddings: List[List[float]]) -> None:
+            self._write_batch(batch, embeddings)
+            self.stats.chunks_embedded += len(batch)
+            for document in batch:
+                source = document.metadata["source"]
+                pending[source][0] -= 1
+                if pending[source][0] == 0:
+                    complete(source)
+            self._report_progress(started)
+
+        def submit(batch: List[Document]) -> None:
+            texts = [doc.page_content for doc in batch]
+            if executor is None:
+                finish_batch(batch, _embed_batch(texts))
+                return
+            while len(in_flight) >= 2 * self.workers:
+                drain(FIRST_COMPLETED)
+            in_flight[executor.submit(_embed_batch, texts)] = batch
+
+        def drain(return_when) -> None:
+            done, _ = wait(list(in_flight), return_when=return_when)
+            for future in done:
+                finish_batch(in_flight.pop(future), future.result())
+
+        current: Set[str] = set()
+        try:
+            for character_id, path in files:
+                source = SOURCE_PREFIX + path.relative_to(root_path).as_posix()
+                current.add(source)
+                fingerprint = self._file_fingerprint(path)
+                if self.checkpoint.is_complete(source, fingerprint):
+                    self.stats.files_skipped += 1
+                    continue
+
+                prepared = self.index.prepare_documents(self._chunk_file(character_id, path, root_path, source), source)
+                existing = self.index.existing_hashes(source)
+
+                stale_ids = [doc_id for doc_id in existing if doc_id not in prepared]
+                if stale_ids:
+                    self.index.vectorstore.delete(ids=stale_ids)
+                    self.stats.chunks_deleted += len(stale_ids)
+
+                changed = [
+                    doc for doc_id, doc in prepared.items()
+                    if existing.get(doc_id) != doc.metadata[CONTENT_HASH_KEY]
+                ]
+                self.stats.chunks_total += len(prepared)
+                self.stats.chunks_unchanged += len(prepared) - len(changed)
+
+                pending[source] = [len(changed), fingerprint, len(prepared)]
+                if not changed:
+                    complete(source)
+                    continue
+
+                buffer.extend(changed)
+                while len(buffer) >= self.batch_size:
+                    submit(buffer[:self.batch_size])
+                    buffer = buffer[self.batch_size:]
+
+            if buffer:
+                submit(buffer)
+            if in_flight:
+                drain(None)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        if delete_missing:
+            self.remove_missing_sources(current)
+
+        self.stats.elapsed_seconds = round(time.perf_counter() - started, 2)
+        self.index.manifest["ingestion"] = {**asdict(self.stats), "completed_at": datetime.utcnow().isoformat()}
+        self.index.save_manifest()
+        logger.info(f"Ingestion finished: {asdict(self.stats)}")
+        return self.stats
+
+    def _report_progress(self, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        rate = self.stats.chunks_embedded / elapsed if elapsed else 0.0
+        logger.info(
+            f"Ingested {self.stats.files_done + self.stats.files_skipped}/{self.stats.files_total} files, "
+            f"{self.stats.chunks_embedded} chunks embedded ({rate:.1f} chunks/s)"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for knowledge ingestion."""
+    parser = argparse.ArgumentParser(description="Ingest per-character knowledge into the vector index.")
+    parser.add_argument("source", help="Directory with one sub-directory of .txt/.md/.jsonl files per character")
+    parser.add_argument("--embedding-model", default=EMBEDDING_MODEL_ID)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--workers", type=int, default=None, help="Embedding processes (0 embeds in-process)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--chunk-overlap", type=int, default=DEFAULT_CHUNK_OVERLAP)
+    parser.add_argument("--persist-directory", default=None)
+    parser.add_argument("--keep-missing", action="store_true",
+                        help="Keep chunks of previously ingested files that are no longer in the source directory")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if not os.path.isdir(args.source):
+        logger.error(f"Source directory not found: {args.source}")
+        return 1
+
+    index = PersistentVectorIndex(
+        embeddings=None,
+        embedding_model_id=args.embedding_model,
+        persist_directory=args.persist_directory,
+    )
+    pipeline = IngestionPipeline(
+        index,
+        embedding_model_id=args.embedding_model,
+        device=args.device,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+    )
+    pipeline.run(args.source, delete_missing=not args.keep_missing)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Built-in football legend knowledge used to seed the vector index."""
+
+from langchain.schema import Document
+
+from ...domain.character_factory import FootballLegendFactory
+
+# Source name recorded on every built-in document so index syncs only touch these
+BUILTIN_SOURCE = "builtin"
+
+BUILTIN_KNOWLEDGE = [
+    Document(
+        page_content="Diego Maradona was an Argentine professional footballer widely regarded as one of the greatest players in the history of the sport. He played as an attacking midfielder and forward, known for his incredible dribbling, vision, and ability to score spectacular goals.",
+        metadata={"doc_id": "maradona:biography", "character": "maradona", "topic": "biography"}
+    ),
+    Document(
+        page_content="Lionel Messi is an Argentine professional footballer who plays as a forward. He has won numerous Ballon d'Or awards and is considered one of the greatest players of all time, known for his speed, finishing, and playmaking abilities.",
+        metadata={"doc_id": "messi:biography", "character": "messi", "topic": "biography"}
+    ),
+    Document(
+        page_content="Cristiano Ronaldo is a Portuguese professional footballer who plays as a forward. He is known for his incredible athleticism, goal-scoring ability, and has won multiple Champions League titles and Ballon d'Or awards.",
+        metadata={"doc_id": "ronaldo:biography", "character": "ronaldo", "topic": "biography"}
+    ),
+    Document(
+        page_content="Kaká is a Brazilian former professional footballer who played as an attacking midfielder. He was known for his pace, technique, and ability to score from midfield. He won the Ballon d'Or in 2007.",
+        metadata={"doc_id": "kaka:biography", "character": "kaka", "topic": "biography"}
+    ),
+    Document(
+        page_content="Pep Guardiola is a Spanish professional football manager and former player. As a manager, he is known for his tactical innovation, particularly his implementation of tiki-taka playing style.",
+        metadata={"doc_id": "pepguardiola:coaching", "character": "pepguardiola", "topic": "coaching"}
+    ),
+    Document(
+        page_content="Sir Alex Ferguson is a Scottish former football manager who managed Manchester United for 26 years. He is considered one of the greatest managers in football history, known for his man-management skills and tactical acumen.",
+        metadata={"doc_id": "alexferguson:coaching", "character": "alexferguson", "topic": "coaching"}
+    ),
+    Document(
+        page_content="Jürgen Klopp is a German professional football manager known for his energetic coaching style and his ability to develop young players. He has managed Liverpool and Borussia Dortmund with great success.",
+        metadata={"doc_id": "jurgenklopp:coaching", "character": "jurgenklopp", "topic": "coaching"}
+    ),
+    Document(
+        page_content="Carlo Ancelotti is an Italian professional football manager known for his calm demeanor and tactical flexibility. He has won the Champions League multiple times as both a player and manager.",
+        metadata={"doc_id": "ancelotti:coaching", "character": "ancelotti", "topic": "coaching"}
+    )
+]
+
+
+def get_builtin_documents() -> list[Document]:
+    """Get the built-in knowledge documents tagged with their source and canonical character id."""
+    return [
+        Document(
+            page_content=doc.page_content,
+            metadata={
+                **doc.metadata,
+                "character": FootballLegendFactory.normalize_id(doc.metadata["character"]),
+                "source": BUILTIN_SOURCE
+            }
+        )
+        for doc in BUILTIN_KNOWLEDGE
+    ]
@@ -0,0 +1,134 @@
+"""
+Lexical Index
+
+In-process BM25 inverted index over the knowledge documents. It is built
+alongside the vector index and catches the exact football entities
+(trophy names, years, club names) that sentence embeddings blur together.
+"""
+
+import re
+import math
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from langchain.schema import Document
+
+from .vector_index import CHARACTER_KEY, DOC_ID_KEY
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset({
+    "a", "about", "an", "and", "are", "as", "at", "be", "but", "by", "did", "do", "does", "for",
+    "from", "had", "has", "have", "he", "her", "his", "how", "i", "in", "is", "it", "its",
+    "me", "my", "of", "on", "or", "she", "so", "tell", "that", "the", "their", "them", "they",
+    "this", "to", "was", "we", "were", "what", "when", "where", "which", "who", "why",
+    "will", "with", "you", "your",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into accent-folded, lower-case terms without stop words."""
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    return [token for token in _TOKEN_PATTERN.findall(folded) if token not in STOP_WORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index keyed by document id.
+
+    Postings map each term to the documents containing it and the term
+    frequency, so a query only touches the documents sharing a term with it.
+    Adding a document with an existing id replaces it.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._lengths: Dict[str, int] = {}
+        self._documents: Dict[str, Document] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add_documents(self, documents: List[Document]) -> None:
+        """Index documents, replacing any already stored under the same id."""
+        with self._lock:
+            for document in documents:
+                doc_id = document.metadata.get(DOC_ID_KEY)
+                if not doc_id:
+                    raise ValueError(f"Document is missing '{DOC_ID_KEY}' metadata")
+                self._remove(doc_id)
+
+                terms = Counter(tokenize(document.page_content))
+                for term, frequency in terms.items():
+                    self._postings[term][doc_id] = frequency
+                length = sum(terms.values())
+                self._lengths[doc_id] = length
+                self._total_length += length
+                self._documents[doc_id] = document
+
+    def remove(self, doc_ids: List[str]) -> None:
+        """Drop documents from the index."""
+        with self._lock:
+            for doc_id in doc_ids:
+                self._remove(doc_id)
+
+    def _remove(self, doc_id: str) -> None:
+        document = self._documents.pop(doc_id, None)
+        if document is None:
+            return
+        for term in set(tokenize(document.page_content)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        character: Optional[str] = None
+    ) -> List[Tuple[Document, float, int]]:
+        """
+        Score documents sharing at least one term with the query.
+
+        Args:
+            query: Free-text query
+            k: Maximum number of results
+            character: Only consider documents whose ``character`` metadata matches
+
+        Returns:
+            ``(document, score, matched_terms)`` tuples, best first, where
+            ``matched_terms`` counts the distinct query terms the document contains
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            if not terms or not self._documents:
+                return []
+
+            count = len(self._documents)
+            average_length = self._total_length / count or 1.0
+            scores: Dict[str, float] = defaultdict(float)
+            matched: Dict[str, int] = defaultdict(int)
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    if character and self._documents[doc_id].metadata.get(CHARACTER_KEY) != character:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+                    matched[doc_id] += 1
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            return [(self._documents[doc_id], score, matched[doc_id]) for doc_id, score in ranked]
@@ -1,74 +1,191 @@
 """Retriever components for RAG functionality."""
 
 import os
-from langchain_community.vectorstores import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import TextLoader
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
 from langchain.schema import Document
 
+from ...domain.character_factory import FootballLegendFactory
+from .embeddings import EMBEDDING_MODEL_ID, get_embeddings
+from .flat_index import FlatVectorIndex, FlatVectorRetriever
+from .knowledge import BUILTIN_SOURCE, get_builtin_documents
+from .lexical import BM25Index, tokenize
+from .vector_index import PersistentVectorIndex, CHARACTER_KEY, DOC_ID_KEY
+
+logger = logging.getLogger(__name__)
+
+# Retrieval modes for get_retriever
+RETRIEVER_MODE_VECTOR = "vector"
+RETRIEVER_MODE_HYBRID = "hybrid"
+
+# Vector search backends for get_retriever
+RETRIEVER_BACKEND_CHROMA = "chroma"
+RETRIEVER_BACKEND_FLAT = "flat"
+
+# Semantic candidates fetched for rank fusion in hybrid mode
+HYBRID_FETCH_K = 20
+
+
+class CharacterScopedRetriever(BaseRetriever):
+    """
+    Vector store retriever that searches a single character's slice of the index.
+
+    Pass ``character_id`` at invoke time (``retriever.ainvoke(query, character_id="messi")``)
+    to filter on the document ``character`` metadata; without it the whole
+    corpus is searched, which is what the retriever tool does.
+    """
+
+    vectorstore: VectorStore
+    k: int = 5
+
+    def _character(self, character_id: Optional[str]) -> Optional[str]:
+        return FootballLegendFactory.normalize_id(character_id) if character_id else None
+
+    def _filter(self, character_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        character = self._character(character_id)
+        return {CHARACTER_KEY: character} if character else None
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+        character_id: Optional[str] = None
+    ) -> List[Document]:
+        return self.vectorstore.similarity_search(query, k=self.k, filter=self._filter(character_id))
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: AsyncCallbackManagerForRetrieverRun,
+        character_id: Optional[str] = None
+    ) -> List[Document]:
+        return await self.vectorstore.asimilarity_search(query, k=self.k, filter=self._filter(character_id))
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Combines a semantic retriever with a BM25 lexical index.
+
+    Both result lists are merged with reciprocal rank fusion. Short queries
+    whose terms all appear in a document (e.g. "Ballon d'Or 2009") are
+    answered from the lexical index alone, skipping the embedding call and
+    returning only the documents that contain every term. The semantic
+    retriever's own ``k`` sets how many candidates go into the fusion.
+    """
+
+    semantic: BaseRetriever
+    lexical: BM25Index
+    k: int = 5
+    rrf_k: int = 60
+    lexical_only_max_terms: int = 4
+
+    def _lexical_hits(self, query: str, character_id: Optional[str]) -> List[tuple]:
+        character = FootballLegendFactory.normalize_id(character_id) if character_id else None
+        return self.lexical.search(query, k=max(self.k, getattr(self.semantic, "k", self.k)), character=character)
+
+    def _exact_matches(self, query: str, hits: List[tuple]) -> List[Document]:
+        """Documents containing every query term, if the query is short enough to trust them."""
+        terms = set(tokenize(query))
+        if not terms or len(terms) > self.lexical_only_max_terms:
+            return []
+        return [document for document, _, matched in hits if matched == len(terms)][:self.k]
+
+    def _fuse(self, *ranked_lists: List[Document]) -> List[Document]:
+        scores: Dict[str, float] = defaultdict(float)
+        documents: Dict[str, Document] = {}
+        for ranked in ranked_lists:
+            for rank, document in enumerate(ranked):
+                key = document.metadata.get(DOC_ID_KEY) or document.page_content
+                documents.setdefault(key, document)
+                scores[key] += 1.0 / (self.rrf_k + rank + 1)
+        return [documents[key] for key in sorted(scores, key=scores.get, reverse=True)[:self.k]]
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+        character_id: Optional[str] = None
+    ) -> List[Document]:
+        hits = self._lexical_hits(query, character_id)
+        exact = self._exact_matches(query, hits)
+        if exact:
+            return exact
+
+        semantic = self.semantic.invoke(query, {"callbacks": run_manager.get_child()}, character_id=character_id)
+        return self._fuse(semantic, [document for document, _, _ in hits])
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: AsyncCallbackManagerForRetrieverRun,
+        character_id: Optional[str] = None
+    ) -> List[Document]:
+        hits = self._lexical_hits(query, character_id)
+        exact = self._exact_matches(query, hits)
+        if exact:
+            return exact
+
+        semantic = await self.semantic.ainvoke(query, {"callbacks": run_manager.get_child()}, character_id=character_id)
+        return self._fuse(semantic, [document for document, _, _ in hits])
+
 
 def get_retriever(
-    embedding_model_id: str = "sentence-transformers/all-MiniLM-L6-v2",
+    embedding_model_id: str = EMBEDDING_MODEL_ID,
     k: int = 5,
-    device: str = "cpu"
+    device: str = "cpu",
+    persist_directory: Optional[str] = None,
+    mode: Optional[str] = None,
+    backend: Optional[str] = None,
+    vector_dtype: Optional[str] = None
 ):
-    """Create and return a retriever for football legend context."""
-    
-    # Initialize embeddings
-    embeddings = HuggingFaceEmbeddings(
-        model_name=embedding_model_id,
-        model_kwargs={'device': device}
-    )
-    
-    # Create some sample football legend knowledge
-    # In a real implementation, this would load from a knowledge base
-    football_knowledge = [
-        Document(
-            page_content="Diego Maradona was an Argentine professional footballer widely regarded as one of the greatest players in the history of the sport. He played as an attacking midfielder and forward, known for his incredible dribbling, vision, and ability to score spectacular goals.",
-            metadata={"character": "maradona", "topic": "biography"}
-        ),
-        Document(
-            page_content="Lionel Messi is an Argentine professional footballer who plays as a forward. He has won numerous Ballon d'Or awards and is considered one of the greatest players of all time, known for his speed, finishing, and playmaking abilities.",
-            metadata={"character": "leomessi", "topic": "biography"}
-        ),
-        Document(
-            page_content="Cristiano Ronaldo is a Portuguese professional footballer who plays as a forward. He is known for his incredible athleticism, goal-scoring ability, and has won multiple Champions League titles and Ballon d'Or awards.",
-            metadata={"character": "cristianoronaldo", "topic": "biography"}
-        ),
-        Document(
-            page_content="Kaká is a Brazilian former professional footballer who played as an attacking midfielder. He was known for his pace, technique, and ability to score from midfield. He won the Ballon d'Or in 2007.",
-            metadata={"character": "kaka", "topic": "biography"}
-        ),
-        Document(
-            page_content="Pep Guardiola is a Spanish professional football manager and former player. As a manager, he is known for his tactical innovation, particularly his implementation of tiki-taka playing style.",
-            metadata={"character": "pepguardiola", "topic": "coaching"}
-        ),
-        Document(
-            page_content="Sir Alex Ferguson is a Scottish former football manager who managed Manchester United for 26 years. He is considered one of the greatest managers in football history, known for his man-management skills and tactical acumen.",
-            metadata={"character": "alexferguson", "topic": "coaching"}
-        ),
-        Document(
-            page_content="Jürgen Klopp is a German professional football manager known for his energetic coaching style and his ability to develop young players. He has managed Liverpool and Borussia Dortmund with great success.",
-            metadata={"character": "jurgenklopp", "topic": "coaching"}
-        ),
-        Document(
-            page_content="Carlo Ancelotti is an Italian professional football manager known for his calm demeanor and tactical flexibility. He has won the Champions League multiple times as both a player and manager.",
-            metadata={"character": "ancelotti", "topic": "coaching"}
-        )
-    ]
-    
-    # Create vector store
-    vectorstore = Chroma.from_documents(
-        documents=football_knowledge,
-        embedding=embeddings,
-        persist_directory="./chroma_db"
-    )
-    
-    # Create and return retriever
-    retriever = vectorstore.as_retriever(
-        search_type="similarity",
-        search_kwargs={"k": k}
+    """
+    Create and return a retriever for football legend context.
+
+    ``mode`` is ``"vector"`` (default) or ``"hybrid"`` and ``backend`` is
+    ``"chroma"`` (default) or ``"flat"``; they fall back to the
+    ``RETRIEVER_MODE`` and ``RETRIEVER_BACKEND`` environment variables.
+    The flat backend can store vectors as ``float16`` or ``int8`` via
+    ``vector_dtype`` (or ``FLAT_INDEX_DTYPE``).
+    """
+    mode = (mode or os.getenv("RETRIEVER_MODE", RETRIEVER_MODE_VECTOR)).lower()
+    if mode not in (RETRIEVER_MODE_VECTOR, RETRIEVER_MODE_HYBRID):
+        raise ValueError(f"Unknown retriever mode: {mode}")
+    backend = (backend or os.getenv("RETRIEVER_BACKEND", RETRIEVER_BACKEND_CHROMA)).lower()
+    if backend not in (RETRIEVER_BACKEND_CHROMA, RETRIEVER_BACKEND_FLAT):
+        raise ValueError(f"Unknown retriever backend: {backend}")
+
+    # Shared embeddings that memoise query vectors for repeated messages
+    embeddings = get_embeddings(embedding_model_id, device)
+
+    # Open the persisted index and embed only new or changed built-in documents
+    index = PersistentVectorIndex(
+        embeddings=embeddings,
+        embedding_model_id=embedding_model_id,
+        persist_directory=persist_directory
     )
-    
-    return retriever 
\ No newline at end of file
+    index.sync(get_builtin_documents(), source=BUILTIN_SOURCE)
+
+    semantic_k = max(k, HYBRID_FETCH_K) if mode == RETRIEVER_MODE_HYBRID else k
+    if backend == RETRIEVER_BACKEND_FLAT:
+        # Chroma stays the source of truth; the flat matrix is re-exported when it changes
+        flat_index = FlatVectorIndex.from_vector_index(index, dtype=vector_dtype)
+        semantic = FlatVectorRetriever(index=flat_index, embeddings=embeddings, k=semantic_k)
+    else:
+        semantic = CharacterScopedRetriever(vectorstore=index.vectorstore, k=semantic_k)
+
+    if mode == RETRIEVER_MODE_HYBRID:
+        # Build the lexical index over everything stored, including ingested knowledge
+        lexical = BM25Index()
+        lexical.add_documents(index.load_documents())
+        logger.info(f"Hybrid retriever ready with {len(lexical)} lexically indexed documents")
+        return HybridRetriever(semantic=semantic, lexical=lexical, k=k)
+
+    return semantic
@@ -0,0 +1,261 @@
+"""
+Persistent Vector Index
+
+Opens the persisted Chroma collection and keeps it in sync with a document
+source incrementally: documents are identified by a stable ``doc_id`` and a
+content hash, so only new or changed documents are embedded and documents
+that disappeared from the source are deleted. A manifest next to the store
+records the index version and embedding model.
+
+Earlier versions rebuilt an in-memory index into LangChain's default
+``langchain`` collection on every start, leaving it full of duplicates. That
+collection is dropped once, the first time the persistent index opens.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from langchain_community.vectorstores import Chroma
+from langchain_core.embeddings import Embeddings
+from langchain.schema import Document
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored document layout changes; forces a rebuild
+INDEX_VERSION = 2
+MANIFEST_FILENAME = "index_manifest.json"
+
+DEFAULT_PERSIST_DIRECTORY = "./chroma_db"
+DEFAULT_COLLECTION_NAME = "football_knowledge"
+# Collections written by earlier versions into the same directory
+LEGACY_COLLECTION_NAMES = (Chroma._LANGCHAIN_DEFAULT_COLLECTION_NAME,)
+
+# Metadata keys managed by the index
+DOC_ID_KEY = "doc_id"
+CHARACTER_KEY = "character"
+SOURCE_KEY = "source"
+CONTENT_HASH_KEY = "content_hash"
+
+
+@dataclass
+class IndexSyncResult:
+    """Outcome of syncing one source into the index."""
+
+    source: str
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    skipped: bool = False
+
+
+def content_hash(document: Document) -> str:
+    """Hash a document's content and user metadata."""
+    metadata = {
+        key: value for key, value in document.metadata.items()
+        if key not in (CONTENT_HASH_KEY, SOURCE_KEY)
+    }
+    payload = document.page_content + "\x00" + json.dumps(metadata, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def source_fingerprint(hashes: List[str]) -> str:
+    """Fingerprint a whole source from its document hashes."""
+    return hashlib.sha256("|".join(sorted(hashes)).encode("utf-8")).hexdigest()
+
+
+def load_manifest(persist_directory: str) -> Dict[str, Any]:
+    """Load the index manifest, or an empty one if the index is new."""
+    path = os.path.join(persist_directory, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable index manifest {path}: {str(e)}")
+        return {}
+
+
+def write_manifest(persist_directory: str, manifest: Dict[str, Any]) -> None:
+    """Atomically write the index manifest."""
+    os.makedirs(persist_directory, exist_ok=True)
+    path = os.path.join(persist_directory, MANIFEST_FILENAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+class PersistentVectorIndex:
+    """
+    Chroma collection opened from disk and synced per source.
+
+    A collection built with a different index version or embedding model is
+    dropped and rebuilt, since its vectors are not comparable. ``embeddings``
+    may be None for writers that supply precomputed vectors.
+    """
+
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings],
+        embedding_model_id: str,
+        persist_directory: Optional[str] = None,
+        collection_name: Optional[str] = None,
+    ):
+        self.embeddings = embeddings
+        self.embedding_model_id = embedding_model_id
+        self.persist_directory = persist_directory or os.getenv("CHROMA_PERSIST_DIRECTORY", DEFAULT_PERSIST_DIRECTORY)
+        self.collection_name = collection_name or os.getenv("COLLECTION_NAME", DEFAULT_COLLECTION_NAME)
+        self.manifest = load_manifest(self.persist_directory)
+        self.vectorstore = self._open()
+
+    def _open(self) -> Chroma:
+        vectorstore = Chroma(
+            collection_name=self.collection_name,
+            embedding_function=self.embeddings,
+            persist_directory=self.persist_directory,
+        )
+
+        compatible = (
+            self.manifest.get("index_version") == INDEX_VERSION
+            and self.manifest.get("embedding_model") == self.embedding_model_id
+            and self.manifest.get("collection_name") == self.collection_name
+        )
+        if self.manifest and not compatible:
+            logger.info(
+                f"Rebuilding vector index {self.collection_name}: manifest version "
+                f"{self.manifest.get('index_version')} / model {self.manifest.get('embedding_model')}"
+            )
+            vectorstore.delete_collection()
+            vectorstore = Chroma(
+                collection_name=self.collection_name,
+                embedding_function=self.embeddings,
+                persist_directory=self.persist_directory,
+            )
+            self.manifest = {}
+
+        if not self.manifest:
+            self.manifest = {
+                "index_version": INDEX_VERSION,
+                "embedding_model": self.embedding_model_id,
+                "collection_name": self.collection_name,
+                "created_at": datetime.utcnow().isoformat(),
+                "sources": {},
+            }
+            self.save_manifest()
+
+        if not self.manifest.get("legacy_collections_dropped"):
+            self._drop_legacy_collections(vectorstore)
+        return vectorstore
+
+    def _drop_legacy_collections(self, vectorstore: Chroma) -> None:
+        """Delete collections left by earlier versions, then record that in the manifest."""
+        existing = {
+            getattr(collection, "name", collection) for collection in vectorstore._client.list_collections()
+        }
+        for name in LEGACY_COLLECTION_NAMES:
+            if name != self.collection_name and name in existing:
+                vectorstore._client.delete_collection(name)
+                logger.info(f"Dropped legacy vector collection {name}")
+        self.manifest["legacy_collections_dropped"] = True
+        self.save_manifest()
+
+    def prepare_documents(self, documents: List[Document], source: str) -> Dict[str, Document]:
+        """Tag documents with source and content hash, keyed by doc_id."""
+        prepared = {}
+        for document in documents:
+            doc_id = document.metadata.get(DOC_ID_KEY)
+            if not doc_id:
+                raise ValueError(f"Document from source {source} is missing '{DOC_ID_KEY}' metadata")
+            metadata = {**document.metadata, SOURCE_KEY: source}
+            metadata[CONTENT_HASH_KEY] = content_hash(Document(page_content=document.page_content, metadata=metadata))
+            prepared[doc_id] = Document(page_content=document.page_content, metadata=metadata)
+        return prepared
+
+    def existing_hashes(self, source: str) -> Dict[str, str]:
+        """Get the stored content hash of every document from a source."""
+        stored = self.vectorstore.get(where={SOURCE_KEY: source}, include=["metadatas"])
+        return {
+            doc_id: (metadata or {}).get(CONTENT_HASH_KEY, "")
+            for doc_id, metadata in zip(stored["ids"], stored["metadatas"])
+        }
+
+    def load_documents(self, batch_size: int = 1000) -> List[Document]:
+        """Load every stored document without its vector, paging through the collection."""
+        documents = []
+        offset = 0
+        while True:
+            page = self.vectorstore.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+            for doc_id, text, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+                documents.append(Document(page_content=text or "", metadata={DOC_ID_KEY: doc_id, **(metadata or {})}))
+            if len(page["ids"]) < batch_size:
+                return documents
+            offset += batch_size
+
+    def sync(self, documents: List[Document], source: str, delete_missing: bool = True) -> IndexSyncResult:
+        """
+        Bring the index in line with the given documents for one source.
+
+        Args:
+            documents: The complete current document set for the source
+            source: Source name the documents belong to
+            delete_missing: Whether to delete stored documents absent from ``documents``
+
+        Returns:
+            Counts of added, updated, deleted and unchanged documents
+        """
+        prepared = self.prepare_documents(documents, source)
+        fingerprint = source_fingerprint([doc.metadata[CONTENT_HASH_KEY] for doc in prepared.values()])
+
+        source_state = self.manifest.get("sources", {}).get(source, {})
+        if delete_missing and source_state.get("fingerprint") == fingerprint:
+            return IndexSyncResult(source=source, unchanged=len(prepared), skipped=True)
+
+        existing = self.existing_hashes(source)
+        result = IndexSyncResult(source=source)
+
+        changed_ids = []
+        for doc_id, document in prepared.items():
+            stored_hash = existing.get(doc_id)
+            if stored_hash == document.metadata[CONTENT_HASH_KEY]:
+                result.unchanged += 1
+                continue
+            changed_ids.append(doc_id)
+            if stored_hash is None:
+                result.added += 1
+            else:
+                result.updated += 1
+
+        stale_ids = [doc_id for doc_id in existing if doc_id not in prepared] if delete_missing else []
+        if stale_ids:
+            self.vectorstore.delete(ids=stale_ids)
+            result.deleted = len(stale_ids)
+
+        if changed_ids:
+            # add_documents upserts, so changed documents replace their old vectors
+            self.vectorstore.add_documents([prepared[doc_id] for doc_id in changed_ids], ids=changed_ids)
+
+        if delete_missing:
+            self.record_source(source, fingerprint=fingerprint, documents=len(prepared))
+        logger.info(f"Vector index sync {asdict(result)}")
+        return result
+
+    def record_source(self, source: str, **state: Any) -> None:
+        """Record per-source state in the manifest and persist it."""
+        self.manifest.setdefault("sources", {})[source] = {
+            **self.manifest.get("sources", {}).get(source, {}),
+            **state,
+            "synced_at": datetime.utcnow().isoformat(),
+        }
+        self.save_manifest()
+
+    def save_manifest(self) -> None:
+        """Persist the manifest with a fresh update timestamp."""
+        self.manifest["updated_at"] = datetime.utcnow().isoformat()
+        write_manifest(self.persist_directory, self.manifest)
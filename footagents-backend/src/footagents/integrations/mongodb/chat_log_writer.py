@@ -0,0 +1,242 @@
+"""
+Chat Log Writer
+
+Takes chat log inserts off the request path. Logs go into a bounded queue
+and a background task writes them with ``insert_many`` once a batch is full
+or the flush interval has passed. When the queue is full the overflow
+policy decides what happens: drop the log, block the caller until there is
+room, or spill it to a local JSON Lines file that is replayed on the next
+start. Spill file I/O runs in a worker thread so it never blocks the event
+loop.
+"""
+
+import os
+import shutil
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from bson import json_util
+from pymongo.errors import BulkWriteError
+
+from .models import ChatLogDocument
+from .repositories import ChatLogRepository, chat_log_repository
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+OVERFLOW_SPILL = "spill"
+OVERFLOW_POLICIES = (OVERFLOW_DROP, OVERFLOW_BLOCK, OVERFLOW_SPILL)
+
+CHAT_LOG_QUEUE_SIZE = int(os.getenv("CHAT_LOG_QUEUE_SIZE", 10000))
+CHAT_LOG_BATCH_SIZE = int(os.getenv("CHAT_LOG_BATCH_SIZE", 200))
+CHAT_LOG_FLUSH_INTERVAL = float(os.getenv("CHAT_LOG_FLUSH_INTERVAL", 1.0))
+CHAT_LOG_OVERFLOW_POLICY = os.getenv("CHAT_LOG_OVERFLOW_POLICY", OVERFLOW_DROP).lower()
+CHAT_LOG_SPILL_PATH = os.getenv("CHAT_LOG_SPILL_PATH", "./chat_log_spill.jsonl")
+
+
+class ChatLogWriter:
+    """
+    Bounded, batching background writer for ChatLogDocuments.
+
+    Args:
+        repository: Repository used for the batched inserts
+        max_queue: Maximum logs waiting to be written
+        batch_size: Logs per insert_many
+        flush_interval: Maximum seconds a log waits for its batch to fill
+        overflow_policy: ``drop``, ``block`` or ``spill`` when the queue is full
+        spill_path: JSON Lines file for the ``spill`` policy and failed batches
+    """
+
+    def __init__(
+        self,
+        repository: ChatLogRepository,
+        max_queue: int = CHAT_LOG_QUEUE_SIZE,
+        batch_size: int = CHAT_LOG_BATCH_SIZE,
+        flush_interval: float = CHAT_LOG_FLUSH_INTERVAL,
+        overflow_policy: str = CHAT_LOG_OVERFLOW_POLICY,
+        spill_path: str = CHAT_LOG_SPILL_PATH
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown chat log overflow policy: {overflow_policy}")
+
+        self.repository = repository
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.spill_path = spill_path
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Serializes appends from concurrent spill threads
+        self._spill_lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.failed = 0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # Created lazily so it binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        return self._queue
+
+    async def submit(self, chat_log: ChatLogDocument) -> None:
+        """Queue a chat log for writing, applying the overflow policy if the queue is full."""
+        try:
+            self.queue.put_nowait(chat_log)
+        except asyncio.QueueFull:
+            if self.overflow_policy == OVERFLOW_BLOCK:
+                await self.queue.put(chat_log)
+            elif self.overflow_policy == OVERFLOW_SPILL:
+                await self._spill([chat_log])
+                return
+            else:
+                self.dropped += 1
+                return
+        self.enqueued += 1
+
+    def _append_spill(self, chat_logs: List[ChatLogDocument]) -> None:
+        # created_at is kept so replayed logs retain their original time
+        lines = "".join(
+            json_util.dumps(chat_log.dict(by_alias=True, exclude={"id"})) + "\n" for chat_log in chat_logs
+        )
+        with self._spill_lock:
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    async def _spill(self, chat_logs: List[ChatLogDocument]) -> None:
+        """Append chat logs to the spill file from a worker thread."""
+        await asyncio.to_thread(self._append_spill, chat_logs)
+        self.spilled += len(chat_logs)
+
+    async def _write(self, batch: List[ChatLogDocument]) -> None:
+        try:
+            await self.repository.create_many(batch)
+            failed: List[ChatLogDocument] = []
+        except BulkWriteError as e:
+            # Unordered insert: only the documents named in writeErrors were not written
+            failed_indexes = {error["index"] for error in e.details.get("writeErrors", [])}
+            failed = [chat_log for i, chat_log in enumerate(batch) if i in failed_indexes]
+            logger.error(
+                f"Error writing {len(failed)} of {len(batch)} chat logs "
+                f"({e.details.get('nInserted', len(batch) - len(failed))} inserted): {str(e)}"
+            )
+        except Exception as e:
+            failed = batch
+            logger.error(f"Error writing {len(batch)} chat logs: {str(e)}")
+
+        if failed:
+            if self.overflow_policy == OVERFLOW_SPILL:
+                await self._spill(failed)
+            else:
+                self.failed += len(failed)
+        if len(failed) < len(batch):
+            self.written += len(batch) - len(failed)
+            self.batches += 1
+
+    async def _next_batch(self) -> List[ChatLogDocument]:
+        """Wait for one log, then collect more until the batch is full or the interval passes."""
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _take_spill(self) -> Optional[List[ChatLogDocument]]:
+        """Move the spill file aside and read it, so new spills start a fresh file."""
+        replay_path = f"{self.spill_path}.replaying"
+        with self._spill_lock:
+            interrupted = os.path.exists(replay_path)
+            if os.path.exists(self.spill_path):
+                if interrupted:
+                    # A previous replay died before removing its file: add to it instead of overwriting
+                    with open(self.spill_path, "rb") as src, open(replay_path, "ab") as dst:
+                        shutil.copyfileobj(src, dst)
+                    os.remove(self.spill_path)
+                else:
+                    os.replace(self.spill_path, replay_path)
+            elif not interrupted:
+                return None
+        with open(replay_path, "r", encoding="utf-8") as f:
+            return [ChatLogDocument.from_dict(json_util.loads(line)) for line in f if line.strip()]
+
+    async def replay_spill(self) -> int:
+        """Write logs spilled by a previous run (or left by an interrupted replay), then remove the spill file."""
+        documents = await asyncio.to_thread(self._take_spill)
+        if documents is None:
+            return 0
+
+        for start in range(0, len(documents), self.batch_size):
+            await self._write(documents[start:start + self.batch_size])
+        await asyncio.to_thread(os.remove, f"{self.spill_path}.replaying")
+        logger.info(f"Replayed {len(documents)} spilled chat logs")
+        return len(documents)
+
+    async def start(self) -> None:
+        """Replay spilled logs and start the background writer."""
+        if self.overflow_policy == OVERFLOW_SPILL:
+            try:
+                await self.replay_spill()
+            except Exception as e:
+                logger.error(f"Error replaying spilled chat logs: {str(e)}")
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Write everything still queued, then stop the background writer."""
+        if self._task is not None and not self._task.done():
+            await self.queue.join()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+        # Anything queued without a running writer is written directly
+        remaining = []
+        while self._queue is not None and not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+            self._queue.task_done()
+        for start in range(0, len(remaining), self.batch_size):
+            await self._write(remaining[start:start + self.batch_size])
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth and write statistics."""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "overflow_policy": self.overflow_policy,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "failed": self.failed,
+        }
+
+
+# Global instance for easy access
+chat_log_writer = ChatLogWriter(chat_log_repository)
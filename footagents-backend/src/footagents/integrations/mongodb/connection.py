@@ -12,6 +12,8 @@ from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from dotenv import load_dotenv
 import logging
 
+from .indexes import MONGODB_ENSURE_INDEXES, index_registry, slow_query_listener
+
 # Load environment variables
 load_dotenv()
 
@@ -60,7 +62,7 @@ class MongoDBConnectionManager:
                     raise ValueError("MONGODB_CONNECTION_STRING environment variable is required")
                 
                 # Create MongoDB client
-                self._client = AsyncIOMotorClient(connection_string)
+                self._client = AsyncIOMotorClient(connection_string, event_listeners=[slow_query_listener])
                 
                 # Test connection
                 await self._client.admin.command('ping')
@@ -87,6 +89,13 @@ class MongoDBConnectionManager:
                 logger.error(f"❌ Failed to connect to MongoDB: {str(e)}")
                 await self.disconnect()
                 raise ConnectionError(f"Failed to connect to MongoDB: {str(e)}")
+            
+            # Create declared indexes; failures are logged, not fatal
+            if MONGODB_ENSURE_INDEXES:
+                try:
+                    await index_registry.apply(self._database)
+                except Exception as e:
+                    logger.error(f"❌ Failed to ensure MongoDB indexes: {str(e)}")
     
     async def disconnect(self) -> None:
         """Close MongoDB connection and cleanup resources."""
@@ -0,0 +1,124 @@
+"""
+Write-Behind Counters
+
+Accumulates per-character conversation counts in memory and flushes them
+to MongoDB periodically as one bulk ``$inc`` write, instead of rewriting a
+character document on every chat turn.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FLUSH_INTERVAL = float(os.getenv("COUNTER_FLUSH_INTERVAL", 5))
+
+
+class CounterAggregator:
+    """
+    In-process aggregator for increments keyed by id.
+
+    Args:
+        apply: Coroutine writing a batch of ``{key: increment}`` to the database
+        flush_interval: Seconds between background flushes
+        name: Name used in logs and stats
+    """
+
+    def __init__(
+        self,
+        apply: Callable[[Dict[str, int]], Awaitable[Any]],
+        flush_interval: float = COUNTER_FLUSH_INTERVAL,
+        name: str = "counters"
+    ):
+        self._apply = apply
+        self.flush_interval = flush_interval
+        self.name = name
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.flush_errors = 0
+        self.flushed_increments = 0
+
+    def increment(self, key: str, amount: int = 1) -> None:
+        """Record an increment; it reaches the database on the next flush."""
+        with self._lock:
+            self._pending[key] += amount
+
+    def pending_counts(self) -> Dict[str, int]:
+        """Get the increments not yet written."""
+        with self._lock:
+            return dict(self._pending)
+
+    async def flush(self) -> int:
+        """
+        Write all pending increments in one batch.
+
+        Failed batches are merged back into the pending counts and retried
+        on the next flush.
+
+        Returns:
+            Number of keys written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, Counter()
+            if not batch:
+                return 0
+
+            try:
+                await self._apply(dict(batch))
+            except Exception as e:
+                with self._lock:
+                    self._pending.update(batch)
+                self.flush_errors += 1
+                logger.error(f"Error flushing {self.name}: {str(e)}")
+                return 0
+
+            self.flushes += 1
+            self.flushed_increments += sum(batch.values())
+            return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start periodic background flushing."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background flushing and write whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pending and flush statistics."""
+        with self._lock:
+            pending_keys = len(self._pending)
+            pending_increments = sum(self._pending.values())
+        return {
+            "name": self.name,
+            "pending_keys": pending_keys,
+            "pending_increments": pending_increments,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "flushed_increments": self.flushed_increments,
+            "flush_interval_seconds": self.flush_interval,
+        }
@@ -0,0 +1,234 @@
+"""
+MongoDB Index Management
+
+Repositories declare the indexes their queries rely on as ``IndexSpec``s.
+The specs are collected in a registry keyed by collection and applied
+idempotently when the connection manager connects, so every deployment
+ends up with the same indexes without a manual migration. A command
+listener logs queries slower than a threshold.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel, monitoring
+
+logger = logging.getLogger(__name__)
+
+MONGODB_ENSURE_INDEXES = os.getenv("MONGODB_ENSURE_INDEXES", "true").lower() in ("1", "true", "yes")
+MONGODB_SLOW_QUERY_MS = float(os.getenv("MONGODB_SLOW_QUERY_MS", 100))
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """
+    Declaration of one index on a repository's collection.
+
+    Args:
+        keys: ``(field, direction)`` pairs, in index order
+        name: Index name, used to detect whether it already exists
+        unique: Whether the index enforces unique values
+        partial_filter: Only index documents matching this filter
+    """
+
+    keys: Tuple[Tuple[str, int], ...]
+    name: str
+    unique: bool = False
+    partial_filter: Optional[Dict[str, Any]] = None
+
+    def to_model(self) -> IndexModel:
+        options: Dict[str, Any] = {"name": self.name, "unique": self.unique}
+        if self.partial_filter is not None:
+            options["partialFilterExpression"] = self.partial_filter
+        return IndexModel(list(self.keys), **options)
+
+
+def index(*keys: Any, name: Optional[str] = None, unique: bool = False,
+          partial_filter: Optional[Dict[str, Any]] = None) -> IndexSpec:
+    """
+    Build an IndexSpec from field names or ``(field, direction)`` pairs.
+
+    Bare field names are ascending. The name defaults to MongoDB's own
+    ``field_direction`` convention.
+    """
+    pairs = tuple(key if isinstance(key, tuple) else (key, ASCENDING) for key in keys)
+    return IndexSpec(
+        keys=pairs,
+        name=name or "_".join(f"{field}_{direction}" for field, direction in pairs),
+        unique=unique,
+        partial_filter=partial_filter
+    )
+
+
+class IndexRegistry:
+    """Index declarations for every collection, applied at connect time."""
+
+    def __init__(self):
+        self._specs: Dict[str, Dict[str, IndexSpec]] = {}
+        self.created: Dict[str, List[str]] = {}
+        self.errors: Dict[str, str] = {}
+        self.missing: Dict[str, List[str]] = {}
+        self.applied_at: Optional[float] = None
+
+    def register(self, collection_name: str, specs: List[IndexSpec]) -> None:
+        """Declare indexes for a collection. Registering the same name again replaces it."""
+        collection_specs = self._specs.setdefault(collection_name, {})
+        for spec in specs:
+            collection_specs[spec.name] = spec
+
+    def specs(self, collection_name: str) -> List[IndexSpec]:
+        return list(self._specs.get(collection_name, {}).values())
+
+    async def missing_indexes(self, database: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+        """
+        Compare the declared indexes with those present in the database.
+
+        Returns:
+            Names of declared indexes that don't exist, per collection
+        """
+        missing: Dict[str, List[str]] = {}
+        for collection_name, specs in self._specs.items():
+            existing = await database[collection_name].index_information()
+            names = [name for name in specs if name not in existing]
+            if names:
+                missing[collection_name] = names
+        return missing
+
+    async def apply(self, database: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+        """
+        Create the declared indexes that don't exist yet.
+
+        Existing indexes are left alone, so this is safe to run on every
+        start. A collection whose indexes can't be built (e.g. duplicate
+        values under a unique index) is logged and reported as missing
+        rather than failing the connection.
+
+        Returns:
+            Names of declared indexes still missing afterwards, per collection
+        """
+        self.created = {}
+        self.errors = {}
+        for collection_name, specs in self._specs.items():
+            collection = database[collection_name]
+            try:
+                existing = await collection.index_information()
+                to_create = [spec.to_model() for name, spec in specs.items() if name not in existing]
+                if to_create:
+                    self.created[collection_name] = await collection.create_indexes(to_create)
+                    logger.info(f"Created indexes on {collection_name}: {', '.join(self.created[collection_name])}")
+            except Exception as e:
+                self.errors[collection_name] = str(e)
+                logger.error(f"Error creating indexes on {collection_name}: {str(e)}")
+
+        self.applied_at = time.time()
+        self.missing = await self.missing_indexes(database)
+        for collection_name, names in self.missing.items():
+            logger.warning(f"Missing indexes on {collection_name}: {', '.join(names)}")
+        return self.missing
+
+    def stats(self) -> Dict[str, Any]:
+        """Get declared indexes and the outcome of the last apply."""
+        return {
+            "declared": {name: list(specs) for name, specs in self._specs.items()},
+            "created": self.created,
+            "errors": self.errors,
+            "missing": self.missing,
+            "applied_at": self.applied_at,
+        }
+
+
+class SlowQueryListener(monitoring.CommandListener):
+    """
+    Logs database commands that take longer than a threshold.
+
+    Only the command name, collection and filter field names are logged,
+    never the filter values.
+
+    Args:
+        threshold_ms: Commands at or above this duration are reported
+        history: Number of recent slow commands kept for /metrics
+    """
+
+    # Connection and housekeeping commands that are never interesting
+    IGNORED_COMMANDS = frozenset({
+        "ping", "hello", "ismaster", "isMaster", "buildinfo", "buildInfo",
+        "saslStart", "saslContinue", "endSessions", "createIndexes", "listIndexes",
+    })
+
+    def __init__(self, threshold_ms: float = MONGODB_SLOW_QUERY_MS, history: int = 50):
+        self.threshold_ms = threshold_ms
+        self._lock = threading.Lock()
+        self._started: Dict[Tuple[Any, int], Tuple[str, List[str]]] = {}
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.commands = 0
+        self.slow_commands = 0
+
+    @staticmethod
+    def _describe(command_name: str, command: Dict[str, Any]) -> Tuple[str, List[str]]:
+        # getMore names the cursor id first and the collection separately
+        collection = command.get("collection") if command_name == "getMore" else command.get(command_name)
+        query = command.get("filter") or command.get("query") or {}
+        if command_name in ("update", "delete") and command.get(f"{command_name}s"):
+            query = command[f"{command_name}s"][0].get("q", {})
+        elif command_name == "aggregate":
+            match = next((stage["$match"] for stage in command.get("pipeline", []) if "$match" in stage), {})
+            query = match
+        return str(collection), sorted(query) if isinstance(query, dict) else []
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in self.IGNORED_COMMANDS:
+            return
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = self._describe(event.command_name, event.command)
+
+    def _finished(self, event: Any, failed: bool) -> None:
+        with self._lock:
+            described = self._started.pop((event.connection_id, event.request_id), None)
+        if described is None:
+            return
+
+        self.commands += 1
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        self.slow_commands += 1
+        collection, fields = described
+        entry = {
+            "command": event.command_name,
+            "collection": collection,
+            "filter_fields": fields,
+            "duration_ms": round(duration_ms, 1),
+            "failed": failed,
+        }
+        self.recent.append(entry)
+        logger.warning(
+            f"Slow MongoDB {event.command_name} on {collection} "
+            f"(filter fields: {', '.join(fields) or 'none'}): {duration_ms:.1f} ms"
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finished(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finished(event, failed=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get slow command counts and the most recent slow commands."""
+        return {
+            "threshold_ms": self.threshold_ms,
+            "commands": self.commands,
+            "slow_commands": self.slow_commands,
+            "recent": list(self.recent),
+        }
+
+
+# Global instances for easy access
+index_registry = IndexRegistry()
+slow_query_listener = SlowQueryListener()
@@ -0,0 +1,49 @@
+"""
+MongoDB Data Migrations
+
+Command-line entry point for one-off data migrations. Migrations are
+idempotent: documents already in the new layout are skipped.
+"""
+
+import sys
+import asyncio
+import argparse
+import logging
+from typing import List, Optional
+
+from .connection import db_manager
+from .repositories import conversation_repository
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate_message_buckets() -> int:
+    """Move embedded conversation histories into the conversation_messages buckets."""
+    await db_manager.connect()
+    try:
+        migrated = await conversation_repository.migrate_all_to_buckets()
+    finally:
+        await db_manager.disconnect()
+    logger.info(f"Migrated {migrated} conversations to message buckets")
+    return migrated
+
+
+MIGRATIONS = {
+    "message-buckets": migrate_message_buckets,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for data migrations."""
+    parser = argparse.ArgumentParser(description="Run a MongoDB data migration.")
+    parser.add_argument("migration", choices=sorted(MIGRATIONS), help="Migration to run")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    asyncio.run(MIGRATIONS[args.migration]())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
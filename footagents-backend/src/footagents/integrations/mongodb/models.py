@@ -5,7 +5,7 @@ This module defines MongoDB document schemas that extend the domain models
 with database-specific functionality like ObjectId handling and serialization.
 """
 
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, Dict, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field
 from bson import ObjectId
@@ -68,12 +68,14 @@ class ConversationDocument(MongoBaseDocument):
     
     conversation_id: str = Field(..., description="Unique conversation identifier")
     character_id: str = Field(..., description="ID of the character in conversation")
-    messages: List[Dict[str, Any]] = Field(default_factory=list, description="Conversation messages")
+    messages: List[Dict[str, Any]] = Field(default_factory=list, description="Most recent messages; full history is in message buckets")
+    message_count: int = Field(default=0, description="Total messages stored in message buckets")
     character_context: str = Field(default="", description="Character context information")
     character_name: str = Field(..., description="Name of the character")
     character_perspective: str = Field(default="", description="Character's perspective")
     character_style: str = Field(default="", description="Character's communication style")
     summary: str = Field(default="", description="Conversation summary")
+    summary_watermark: int = Field(default=0, description="Number of messages, from the start, covered by the summary")
     is_active: bool = Field(default=True, description="Whether conversation is active")
     
     @classmethod
@@ -101,20 +103,51 @@ class ConversationDocument(MongoBaseDocument):
             summary=self.summary
         )
     
-    def add_message(self, role: str, content: str, timestamp: Optional[datetime] = None) -> None:
-        """Add a message to the conversation."""
-        if timestamp is None:
-            timestamp = datetime.utcnow()
-            
-        message = {
+    @staticmethod
+    def build_message(role: str, content: str, timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+        """Build a stored message entry."""
+        return {
             "role": role,
             "content": content,
-            "timestamp": timestamp
+            "timestamp": timestamp or datetime.utcnow()
         }
-        self.messages.append(message)
+    
+    def unsummarized_messages(self) -> List[Dict[str, Any]]:
+        """
+        Recent messages not yet folded into the summary.
+        
+        Only covers the recent window; messages after the watermark that
+        have already left it are given by ``unsummarized_gap``.
+        """
+        first_seq = self.message_count - len(self.messages)
+        return self.messages[max(0, self.summary_watermark - first_seq):]
+    
+    def unsummarized_gap(self) -> Tuple[int, int]:
+        """Sequence range ``[start, end)`` after the watermark that is no longer in the recent window."""
+        first_seq = self.message_count - len(self.messages)
+        return self.summary_watermark, max(self.summary_watermark, first_seq)
+    
+    def add_message(self, role: str, content: str, timestamp: Optional[datetime] = None) -> None:
+        """Add a message to the conversation."""
+        self.messages.append(self.build_message(role, content, timestamp))
         self.updated_at = datetime.utcnow()
 
 
+class MessageBucketDocument(MongoBaseDocument):
+    """
+    MongoDB document holding a fixed-size slice of a conversation's messages.
+    
+    Bucket ``n`` holds the messages with sequence numbers from
+    ``n * bucket_size`` up to ``(n + 1) * bucket_size - 1``, so any page of
+    history maps directly to the buckets that contain it.
+    """
+    
+    conversation_id: str = Field(..., description="Associated conversation ID")
+    bucket: int = Field(..., description="Bucket number within the conversation")
+    messages: List[Dict[str, Any]] = Field(default_factory=list, description="Messages, each with its sequence number")
+    count: int = Field(default=0, description="Number of messages in the bucket")
+
+
 class CharacterDocument(MongoBaseDocument):
     """
     MongoDB document for storing football legend character data.
@@ -180,8 +213,14 @@ class ChatLogDocument(MongoBaseDocument):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
     
     @classmethod
-    def from_chat_interaction(cls, request: ChatRequest, response: ChatResponse, response_time_ms: Optional[int] = None):
-        """Create ChatLogDocument from chat request and response."""
+    def from_chat_interaction(
+        cls,
+        request: ChatRequest,
+        response: ChatResponse,
+        response_time_ms: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """Create ChatLogDocument from chat request and response, with optional extra metadata."""
         return cls(
             conversation_id=response.conversation_id,
             character_id=request.character_id,
@@ -190,6 +229,7 @@ class ChatLogDocument(MongoBaseDocument):
             response_time_ms=response_time_ms,
             metadata={
                 "request_timestamp": datetime.utcnow(),
-                "response_timestamp": response.timestamp
+                "response_timestamp": response.timestamp,
+                **(metadata or {})
             }
         ) 
\ No newline at end of file
@@ -5,17 +5,24 @@ This module implements the Repository pattern for clean data access layer.
 Provides generic base repository and specific repositories for different entities.
 """
 
+import os
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any, Type, TypeVar, Generic
+from typing import Optional, List, Dict, Any, ClassVar, Tuple, Type, TypeVar, Generic
 from datetime import datetime
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import DESCENDING, ReturnDocument, UpdateOne
 
+from ...domain.character_factory import FootballLegendFactory
+from ...infrastructure.cache import TTLCache
 from .connection import db_manager
+from .counters import CounterAggregator
+from .indexes import IndexSpec, index, index_registry
 from .models import (
     MongoBaseDocument, 
     ConversationDocument, 
+    MessageBucketDocument,
     CharacterDocument, 
     ChatLogDocument
 )
@@ -25,6 +32,31 @@ logger = logging.getLogger(__name__)
 # Generic type for documents
 T = TypeVar('T', bound=MongoBaseDocument)
 
+CONVERSATION_CACHE_ENABLED = os.getenv("CONVERSATION_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CONVERSATION_CACHE_SIZE = int(os.getenv("CONVERSATION_CACHE_SIZE", 1000))
+CONVERSATION_CACHE_IDLE_TTL = float(os.getenv("CONVERSATION_CACHE_IDLE_TTL", 900))
+CONVERSATION_CACHE_MAX_MB = float(os.getenv("CONVERSATION_CACHE_MAX_MB", 64))
+MESSAGE_BUCKET_SIZE = int(os.getenv("MESSAGE_BUCKET_SIZE", 100))
+RECENT_MESSAGE_WINDOW = int(os.getenv("RECENT_MESSAGE_WINDOW", 20))
+
+# Rough per-message and per-document bookkeeping cost (dicts, datetimes, model)
+_MESSAGE_OVERHEAD_BYTES = 400
+_CONVERSATION_OVERHEAD_BYTES = 2000
+
+
+def _recent(messages: List[Dict[str, Any]], window: int = RECENT_MESSAGE_WINDOW) -> List[Dict[str, Any]]:
+    """The last ``window`` messages, as kept on the conversation document."""
+    return messages[-window:] if window > 0 else []
+
+
+def _conversation_size(conversation_id: str, conversation: ConversationDocument) -> int:
+    """Approximate memory held by a cached conversation."""
+    return (
+        _CONVERSATION_OVERHEAD_BYTES
+        + len(conversation.summary) + len(conversation.character_context)
+        + sum(len(message.get("content", "")) + _MESSAGE_OVERHEAD_BYTES for message in conversation.messages)
+    )
+
 
 class BaseRepository(Generic[T], ABC):
     """
@@ -32,12 +64,18 @@ class BaseRepository(Generic[T], ABC):
     
     This class implements the Repository pattern with generic operations
     that can be inherited by specific entity repositories.
+    
+    Subclasses declare the indexes their queries need in ``indexes``; they
+    are created when the database connection is established.
     """
     
+    indexes: ClassVar[List[IndexSpec]] = []
+    
     def __init__(self, collection_name: str, document_class: Type[T]):
         self.collection_name = collection_name
         self.document_class = document_class
         self._collection: Optional[AsyncIOMotorCollection] = None
+        index_registry.register(collection_name, self.indexes)
     
     @property
     async def collection(self) -> AsyncIOMotorCollection:
@@ -73,6 +111,36 @@ class BaseRepository(Generic[T], ABC):
             logger.error(f"Error creating {self.document_class.__name__}: {str(e)}")
             raise
     
+    async def create_many(self, documents: List[T]) -> int:
+        """
+        Insert several documents in one unordered insert_many.
+        
+        With an unordered insert every document that can be written is
+        written; if some fail, pymongo raises ``BulkWriteError`` whose
+        ``writeErrors`` give the indexes of the failed documents.
+        
+        Args:
+            documents: The documents to create
+            
+        Returns:
+            Number of documents inserted
+        """
+        if not documents:
+            return 0
+        
+        collection = await self.collection
+        now = datetime.utcnow()
+        for document in documents:
+            # Keep a creation time the caller already set (e.g. replayed logs)
+            if "created_at" not in document.model_fields_set:
+                document.created_at = now
+            document.updated_at = now
+        
+        result = await collection.insert_many([document.to_dict() for document in documents], ordered=False)
+        for document, inserted_id in zip(documents, result.inserted_ids):
+            document.id = inserted_id
+        return len(result.inserted_ids)
+    
     async def find_by_id(self, document_id: str) -> Optional[T]:
         """
         Find a document by its ID.
@@ -232,15 +300,240 @@ class BaseRepository(Generic[T], ABC):
             return 0
 
 
+class MessageBucketRepository(BaseRepository[MessageBucketDocument]):
+    """Repository for the fixed-size buckets holding each conversation's full message history."""
+    
+    indexes = [
+        index("conversation_id", "bucket", unique=True),
+    ]
+    
+    def __init__(self, bucket_size: int = MESSAGE_BUCKET_SIZE):
+        super().__init__("conversation_messages", MessageBucketDocument)
+        self.bucket_size = bucket_size
+    
+    def _group(self, messages: List[Dict[str, Any]], first_seq: int) -> Dict[int, List[Dict[str, Any]]]:
+        """Number messages from ``first_seq`` and group them by bucket."""
+        buckets: Dict[int, List[Dict[str, Any]]] = {}
+        for offset, message in enumerate(messages):
+            seq = first_seq + offset
+            buckets.setdefault(seq // self.bucket_size, []).append({**message, "seq": seq})
+        return buckets
+    
+    async def append_messages(self, conversation_id: str, messages: List[Dict[str, Any]], first_seq: int) -> None:
+        """
+        Append messages whose sequence numbers start at ``first_seq``.
+        
+        Buckets are created on first write. Messages are kept sorted by
+        sequence number, so concurrent appends land in order.
+        
+        Args:
+            conversation_id: The conversation the messages belong to
+            messages: Messages to store, oldest first
+            first_seq: Sequence number of the first message
+        """
+        if not messages:
+            return
+        
+        collection = await self.collection
+        now = datetime.utcnow()
+        await collection.bulk_write([
+            UpdateOne(
+                {"conversation_id": conversation_id, "bucket": bucket},
+                {
+                    "$push": {"messages": {"$each": bucket_messages, "$sort": {"seq": 1}}},
+                    "$inc": {"count": len(bucket_messages)},
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {"created_at": now}
+                },
+                upsert=True
+            )
+            for bucket, bucket_messages in self._group(messages, first_seq).items()
+        ])
+    
+    async def replace_messages(self, conversation_id: str, messages: List[Dict[str, Any]]) -> None:
+        """Write a conversation's complete history, overwriting its buckets. Safe to repeat."""
+        collection = await self.collection
+        now = datetime.utcnow()
+        buckets = self._group(messages, 0)
+        await collection.delete_many({"conversation_id": conversation_id, "bucket": {"$gte": len(buckets)}})
+        if buckets:
+            await collection.bulk_write([
+                UpdateOne(
+                    {"conversation_id": conversation_id, "bucket": bucket},
+                    {
+                        "$set": {"messages": bucket_messages, "count": len(bucket_messages), "updated_at": now},
+                        "$setOnInsert": {"created_at": now}
+                    },
+                    upsert=True
+                )
+                for bucket, bucket_messages in buckets.items()
+            ])
+    
+    async def get_messages(self, conversation_id: str, start: int, end: int) -> List[Dict[str, Any]]:
+        """
+        Get the messages with sequence numbers in ``[start, end)``, oldest first.
+        
+        Only the buckets covering the range are read.
+        """
+        if end <= start:
+            return []
+        
+        collection = await self.collection
+        cursor = collection.find(
+            {
+                "conversation_id": conversation_id,
+                "bucket": {"$gte": start // self.bucket_size, "$lte": (end - 1) // self.bucket_size}
+            },
+            {"_id": 0, "messages": 1}
+        ).sort("bucket", 1)
+        return [
+            message
+            async for data in cursor
+            for message in data.get("messages", [])
+            if start <= message["seq"] < end
+        ]
+    
+    async def delete_conversation(self, conversation_id: str) -> int:
+        """Delete all message buckets of a conversation."""
+        collection = await self.collection
+        result = await collection.delete_many({"conversation_id": conversation_id})
+        return result.deleted_count
+
+
 class ConversationRepository(BaseRepository[ConversationDocument]):
     """Repository for conversation documents with specific business methods."""
     
-    def __init__(self):
+    indexes = [
+        index("conversation_id", unique=True),
+        # find_by_character_id and get_active_conversations filter on is_active
+        index("is_active", "character_id"),
+        index("character_id", ("created_at", DESCENDING)),
+    ]
+    
+    def __init__(
+        self,
+        cache_enabled: bool = CONVERSATION_CACHE_ENABLED,
+        buckets: Optional[MessageBucketRepository] = None
+    ):
         super().__init__("conversations", ConversationDocument)
+        # Full history lives in message buckets; the document keeps a recent window
+        self.buckets = buckets or MessageBucketRepository()
+        # Write-through cache of hot conversations keyed by conversation_id.
+        # Cached documents are never mutated in place: writes swap in a copy.
+        self.cache_enabled = cache_enabled
+        self.cache: TTLCache[str, ConversationDocument] = TTLCache(
+            maxsize=CONVERSATION_CACHE_SIZE,
+            ttl=CONVERSATION_CACHE_IDLE_TTL,
+            name="conversations",
+            max_bytes=int(CONVERSATION_CACHE_MAX_MB * 1024 * 1024),
+            sizeof=_conversation_size,
+            sliding=True,
+        )
+    
+    def _cache_store(self, conversation: Optional[ConversationDocument]) -> None:
+        if self.cache_enabled and conversation is not None:
+            self.cache.set(conversation.conversation_id, conversation)
+    
+    async def create(self, document: ConversationDocument) -> ConversationDocument:
+        messages = list(document.messages)
+        document.messages = _recent(messages)
+        document.message_count = len(messages)
+        document = await super().create(document)
+        await self.buckets.append_messages(document.conversation_id, messages, 0)
+        self._cache_store(document)
+        return document
+    
+    async def migrate_to_buckets(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Move a conversation stored with its full embedded history into message buckets.
+        
+        Args:
+            data: The raw conversation document
+            
+        Returns:
+            The migrated document
+        """
+        if "message_count" in data:
+            return data
+        
+        messages = data.get("messages", [])
+        await self.buckets.replace_messages(data["conversation_id"], messages)
+        collection = await self.collection
+        # Matching on the missing field keeps a concurrent migration from counting twice
+        await collection.update_one(
+            {"_id": data["_id"], "message_count": {"$exists": False}},
+            {"$set": {"messages": _recent(messages), "message_count": len(messages)}}
+        )
+        logger.info(f"Migrated {len(messages)} messages of conversation {data['conversation_id']} to buckets")
+        return {**data, "messages": _recent(messages), "message_count": len(messages)}
+    
+    async def migrate_all_to_buckets(self) -> int:
+        """
+        Migrate every conversation that still embeds its full history.
+        
+        Returns:
+            Number of conversations migrated
+        """
+        collection = await self.collection
+        migrated = 0
+        async for data in collection.find({"message_count": {"$exists": False}}):
+            await self.migrate_to_buckets(data)
+            self.cache.pop(data["conversation_id"])
+            migrated += 1
+        return migrated
     
     async def find_by_conversation_id(self, conversation_id: str) -> Optional[ConversationDocument]:
-        """Find conversation by conversation_id field."""
-        return await self.find_one({"conversation_id": conversation_id})
+        """Find conversation by conversation_id field, serving hot conversations from memory."""
+        if self.cache_enabled:
+            conversation = self.cache.get(conversation_id)
+            if conversation is not None:
+                return conversation
+        
+        try:
+            collection = await self.collection
+            data = await collection.find_one({"conversation_id": conversation_id})
+            if data is None:
+                return None
+            # Conversations from before message buckets are migrated on first read
+            conversation = self.document_class.from_dict(await self.migrate_to_buckets(data))
+            
+        except Exception as e:
+            logger.error(f"Error finding conversation {conversation_id}: {str(e)}")
+            return None
+        
+        self._cache_store(conversation)
+        return conversation
+    
+    async def get_messages(
+        self,
+        conversation_id: str,
+        before: Optional[int] = None,
+        limit: int = 50
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a page of a conversation's full history, newest page first.
+        
+        Args:
+            conversation_id: The conversation to read
+            before: Return messages with sequence numbers below this (default: the newest)
+            limit: Maximum messages to return
+            
+        Returns:
+            The messages (oldest first), the total count and the cursor for the
+            previous page, or None if the conversation doesn't exist
+        """
+        conversation = await self.find_by_conversation_id(conversation_id)
+        if conversation is None:
+            return None
+        
+        end = conversation.message_count if before is None else max(0, min(before, conversation.message_count))
+        start = max(0, end - limit)
+        messages = await self.buckets.get_messages(conversation_id, start, end)
+        return {
+            "messages": messages,
+            "message_count": conversation.message_count,
+            "next_before": start if start > 0 else None
+        }
     
     async def find_by_character_id(self, character_id: str, limit: int = 10) -> List[ConversationDocument]:
         """Find conversations for a specific character."""
@@ -249,13 +542,140 @@ class ConversationRepository(BaseRepository[ConversationDocument]):
             limit=limit
         )
     
+    async def _append_messages(
+        self,
+        conversation_id: str,
+        messages: List[Dict[str, Any]],
+        fields: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Append messages to the recent window and the message buckets.
+        
+        The conversation update reserves the messages' sequence numbers by
+        incrementing ``message_count``; the buckets are then written at those
+        positions.
+        """
+        updates = {**(fields or {}), "updated_at": messages[-1]["timestamp"]}
+        collection = await self.collection
+        update = {
+            "$push": {"messages": {"$each": messages, "$slice": -RECENT_MESSAGE_WINDOW}},
+            "$inc": {"message_count": len(messages)},
+            "$set": updates
+        }
+        # Only the previous message count comes back
+        previous = await collection.find_one_and_update(
+            {"conversation_id": conversation_id, "message_count": {"$exists": True}},
+            update,
+            projection={"_id": 0, "message_count": 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        if previous is None:
+            data = await collection.find_one({"conversation_id": conversation_id})
+            if data is None:
+                self.cache.pop(conversation_id)
+                return False
+            await self.migrate_to_buckets(data)
+            previous = await collection.find_one_and_update(
+                {"conversation_id": conversation_id},
+                update,
+                projection={"_id": 0, "message_count": 1},
+                return_document=ReturnDocument.BEFORE
+            )
+        
+        first_seq = previous["message_count"]
+        await self.buckets.append_messages(conversation_id, messages, first_seq)
+        
+        cached = self.cache.get(conversation_id) if self.cache_enabled else None
+        if cached is not None:
+            if cached.message_count == first_seq:
+                self.cache.set(conversation_id, cached.copy(update={
+                    **updates,
+                    "messages": _recent(cached.messages + messages),
+                    "message_count": first_seq + len(messages)
+                }))
+            else:
+                # Another process wrote to this conversation; reload it on the next read
+                self.cache.pop(conversation_id)
+        return True
+    
     async def add_message_to_conversation(self, conversation_id: str, role: str, content: str) -> Optional[ConversationDocument]:
         """Add a message to an existing conversation."""
-        conversation = await self.find_by_conversation_id(conversation_id)
-        if conversation:
-            conversation.add_message(role, content)
-            return await self.update(str(conversation.id), conversation.to_dict())
-        return None
+        try:
+            if not await self._append_messages(conversation_id, [ConversationDocument.build_message(role, content)]):
+                return None
+            return await self.find_by_conversation_id(conversation_id)
+            
+        except Exception as e:
+            logger.error(f"Error adding message to conversation {conversation_id}: {str(e)}")
+            return None
+    
+    async def append_turn(
+        self,
+        conversation_id: str,
+        user_message: str,
+        assistant_message: str,
+        fields: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Atomically append a user/assistant message pair in a single update.
+        
+        Concurrent turns each push their own pair, so neither overwrites the
+        other's messages.
+        
+        Args:
+            conversation_id: The conversation to append to
+            user_message: The player's message
+            assistant_message: The character's reply
+            fields: Extra fields to set in the same update (e.g. summary)
+            
+        Returns:
+            True if the conversation exists and was updated
+        """
+        now = datetime.utcnow()
+        return await self._append_messages(conversation_id, [
+            ConversationDocument.build_message("user", user_message, now),
+            ConversationDocument.build_message("assistant", assistant_message, now)
+        ], fields)
+    
+    async def save_summary(self, conversation_id: str, summary: str, watermark: int, previous_watermark: int) -> bool:
+        """
+        Store a rolling summary and the number of messages it covers.
+        
+        The write only applies if the stored watermark is still
+        ``previous_watermark``, so an older summary never replaces a newer one.
+        
+        Returns:
+            True if the summary was stored
+        """
+        collection = await self.collection
+        result = await collection.update_one(
+            {
+                "conversation_id": conversation_id,
+                # Conversations created before watermarks have none stored
+                "summary_watermark": previous_watermark if previous_watermark else {"$in": [0, None]}
+            },
+            {"$set": {"summary": summary, "summary_watermark": watermark}}
+        )
+        
+        cached = self.cache.get(conversation_id) if self.cache_enabled else None
+        if cached is not None:
+            if result.modified_count and cached.summary_watermark == previous_watermark:
+                self.cache.set(conversation_id, cached.copy(update={"summary": summary, "summary_watermark": watermark}))
+            else:
+                self.cache.pop(conversation_id)
+        return result.modified_count > 0
+    
+    async def update(self, document_id: str, update_data: Dict[str, Any]) -> Optional[ConversationDocument]:
+        conversation = await super().update(document_id, update_data)
+        self._cache_store(conversation)
+        return conversation
+    
+    async def delete(self, document_id: str) -> bool:
+        conversation = await self.find_by_id(document_id)
+        if conversation is not None:
+            self.cache.pop(conversation.conversation_id)
+            await self.buckets.delete_conversation(conversation.conversation_id)
+        return await super().delete(document_id)
     
     async def get_active_conversations(self, limit: int = 50) -> List[ConversationDocument]:
         """Get all active conversations."""
@@ -265,8 +685,30 @@ class ConversationRepository(BaseRepository[ConversationDocument]):
 class CharacterRepository(BaseRepository[CharacterDocument]):
     """Repository for character documents with specific business methods."""
     
+    indexes = [
+        index("character_id", unique=True),
+        # get_popular_characters: active characters by conversation count
+        index("is_active", ("conversation_count", DESCENDING)),
+    ]
+    
     def __init__(self):
         super().__init__("characters", CharacterDocument)
+        # Conversation counts are aggregated in memory and flushed with bulk $inc
+        self.conversation_counter = CounterAggregator(
+            self.apply_conversation_counts, name="conversation_counts"
+        )
+    
+    @staticmethod
+    def _canonical_id(character: CharacterDocument) -> CharacterDocument:
+        """Store characters under the canonical id that lookups normalize to."""
+        character_id = FootballLegendFactory.normalize_id(character.character_id)
+        if not character_id:
+            raise ValueError(f"Invalid character id: {character.character_id!r}")
+        character.character_id = character_id
+        return character
+    
+    async def create(self, document: CharacterDocument) -> CharacterDocument:
+        return await super().create(self._canonical_id(document))
     
     async def find_by_character_id(self, character_id: str) -> Optional[CharacterDocument]:
         """Find character by character_id field."""
@@ -276,34 +718,124 @@ class CharacterRepository(BaseRepository[CharacterDocument]):
         """Get all active characters."""
         return await self.find_many({"is_active": True})
     
-    async def increment_conversation_count(self, character_id: str) -> Optional[CharacterDocument]:
-        """Increment conversation count for a character."""
-        character = await self.find_by_character_id(character_id)
-        if character:
-            character.increment_conversation_count()
-            return await self.update(str(character.id), character.to_dict())
-        return None
+    async def increment_conversation_count(self, character_id: str) -> None:
+        """Count a conversation turn for a character; written on the next counter flush."""
+        self.conversation_counter.increment(character_id)
+    
+    async def apply_conversation_counts(self, counts: Dict[str, int]) -> None:
+        """
+        Apply aggregated conversation count increments in one bulk write.
+        
+        ``updated_at`` is left alone: it marks profile changes, which the
+        character registry polls for.
+        
+        Args:
+            counts: Increment per character_id
+        """
+        collection = await self.collection
+        await collection.bulk_write([
+            UpdateOne(
+                {"character_id": character_id},
+                {"$inc": {"conversation_count": count}}
+            )
+            for character_id, count in counts.items()
+        ], ordered=False)
     
     async def get_popular_characters(self, limit: int = 10) -> List[CharacterDocument]:
-        """Get characters ordered by conversation count."""
+        """Get characters ordered by conversation count, including increments not yet flushed."""
         try:
             collection = await self.collection
-            cursor = collection.find({"is_active": True}).sort("conversation_count", -1).limit(limit)
+            pending = self.conversation_counter.pending_counts()
+            
+            # Anything in the true top N is either in the stored top N or has pending increments
+            query = {"is_active": True}
+            if pending:
+                query = {"is_active": True, "$or": [
+                    {"_id": {"$in": [
+                        data["_id"] async for data in
+                        collection.find({"is_active": True}, {"_id": 1}).sort("conversation_count", -1).limit(limit)
+                    ]}},
+                    {"character_id": {"$in": list(pending)}}
+                ]}
+            cursor = collection.find(query).sort("conversation_count", -1).limit(limit + len(pending))
             
             characters = []
             async for data in cursor:
-                characters.append(self.document_class.from_dict(data))
-                
-            return characters
+                character = self.document_class.from_dict(data)
+                character.conversation_count += pending.get(character.character_id, 0)
+                characters.append(character)
+            
+            characters.sort(key=lambda character: character.conversation_count, reverse=True)
+            return characters[:limit]
             
         except Exception as e:
             logger.error(f"Error getting popular characters: {str(e)}")
             return []
+    
+    async def seed_characters(self, characters: List[CharacterDocument]) -> int:
+        """
+        Insert characters that don't exist yet, leaving stored ones untouched.
+        
+        Args:
+            characters: Default character documents keyed by character_id
+            
+        Returns:
+            Number of characters inserted
+        """
+        if not characters:
+            return 0
+        
+        collection = await self.collection
+        operations = []
+        for character in map(self._canonical_id, characters):
+            # Include defaults (is_active, conversation_count); to_dict() drops unset fields
+            data = character.dict(by_alias=True, exclude={"id"})
+            operations.append(UpdateOne(
+                {"character_id": character.character_id},
+                {"$setOnInsert": data},
+                upsert=True
+            ))
+        
+        result = await collection.bulk_write(operations, ordered=False)
+        if result.upserted_count:
+            logger.info(f"Seeded {result.upserted_count} characters")
+        return result.upserted_count
+    
+    async def get_roster_marker(self) -> Tuple[int, Optional[datetime]]:
+        """
+        Get the number of characters and their latest ``updated_at``.
+        
+        A cheap check for roster changes: inserts and deletes change the
+        count, and edits through the repository bump ``updated_at``.
+        """
+        collection = await self.collection
+        result = await collection.aggregate([
+            {"$group": {"_id": None, "count": {"$sum": 1}, "updated_at": {"$max": "$updated_at"}}}
+        ]).to_list(length=1)
+        if not result:
+            return 0, None
+        return result[0]["count"], result[0]["updated_at"]
+    
+    async def get_character_profiles(self) -> List[Dict[str, Any]]:
+        """Get the profile fields of all active characters, without counters or timestamps."""
+        collection = await self.collection
+        cursor = collection.find(
+            {"is_active": True},
+            {"_id": 0, "character_id": 1, "name": 1, "position": 1, "era": 1,
+             "perspective": 1, "style": 1, "career_highlights": 1}
+        ).sort("character_id", 1)
+        return await cursor.to_list(length=None)
 
 
 class ChatLogRepository(BaseRepository[ChatLogDocument]):
     """Repository for chat log documents with analytics methods."""
     
+    indexes = [
+        index("conversation_id", "created_at"),
+        index(("created_at", DESCENDING)),
+        index("character_id", ("created_at", DESCENDING)),
+    ]
+    
     def __init__(self):
         super().__init__("chat_logs", ChatLogDocument)
     
@@ -353,5 +885,6 @@ class ChatLogRepository(BaseRepository[ChatLogDocument]):
 
 # Repository instances for easy access
 conversation_repository = ConversationRepository()
+message_bucket_repository = conversation_repository.buckets
 character_repository = CharacterRepository()
 chat_log_repository = ChatLogRepository() 
\ No newline at end of file
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+@pytest.fixture
+def mongo_db():
+    """In-memory MongoDB database; repositories under test are pointed at its collections."""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    return mongomock_motor.AsyncMongoMockClient()["footagents_test"]
+
+
+def use_database(repository, database):
+    """Point a repository at a test database instead of the shared connection."""
+    repository._collection = database[repository.collection_name]
+    return repository
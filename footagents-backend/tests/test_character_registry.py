@@ -0,0 +1,73 @@
+import asyncio
+
+from footagents.application.character_service.registry import CharacterRegistry
+from footagents.integrations.mongodb.models import CharacterDocument
+from footagents.integrations.mongodb.repositories import character_repository
+
+
+def _character(character_id: str, name: str) -> dict:
+    return CharacterDocument(
+        character_id=character_id,
+        name=name,
+        position="Forward",
+        era="2000s-2020s",
+        perspective="A player who lives for the game",
+        style="Humble and direct",
+        career_highlights="Many titles",
+    ).dict(by_alias=True, exclude={"id"})
+
+
+def test_refresh_reloads_only_when_the_roster_changes(mongo_db, monkeypatch):
+    monkeypatch.setattr(character_repository, "_collection", mongo_db[character_repository.collection_name])
+    registry = CharacterRegistry(refresh_interval=0)
+
+    async def run():
+        collection = mongo_db[character_repository.collection_name]
+        await collection.insert_many([_character("messi", "Lionel Messi"), _character("ronaldo", "Cristiano Ronaldo")])
+
+        loaded = await registry.refresh()
+        etag = registry.snapshot.etags["messi"]
+        unchanged = await registry.refresh()
+
+        messi = await character_repository.find_by_character_id("messi")
+        await character_repository.update(str(messi.id), {"name": "Leo Messi"})
+        edited = await registry.refresh()
+
+        await collection.insert_one(_character("zidane", "Zinedine Zidane"))
+        added = await registry.refresh()
+        return loaded, etag, unchanged, edited, added
+
+    loaded, etag, unchanged, edited, added = asyncio.run(run())
+
+    assert loaded and not unchanged and edited and added
+    assert registry.stats()["refreshes"] == 3
+    assert registry.stats()["unchanged_polls"] == 1
+    assert registry.get_legend("messi").name == "Leo Messi"
+    assert registry.snapshot.etags["messi"] != etag
+    assert registry.get_available_legends() == ["messi", "ronaldo", "zidane"]
+
+
+def test_non_canonical_ids_are_reachable_and_counted_under_their_stored_id(mongo_db, monkeypatch):
+    monkeypatch.setattr(character_repository, "_collection", mongo_db[character_repository.collection_name])
+    registry = CharacterRegistry(refresh_interval=0)
+
+    async def run():
+        await mongo_db[character_repository.collection_name].insert_one(_character("Thierry-Henry", "Thierry Henry"))
+        await registry.refresh()
+
+    asyncio.run(run())
+
+    assert registry.get_available_legends() == ["thierryhenry"]
+    for spelling in ("Thierry-Henry", "thierry_henry", "thierryhenry"):
+        assert registry.get_legend(spelling).name == "Thierry Henry"
+        assert registry.stored_id(spelling) == "Thierry-Henry"
+
+
+def test_characters_are_stored_under_canonical_ids(mongo_db, monkeypatch):
+    monkeypatch.setattr(character_repository, "_collection", mongo_db[character_repository.collection_name])
+
+    async def run():
+        await character_repository.create(CharacterDocument(**_character("Thierry_Henry", "Thierry Henry")))
+        return await character_repository.find_by_character_id("thierryhenry")
+
+    assert asyncio.run(run()) is not None
@@ -0,0 +1,104 @@
+import asyncio
+from datetime import datetime
+
+from pymongo.errors import BulkWriteError
+
+from footagents.integrations.mongodb.chat_log_writer import ChatLogWriter
+from footagents.integrations.mongodb.models import ChatLogDocument
+from footagents.integrations.mongodb.repositories import ChatLogRepository
+
+from conftest import use_database
+
+
+def _chat_log(i: int) -> ChatLogDocument:
+    return ChatLogDocument(
+        conversation_id=f"conversation-{i}",
+        character_id="messi",
+        user_message=f"question {i}",
+        assistant_response=f"answer {i}",
+        response_time_ms=10,
+    )
+
+
+class PartiallyFailingRepository:
+    """Rejects the documents at the given batch positions, as an unordered insert_many would."""
+
+    def __init__(self, repository: ChatLogRepository, failing_indexes):
+        self.repository = repository
+        self.failing_indexes = set(failing_indexes)
+
+    async def create_many(self, documents):
+        accepted = [document for i, document in enumerate(documents) if i not in self.failing_indexes]
+        await self.repository.create_many(accepted)
+        raise BulkWriteError({
+            "writeErrors": [{"index": i, "code": 121, "errmsg": "Document failed validation"}
+                            for i in sorted(self.failing_indexes)],
+            "nInserted": len(accepted),
+        })
+
+
+def test_batched_logs_have_created_at(mongo_db):
+    repository = use_database(ChatLogRepository(), mongo_db)
+    writer = ChatLogWriter(repository, batch_size=10, flush_interval=0.01)
+
+    async def run():
+        before = datetime.utcnow()
+        await writer.start()
+        for i in range(3):
+            await writer.submit(_chat_log(i))
+        await writer.stop()
+        return before, await repository.get_recent_chats()
+
+    before, chats = asyncio.run(run())
+
+    assert len(chats) == 3
+    for chat in chats:
+        assert "created_at" in chat.model_fields_set
+        assert chat.created_at >= before.replace(microsecond=0)
+    assert writer.stats()["written"] == 3
+
+
+def test_partial_batch_failure_spills_only_failed_logs(mongo_db, tmp_path):
+    repository = use_database(ChatLogRepository(), mongo_db)
+    spill_path = str(tmp_path / "spill.jsonl")
+    writer = ChatLogWriter(
+        PartiallyFailingRepository(repository, failing_indexes=[1]),
+        batch_size=3,
+        overflow_policy="spill",
+        spill_path=spill_path,
+    )
+
+    async def run():
+        await writer._write([_chat_log(i) for i in range(3)])
+        # Replay against the real repository, as a restarted process would
+        replayer = ChatLogWriter(repository, overflow_policy="spill", spill_path=spill_path)
+        replayed = await replayer.replay_spill()
+        return replayed, await repository.get_recent_chats()
+
+    replayed, chats = asyncio.run(run())
+
+    assert writer.stats()["written"] == 2
+    assert writer.stats()["spilled"] == 1
+    assert replayed == 1
+    assert sorted(chat.conversation_id for chat in chats) == [f"conversation-{i}" for i in range(3)]
+
+
+def test_replay_resumes_interrupted_replay(mongo_db, tmp_path):
+    repository = use_database(ChatLogRepository(), mongo_db)
+    spill_path = str(tmp_path / "spill.jsonl")
+    writer = ChatLogWriter(repository, overflow_policy="spill", spill_path=spill_path)
+
+    async def run():
+        await writer._spill([_chat_log(0), _chat_log(1)])
+        # The process died mid-replay: the file was moved aside but never removed
+        writer._take_spill()
+        await writer._spill([_chat_log(2)])
+        replayed = await writer.replay_spill()
+        return replayed, await repository.get_recent_chats()
+
+    replayed, chats = asyncio.run(run())
+
+    assert replayed == 3
+    assert sorted(chat.conversation_id for chat in chats) == [f"conversation-{i}" for i in range(3)]
+    assert not (tmp_path / "spill.jsonl").exists()
+    assert not (tmp_path / "spill.jsonl.replaying").exists()
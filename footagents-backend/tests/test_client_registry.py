@@ -0,0 +1,53 @@
+import asyncio
+
+from footagents.application.conversation_service.workflow.runtime import WorkflowRuntime
+from footagents.infrastructure.llm.client_registry import LLMClientRegistry, llm_registry
+
+
+def test_aclose_runs_close_callbacks_and_later_models_get_open_clients(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    registry = LLMClientRegistry()
+    closed = []
+    registry.on_close(lambda: closed.append(True))
+
+    before = registry.get_chat_model("llama-3.1-8b-instant", 0.0)
+    asyncio.run(registry.aclose())
+    after = registry.get_chat_model("llama-3.1-8b-instant", 0.0)
+
+    assert closed == [True]
+    assert before.http_async_client.is_closed
+    assert after is not before
+    assert not after.http_async_client.is_closed
+
+
+def test_closing_the_shared_registry_resets_the_workflow_runtime():
+    runtime = WorkflowRuntime()
+    # Stand-ins for chains built on models from the registry
+    runtime._workflow = object()
+    runtime._chains = {"character_response": object()}
+
+    asyncio.run(llm_registry.aclose())
+
+    assert not runtime.is_initialized
+    assert runtime._chains == {}
+
+
+def test_limiters_are_rebuilt_for_the_next_event_loop():
+    registry = LLMClientRegistry(model_concurrency={"llama-3.1-8b-instant": 1})
+
+    async def contend():
+        async def call():
+            async with registry.limiter("llama-3.1-8b-instant"):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(call(), call())
+
+    asyncio.run(contend())
+    before = registry.limiter("llama-3.1-8b-instant")
+    asyncio.run(registry.aclose())
+    # A semaphore bound to the first loop would fail once callers have to wait on it
+    asyncio.run(contend())
+
+    limiter = registry.limiter("llama-3.1-8b-instant")
+    assert limiter is not before
+    assert limiter.stats()["total_requests"] == 2
@@ -0,0 +1,37 @@
+import numpy as np
+
+from footagents.infrastructure.rag.flat_index import FlatVectorIndex
+from footagents.infrastructure.rag.vector_index import CHARACTER_KEY
+
+
+def _write_index(directory, vectors):
+    rows = [[f"doc-{i}", f"text {i}", {CHARACTER_KEY: "messi"}] for i in range(len(vectors))]
+    FlatVectorIndex.write(str(directory), rows, np.asarray(vectors, dtype=np.float32), "test-model")
+
+
+def test_search_leaves_the_query_vector_unchanged(tmp_path):
+    _write_index(tmp_path, [[3.0, 0.0], [0.0, 2.0], [1.0, 1.0]])
+    index = FlatVectorIndex(str(tmp_path))
+    query = np.array([4.0, 3.0], dtype=np.float32)
+
+    results = index.search(query, k=2, character="messi")
+
+    np.testing.assert_array_equal(query, [4.0, 3.0])
+    assert [document.metadata["doc_id"] for document, _ in results] == ["doc-2", "doc-0"]
+
+
+def test_rows_are_read_from_the_mapped_row_file(tmp_path):
+    vectors = [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+    rows = [
+        ["doc-a", "Rosario, 1987", {CHARACTER_KEY: "messi"}],
+        ["doc-b", "Funchal – Madeira", {CHARACTER_KEY: "ronaldo", "source": "bio.md"}],
+        ["doc-c", "Barcelona", {CHARACTER_KEY: "messi"}],
+    ]
+    FlatVectorIndex.write(str(tmp_path), rows, np.asarray(vectors, dtype=np.float32), "test-model")
+    index = FlatVectorIndex(str(tmp_path))
+
+    [(document, _)] = index.search([0.0, 1.0], k=1, character="ronaldo")
+
+    assert document.page_content == "Funchal – Madeira"
+    assert document.metadata == {"doc_id": "doc-b", CHARACTER_KEY: "ronaldo", "source": "bio.md"}
+    assert "rows" not in index.metadata
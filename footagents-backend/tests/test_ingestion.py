@@ -0,0 +1,66 @@
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from footagents.infrastructure.rag import ingestion
+from footagents.infrastructure.rag.ingestion import IngestionPipeline
+from footagents.infrastructure.rag.vector_index import PersistentVectorIndex, SOURCE_KEY
+
+
+def _stored_sources(index):
+    stored = index.vectorstore.get(include=["metadatas"])
+    return sorted({metadata[SOURCE_KEY] for metadata in stored["metadatas"]})
+
+
+def _ingest(index_directory, root, **options):
+    index = PersistentVectorIndex(None, "fake-embeddings", persist_directory=str(index_directory))
+    stats = IngestionPipeline(index, workers=0, **options).run(str(root))
+    return index, stats
+
+
+def test_deleted_and_renamed_files_are_removed_from_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ingestion, "_init_embedding_worker",
+        lambda model, device: setattr(ingestion, "_worker_embeddings", DeterministicFakeEmbedding(size=8)),
+    )
+    root = tmp_path / "knowledge"
+    (root / "messi").mkdir(parents=True)
+    (root / "messi" / "biography.md").write_text("Born in Rosario in 1987.", encoding="utf-8")
+    (root / "messi" / "clubs.txt").write_text("Barcelona, Paris Saint-Germain, Inter Miami.", encoding="utf-8")
+    index_directory = tmp_path / "index"
+
+    index, _ = _ingest(index_directory, root)
+    assert _stored_sources(index) == ["ingest:messi/biography.md", "ingest:messi/clubs.txt"]
+
+    (root / "messi" / "clubs.txt").unlink()
+    (root / "messi" / "biography.md").rename(root / "messi" / "early_life.md")
+    index, stats = _ingest(index_directory, root)
+
+    assert _stored_sources(index) == ["ingest:messi/early_life.md"]
+    assert stats.files_removed == 2
+    assert sorted(index.manifest["sources"]) == ["ingest:messi/early_life.md"]
+
+    # Removed sources stay removed, and restoring a file ingests it again
+    (root / "messi" / "clubs.txt").write_text("Barcelona, Paris Saint-Germain, Inter Miami.", encoding="utf-8")
+    index, stats = _ingest(index_directory, root)
+
+    assert _stored_sources(index) == ["ingest:messi/clubs.txt", "ingest:messi/early_life.md"]
+    assert stats.files_removed == 0
+    assert stats.files_skipped == 1
+
+
+def test_keep_missing_leaves_deleted_files_indexed(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ingestion, "_init_embedding_worker",
+        lambda model, device: setattr(ingestion, "_worker_embeddings", DeterministicFakeEmbedding(size=8)),
+    )
+    root = tmp_path / "knowledge"
+    (root / "ronaldo").mkdir(parents=True)
+    (root / "ronaldo" / "career.txt").write_text("Sporting, Manchester United, Real Madrid.", encoding="utf-8")
+    index_directory = tmp_path / "index"
+
+    _ingest(index_directory, root)
+    (root / "ronaldo" / "career.txt").unlink()
+    index = PersistentVectorIndex(None, "fake-embeddings", persist_directory=str(index_directory))
+    stats = IngestionPipeline(index, workers=0).run(str(root), delete_missing=False)
+
+    assert _stored_sources(index) == ["ingest:ronaldo/career.txt"]
+    assert stats.files_removed == 0
@@ -0,0 +1,55 @@
+import asyncio
+
+import numpy as np
+
+from footagents.application.conversation_service.workflow.response_cache import SemanticResponseCache
+
+
+class FixedVectorCache(SemanticResponseCache):
+    """Embeds messages with a fixed table instead of the embedding model."""
+
+    VECTORS = {
+        "who are you": [1.0, 0.0, 0.0],
+        "who are you, really": [0.99, 0.14, 0.0],
+        "favourite goal": [0.0, 1.0, 0.0],
+        "world cup final": [0.0, 0.0, 1.0],
+    }
+
+    async def _embed(self, message):
+        vector = np.asarray(self.VECTORS[message], dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+
+def test_similar_message_hits_and_evicted_rows_are_reused():
+    cache = FixedVectorCache(enabled=True, threshold=0.95, maxsize=2)
+
+    async def run():
+        await cache.store("messi", "who are you", "I'm Leo.")
+        await cache.store("messi", "favourite goal", "Getafe, 2007.")
+        similar = await cache.lookup("messi", "who are you, really")
+        other_character = await cache.lookup("ronaldo", "who are you, really")
+        # The hit above made "favourite goal" the oldest: it is evicted and its row reused
+        await cache.store("messi", "world cup final", "Qatar, 2022.")
+        evicted = await cache.lookup("messi", "favourite goal")
+        reused = await cache.lookup("messi", "world cup final")
+        return similar, other_character, evicted, reused
+
+    similar, other_character, evicted, reused = asyncio.run(run())
+
+    assert similar == "I'm Leo."
+    assert other_character is None
+    assert evicted is None
+    assert reused == "Qatar, 2022."
+    assert cache._by_character["messi"].used == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_replies_are_not_served():
+    cache = FixedVectorCache(enabled=True, threshold=0.95, ttl=-1)
+
+    async def run():
+        await cache.store("messi", "who are you", "I'm Leo.")
+        return await cache.lookup("messi", "who are you, really")
+
+    assert asyncio.run(run()) is None
+    assert cache.stats()["size"] == 0
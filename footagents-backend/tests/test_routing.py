@@ -0,0 +1,53 @@
+import pytest
+
+from footagents.application.conversation_service.workflow.routing import (
+    GATING_ALWAYS,
+    ROUTE_RETRIEVE,
+    ROUTE_REUSE,
+    RetrievalGate,
+    classify_message,
+)
+
+
+@pytest.mark.parametrize("message, has_context, route, reason", [
+    ("who are you", False, ROUTE_RETRIEVE, "no_context"),
+    ("...", True, ROUTE_REUSE, "no_words"),
+    ("haha thanks", True, ROUTE_REUSE, "small_talk"),
+    ("ok cool", True, ROUTE_REUSE, "small_talk"),
+    ("What about the 2014 final?", True, ROUTE_RETRIEVE, "entity"),
+    ("and what did you think of Guardiola", True, ROUTE_RETRIEVE, "entity"),
+    ("really?", True, ROUTE_REUSE, "follow_up_question"),
+    ("and then?", True, ROUTE_REUSE, "follow_up_question"),
+    ("did you like it?", True, ROUTE_REUSE, "follow_up_question"),
+    ("did you like it", True, ROUTE_REUSE, "follow_up_question"),
+    ("who was your best coach", True, ROUTE_RETRIEVE, "question"),
+    ("that is so cool, who was your best coach", True, ROUTE_RETRIEVE, "question"),
+    ("wow. tell me about your childhood", True, ROUTE_RETRIEVE, "question"),
+    ("did you ever regret leaving your boyhood club for another league?", True, ROUTE_RETRIEVE, "question"),
+    ("that sounds hard", True, ROUTE_REUSE, "short_follow_up"),
+    ("I always loved watching you play on rainy evenings", True, ROUTE_RETRIEVE, "new_topic"),
+])
+def test_classify_message(message, has_context, route, reason):
+    decision = classify_message(message, has_context)
+
+    assert (decision.route, decision.reason) == (route, reason)
+
+
+@pytest.mark.parametrize("mode, message, has_context, route", [
+    ("heuristic", "really?", True, ROUTE_REUSE),
+    ("heuristic", "who was your best coach", True, ROUTE_RETRIEVE),
+    ("heuristic", "really?", False, ROUTE_RETRIEVE),
+    (GATING_ALWAYS, "really?", True, ROUTE_RETRIEVE),
+])
+def test_retrieval_gate_decides_and_counts(mode, message, has_context, route):
+    gate = RetrievalGate(mode=mode)
+
+    assert gate.decide(message, has_context).route == route
+    stats = gate.stats()
+    assert stats["decisions"] == 1
+    assert stats["routes"] == {route: 1}
+
+
+def test_retrieval_gate_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        RetrievalGate(mode="sometimes")
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from footagents.application.conversation_service.workflow.summarizer import ConversationSummarizer
+from footagents.integrations.mongodb.models import ConversationDocument
+from footagents.integrations.mongodb.repositories import ConversationRepository, MessageBucketRepository
+
+from conftest import use_database
+
+
+def _messages(count: int):
+    return [
+        ConversationDocument.build_message("user" if seq % 2 == 0 else "assistant", f"message {seq}")
+        for seq in range(count)
+    ]
+
+
+async def _seed(mongo_db, messages, window: int, watermark: int) -> ConversationRepository:
+    """Store a conversation as append_turn leaves it: full history in buckets, a recent window on the document."""
+    buckets = use_database(MessageBucketRepository(bucket_size=8), mongo_db)
+    repository = use_database(ConversationRepository(cache_enabled=False, buckets=buckets), mongo_db)
+
+    await mongo_db[buckets.collection_name].insert_many([
+        {"conversation_id": "c1", "bucket": bucket, "messages": bucket_messages, "count": len(bucket_messages)}
+        for bucket, bucket_messages in buckets._group(messages, 0).items()
+    ])
+    await mongo_db[repository.collection_name].insert_one(ConversationDocument(
+        conversation_id="c1",
+        character_id="messi",
+        character_name="Lionel Messi",
+        messages=messages[-window:],
+        message_count=len(messages),
+        summary="Earlier they talked about Rosario.",
+        summary_watermark=watermark,
+    ).to_dict())
+    return repository
+
+
+def test_lagging_summarizer_loads_messages_that_left_the_window(mongo_db):
+    messages = _messages(30)
+
+    async def run():
+        repository = await _seed(mongo_db, messages, window=10, watermark=6)
+        summarizer = ConversationSummarizer(repository, trigger_messages=8, keep_messages=2, recent_window=10)
+        conversation = await repository.find_by_conversation_id("c1")
+        return summarizer, await summarizer.unsummarized_messages(conversation)
+
+    summarizer, history = asyncio.run(run())
+
+    assert [message["content"] for message in history] == [f"message {seq}" for seq in range(6, 30)]
+    assert all("seq" not in message for message in history)
+    assert summarizer.stats()["backfills"] == 1
+
+
+def test_up_to_date_summarizer_uses_the_recent_window(mongo_db):
+    messages = _messages(30)
+
+    async def run():
+        repository = await _seed(mongo_db, messages, window=10, watermark=24)
+        summarizer = ConversationSummarizer(repository, trigger_messages=8, keep_messages=2, recent_window=10)
+        conversation = await repository.find_by_conversation_id("c1")
+        return summarizer, await summarizer.unsummarized_messages(conversation)
+
+    summarizer, history = asyncio.run(run())
+
+    assert [message["content"] for message in history] == [f"message {seq}" for seq in range(24, 30)]
+    assert summarizer.stats()["backfills"] == 0
+
+
+@pytest.mark.parametrize("trigger, keep, window", [(20, 6, 20), (8, 8, 20)])
+def test_summary_settings_must_fit_the_recent_window(trigger, keep, window):
+    with pytest.raises(ValueError):
+        ConversationSummarizer(trigger_messages=trigger, keep_messages=keep, recent_window=window)
+
+
+def test_stop_forgets_queued_conversations(mongo_db):
+    async def run():
+        repository = await _seed(mongo_db, _messages(30), window=10, watermark=24)
+        summarizer = ConversationSummarizer(repository, trigger_messages=8, keep_messages=2, recent_window=10)
+        summarizer.schedule("c1")
+        summarizer.schedule("c2")
+        await summarizer.stop()
+        stopped = summarizer.stats()
+        return stopped, summarizer.schedule("c1")
+
+    stopped, rescheduled = asyncio.run(run())
+
+    assert stopped["queue_depth"] == 0
+    assert stopped["pending"] == 0
+    assert rescheduled is True
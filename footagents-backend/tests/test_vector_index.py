@@ -0,0 +1,26 @@
+from langchain.schema import Document
+from langchain_community.vectorstores import Chroma
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from footagents.infrastructure.rag.vector_index import PersistentVectorIndex
+
+
+def _collections(index):
+    return sorted(getattr(collection, "name", collection) for collection in index.vectorstore._client.list_collections())
+
+
+def test_legacy_default_collection_is_dropped_once(tmp_path):
+    embeddings = DeterministicFakeEmbedding(size=8)
+    # What earlier versions left behind: Chroma.from_documents into the default collection
+    Chroma.from_documents(
+        [Document(page_content="Messi was born in Rosario.")], embeddings, persist_directory=str(tmp_path)
+    )
+
+    index = PersistentVectorIndex(embeddings, "fake-embeddings", persist_directory=str(tmp_path))
+    assert _collections(index) == ["football_knowledge"]
+    assert index.manifest["legacy_collections_dropped"] is True
+
+    # A collection named like the legacy one later is left alone
+    index.vectorstore._client.create_collection("langchain")
+    reopened = PersistentVectorIndex(embeddings, "fake-embeddings", persist_directory=str(tmp_path))
+    assert _collections(reopened) == ["football_knowledge", "langchain"]
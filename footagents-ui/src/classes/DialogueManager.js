@@ -1,5 +1,5 @@
 import ApiService from '../services/ApiService';
-// import WebSocketApiService from '../services/WebSocketApiService'; // TODO: Uncomment when adding WebSocket support
+import WebSocketApiService from '../services/WebSocketApiService';
 
 class DialogueManager {
   constructor(scene) {
@@ -105,20 +105,11 @@ class DialogueManager {
     this.isStreaming = true;
     this.streamingText = '';
     
-    // TODO: Uncomment when adding WebSocket support
-    // try {
-    //   await this.processWebSocketMessage();
-    // } catch (error) {
-    //   console.error('WebSocket error:', error);
-    //   console.log('Falling back to REST API...');
-    //   await this.fallbackToRegularApi();
-    // } finally {
-    //   this.isStreaming = false;
-    //   this.isTyping = false;
-    // }
-    
-    // For now, directly use HTTP API
     try {
+      await this.processWebSocketMessage();
+    } catch (error) {
+      console.error('WebSocket error:', error);
+      console.log('Falling back to REST API...');
       await this.fallbackToRegularApi();
     } finally {
       this.isStreaming = false;
@@ -126,49 +117,47 @@ class DialogueManager {
     }
   }
 
-  // TODO: Uncomment when adding WebSocket support
-  // async processWebSocketMessage() {
-  //   try {
-  //     await WebSocketApiService.connect();
-  //     
-  //     const callbacks = {
-  //       onMessage: () => { 
-  //         this.finishStreaming();
-  //       },
-  //       onChunk: (chunk) => {
-  //         this.streamingText += chunk;
-  //         this.dialogueBox.show(this.streamingText, true);
-  //       },
-  //       onStreamingStart: () => {
-  //         this.isStreaming = true;
-  //       },
-  //       onStreamingEnd: () => {
-  //         this.finishStreaming();
-  //       }
-  //     };
-  //     
-  //     await WebSocketApiService.sendMessage(
-  //       this.activePlayer,
-  //       this.currentMessage,
-  //       callbacks
-  //     );
-  //     
-  //     while (this.isStreaming) {
-  //       await new Promise(resolve => setTimeout(resolve, 100));
-  //     }
-  //     
-  //     WebSocketApiService.disconnect();
-  //   } catch (error) {
-  //     console.error('WebSocket processing failed:', error);
-  //     throw error; // Re-throw to trigger fallback
-  //   }
-  // }
+  async processWebSocketMessage() {
+    try {
+      await WebSocketApiService.connect();
+
+      const callbacks = {
+        onMessage: () => { 
+          this.finishStreaming();
+        },
+        onChunk: (chunk) => {
+          this.streamingText += chunk;
+          this.dialogueBox.show(this.streamingText, true);
+        },
+        onStreamingStart: () => {
+          this.isStreaming = true;
+        },
+        onStreamingEnd: () => {
+          this.finishStreaming();
+        }
+      };
+
+      await WebSocketApiService.sendMessage(
+        this.activePlayer,
+        this.currentMessage,
+        callbacks
+      );
+
+      // Keep the socket open for the rest of the dialogue so the server
+      // continues the same conversation; scheduleDisconnect closes it
+      while (this.isStreaming) {
+        await new Promise(resolve => setTimeout(resolve, 100));
+      }
+    } catch (error) {
+      console.error('WebSocket processing failed:', error);
+      throw error; // Re-throw to trigger fallback
+    }
+  }
 
-  // TODO: Uncomment when adding WebSocket support
-  // finishStreaming() {
-  //   this.isStreaming = false;
-  //   this.dialogueBox.show(this.streamingText, true);
-  // }
+  finishStreaming() {
+    this.isStreaming = false;
+    this.dialogueBox.show(this.streamingText, true);
+  }
 
   async fallbackToRegularApi() {
     try {
@@ -308,10 +297,9 @@ class DialogueManager {
   scheduleDisconnect() {
     this.cancelDisconnectTimeout();
     
-    // TODO: Uncomment when adding WebSocket support
-    // this.disconnectTimeout = setTimeout(() => {
-    //   WebSocketApiService.disconnect();
-    // }, 5000);
+    this.disconnectTimeout = setTimeout(() => {
+      WebSocketApiService.disconnect();
+    }, 5000);
   }
 }
 